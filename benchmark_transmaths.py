@@ -0,0 +1,291 @@
+"""Times every Transreal operator (on small integers, large fractions, floats, and infinity, zero and nullity), roots
+and powers at several precisions, Transcomplex arithmetic, construction and str, against fractions.Fraction and
+float (or complex) doing the same thing where they can. Also measures the memory each operation leaves allocated
+(e.g. its result), and the peak memory while doing it 1000 times.
+
+Run with `python3 benchmark_transmaths.py [--filter TEXT] [--save FILE] [--compare FILE] [--parallel COUNT]`.
+--save writes the results as JSON, and --compare prints how much faster or slower each benchmark is than in a file
+saved earlier. --parallel also times parallel_map, parallel_reduce and parallel_sum on COUNT values with 1, 2, 4...
+processes up to the number of CPUs, to show how they scale."""
+import argparse
+import cmath
+import fractions
+import functools
+import json
+import math
+import operator
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import transmaths
+
+Fraction = fractions.Fraction
+Transreal = transmaths.Transreal
+Transcomplex = transmaths.Transcomplex
+
+# a pair of operands of each kind for Transreal, Fraction and float (None where there isn't an equivalent)
+OPERANDS = {
+    "small ints": (
+        (Transreal(7), Transreal(-3)), (Fraction(7), Fraction(-3)), (7.0, -3.0)),
+    "large rationals": (
+        (Transreal(3**200 + 1, 7**150), Transreal(-(5**180), 11**140 + 2)),
+        (Fraction(3**200 + 1, 7**150), Fraction(-(5**180), 11**140 + 2)),
+        ((3**200 + 1) / 7**150, -(5**180) / (11**140 + 2))),
+    "floats": (
+        (Transreal(0.1), Transreal(-2.75)), (Fraction(0.1), Fraction(-2.75)), (0.1, -2.75)),
+    "with an int": (
+        (Transreal(1, 3), 5), (Fraction(1, 3), 5), (1 / 3, 5)),
+    "infinity and zero": (
+        (transmaths.INFINITY, Transreal(0)), None, (math.inf, 0.0)),
+    "nullity": (
+        (transmaths.NULLITY, Transreal(2)), None, (math.nan, 2.0)),
+}
+
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "divmod": divmod,
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+UNARY_OPERATORS = {
+    "-x": operator.neg,
+    "abs": abs,
+    "x ** 3": lambda x: x ** 3,
+    "hash": hash,
+    "float": float,
+    "int": int,
+    "str": str,
+}
+
+
+def benchmarks():
+    """Return a dictionary of the name of each benchmark to a tuple of functions (taking no arguments) for Transreal
+    (or Transcomplex), Fraction and float (or complex), with None for the ones which don't exist or raise an
+    exception."""
+    cases = {}
+    for kind, implementations in OPERANDS.items():
+        for name, function in BINARY_OPERATORS.items():
+            cases["{} {}".format(name, kind)] = tuple(
+                None if operands is None else (lambda function=function, a=operands[0], b=operands[1]: function(a, b))
+                for operands in implementations)
+        for name, function in UNARY_OPERATORS.items():
+            cases["{} {}".format(name, kind)] = tuple(
+                None if operands is None else (lambda function=function, a=operands[0]: function(a))
+                for operands in implementations)
+
+    # construction, and the other way round
+    numerator, denominator = 3**100, 7**60
+    cases["Transreal(small ints)"] = (
+        lambda: Transreal(12, 18), lambda: Fraction(12, 18), lambda: 12 / 18)
+    cases["Transreal(large ints)"] = (
+        lambda: Transreal(numerator, denominator), lambda: Fraction(numerator, denominator),
+        lambda: numerator / denominator)
+    cases["Transreal(float)"] = (lambda: Transreal(0.1), lambda: Fraction(0.1), lambda: float(0.1))
+    cases["Transreal.from_string"] = (
+        lambda: Transreal.from_string("-355/113"), lambda: Fraction("-355/113"), lambda: float("-3.1415929203539825"))
+
+    # roots and powers, at several precisions
+    for precision in (9, 30, 100, 300):
+        cases["root(2) precision {}".format(precision)] = (
+            lambda precision=precision: Transreal(2).root(2, precision), None, lambda: math.sqrt(2.0))
+    cases["root(3) precision 9"] = (lambda: Transreal(2).root(3), None, lambda: 2.0 ** (1 / 3))
+    cases["root(2) of a large rational"] = (
+        lambda: Transreal(numerator, denominator).root(2), None, lambda: math.sqrt(numerator / denominator))
+    cases["** 1/3"] = (lambda: Transreal(2) ** Transreal(1, 3), None, lambda: 2.0 ** (1 / 3))
+    cases["** 50"] = (lambda: Transreal(3, 7) ** 50, lambda: Fraction(3, 7) ** 50, lambda: (3 / 7) ** 50)
+    cases["** -50"] = (lambda: Transreal(3, 7) ** -50, lambda: Fraction(3, 7) ** -50, lambda: (3 / 7) ** -50)
+
+    # transcomplex numbers, against complex numbers
+    a = Transcomplex(Transreal(2), Transreal(1, 3))
+    b = Transcomplex(Transreal(1), Transreal(1, 4))
+    complex_a = cmath.rect(2, 1 / 3)
+    complex_b = cmath.rect(1, 1 / 4)
+    for name, function in [("+", operator.add), ("-", operator.sub), ("*", operator.mul), ("/", operator.truediv)]:
+        cases["Transcomplex {}".format(name)] = (
+            lambda function=function: function(a, b), None, lambda function=function: function(complex_a, complex_b))
+    cases["Transcomplex(magnitude, angle)"] = (
+        lambda: Transcomplex(Transreal(2), Transreal(1, 3)), None, lambda: cmath.rect(2, 1 / 3))
+    cases["Transcomplex str"] = (lambda: str(a), None, lambda: str(complex_a))
+    values = [Transcomplex(complex(index, -index) / 7) for index in range(100)]
+    complex_values = [complex(index, -index) / 7 for index in range(100)]
+    cases["Transcomplex sum of 100"] = (
+        lambda: sum(values, Transcomplex(0)), None, lambda: sum(complex_values))
+
+    # check which functions work, so that only those are timed
+    for name, functions in cases.items():
+        checked = []
+        for function in functions:
+            try:
+                if function is not None:
+                    function()
+            except (ArithmeticError, TypeError, ValueError):
+                function = None
+            checked.append(function)
+        cases[name] = tuple(checked)
+    return cases
+
+
+def measure(function, minimum_time=0.05, repeat=3):
+    """Return a dictionary of how many times per second function can be called, the memory blocks and bytes each call
+    leaves allocated, and the peak memory (more than before) while calling it 1000 times."""
+    # call the function enough times to take minimum_time, then take the best of repeat tries
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minimum_time:
+            break
+        number *= 2
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    # keep the results, so that what each call leaves allocated can be counted
+    results = [None] * 1000
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    before_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for index in range(len(results)):
+        results[index] = function()
+    size, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(statistic.count_diff for statistic in after.compare_to(before, "filename")
+                 if statistic.traceback[0].filename != tracemalloc.__file__)
+
+    return {
+        "ops_per_second": number / elapsed,
+        "blocks_per_op": blocks / len(results),
+        "bytes_per_op": (size - before_size) / len(results),
+        "peak_bytes": peak - before_size,
+    }
+
+
+def run_parallel(count):
+    """Time parallel_map (square roots), parallel_reduce (max) and parallel_sum on count values, serially
+    and with 1, 2, 4... processes up to the number of CPUs, print the results as they are measured, and return
+    them."""
+    values = [Transreal(index % 1000 + 1, 7) for index in range(count)]
+    cases = {
+        "parallel_map root(2)": (
+            lambda processes: transmaths.parallel_map(
+                functools.partial(Transreal.root, power=2), values, processes=processes),
+            lambda: [value.root(2) for value in values]),
+        "parallel_reduce max": (
+            lambda processes: transmaths.parallel_reduce(max, values, processes=processes),
+            lambda: functools.reduce(max, values)),
+        "parallel_sum": (
+            lambda processes: transmaths.parallel_sum(values, processes=processes),
+            lambda: transmaths.sum(values)),
+    }
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    process_counts = [1 << power for power in range(cpus.bit_length()) if 1 << power <= cpus]
+    if process_counts[-1] != cpus:
+        process_counts.append(cpus)
+
+    results = {}
+    print("{} values, {} CPUs".format(count, cpus))
+    print("{:<24} {:>10} {:>14} {:>10}".format("benchmark", "processes", "values/s", "speed-up"))
+    for name, (parallel, serial) in cases.items():
+        start = time.perf_counter()
+        serial()
+        serial_rate = count / (time.perf_counter() - start)
+        result = {"serial": serial_rate}
+        print("{:<24} {:>10} {:>14} {:>10}".format(name, "serial", format_rate(serial_rate), "-"))
+        for processes in process_counts:
+            start = time.perf_counter()
+            parallel(processes)
+            result[str(processes)] = count / (time.perf_counter() - start)
+            print("{:<24} {:>10} {:>14} {:>9.2f}x".format(
+                name, processes, format_rate(result[str(processes)]), result[str(processes)] / result["1"]))
+        results[name] = result
+    return results
+
+
+def format_rate(rate):
+    """Return a number of operations per second, or - if there isn't one."""
+    return "-" if rate is None else "{:,.0f}".format(rate)
+
+
+def run(name_filter):
+    """Run every benchmark whose name contains name_filter, print the results as they are measured, and return
+    them."""
+    results = {}
+    print("{:<34} {:>14} {:>14} {:>14} {:>8} {:>8} {:>10} {:>8} {:>10}".format(
+        "benchmark", "Transreal/s", "Fraction/s", "float/s", "vs Frac", "vs float", "bytes/op", "blocks", "peak"))
+    for name, functions in benchmarks().items():
+        if name_filter not in name or functions[0] is None:
+            continue
+        result = {}
+        for implementation, function in zip(("transreal", "fraction", "float"), functions):
+            result[implementation] = None if function is None else measure(function)
+        results[name] = result
+
+        rates = [None if result[implementation] is None else result[implementation]["ops_per_second"]
+                 for implementation in ("transreal", "fraction", "float")]
+        ratios = ["-" if rate is None else "{:.2f}x".format(rates[0] / rate) for rate in rates[1:]]
+        print("{:<34} {:>14} {:>14} {:>14} {:>8} {:>8} {:>10.0f} {:>8.1f} {:>10}".format(
+            name, *map(format_rate, rates), *ratios, result["transreal"]["bytes_per_op"],
+            result["transreal"]["blocks_per_op"], result["transreal"]["peak_bytes"]))
+    return results
+
+
+def compare(old, new):
+    """Print how the Transreal results in new compare to those in old."""
+    print("{:<34} {:>14} {:>14} {:>8} {:>10} {:>10}".format(
+        "benchmark", "old/s", "new/s", "change", "old bytes", "new bytes"))
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+        old_result = old["results"][name]["transreal"]
+        new_result = result["transreal"]
+        change = new_result["ops_per_second"] / old_result["ops_per_second"] - 1
+        print("{:<34} {:>14} {:>14} {:>+8.0%} {:>10.0f} {:>10.0f}".format(
+            name, format_rate(old_result["ops_per_second"]), format_rate(new_result["ops_per_second"]), change,
+            old_result["bytes_per_op"], new_result["bytes_per_op"]))
+
+
+def main(arguments):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filter", default="", help="only run the benchmarks whose names contain this")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results to this JSON file, saved by an earlier run")
+    parser.add_argument("--parallel", type=int, metavar="COUNT",
+                        help="also time the parallel functions on this many values, with 1, 2, 4... processes")
+    arguments = parser.parse_args(arguments)
+
+    results = {
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": run(arguments.filter),
+    }
+    if arguments.parallel:
+        print()
+        results["parallel"] = run_parallel(arguments.parallel)
+    if arguments.save:
+        with open(arguments.save, "w") as file:
+            # sorted and indented, so that the files from two runs can be diffed
+            json.dump(results, file, indent=2, sort_keys=True)
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            old = json.load(file)
+        print()
+        compare(old, results)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,50 @@
+"""Times solving systems of linear equations with transmaths.TransrealMatrix (which uses fraction-free elimination)
+against Gauss-Jordan elimination on Transreal objects.
+
+Run with `python3 benchmark_transmaths_matrix.py [size ...]` (the sizes default to 50 and 200)."""
+import random
+import sys
+import time
+import transmaths
+
+Transreal = transmaths.Transreal
+
+
+def naive_solve(rows, vector):
+    """Solve the system with Gauss-Jordan elimination on Transreal objects, putting every number in lowest terms as
+    it goes."""
+    size = len(rows)
+    augmented = [list(row) + [value] for row, value in zip(rows, vector)]
+    transmaths._transreal_gauss_jordan(augmented, size)
+    return [row[size] / row[index] for index, row in enumerate(augmented)]
+
+
+def random_system(size, seed):
+    """Return a size by size matrix and a vector of small random fractions."""
+    generator = random.Random(seed)
+    rows = [[Transreal(generator.randint(-9, 9), generator.randint(1, 9)) for column in range(size)]
+            for row in range(size)]
+    vector = [Transreal(generator.randint(-9, 9), generator.randint(1, 9)) for row in range(size)]
+    return rows, vector
+
+
+def time_call(function, *arguments):
+    """Return the result of calling function and how long it took, in seconds."""
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'size':>6} {'TransrealMatrix':>16} {'naive':>12} {'speedup':>8}")
+    for size in sizes:
+        rows, vector = random_system(size, size)
+        solution, matrix_time = time_call(transmaths.TransrealMatrix(rows).solve, vector)
+        expected, naive_time = time_call(naive_solve, rows, vector)
+        if solution != expected:
+            raise AssertionError(f"The solutions of the {size} by {size} system differ!")
+        print(f"{size:>6} {matrix_time:>15.3f}s {naive_time:>11.3f}s {naive_time / matrix_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [50, 200])
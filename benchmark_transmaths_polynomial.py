@@ -0,0 +1,56 @@
+"""Times evaluating a polynomial at many points with transmaths.TransrealPolynomial, against Horner's method written
+out by hand on Transreal objects.
+
+Run with `python3 benchmark_transmaths_polynomial.py [degree [points]]` (the defaults are 10 and 10000)."""
+import random
+import sys
+import time
+import transmaths
+
+Transreal = transmaths.Transreal
+
+
+def naive_evaluate(coefficients, points):
+    """Evaluate the polynomial at every point with Horner's method on Transreal objects."""
+    values = []
+    for point in points:
+        value = coefficients[-1]
+        for coefficient in reversed(coefficients[:-1]):
+            value = value * point + coefficient
+        values.append(value)
+    return values
+
+
+def time_call(function, *arguments):
+    """Return the result of calling function and how long it took, in seconds."""
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def main(degree, count):
+    generator = random.Random(degree)
+    coefficients = [Transreal(generator.randint(-99, 99), generator.randint(1, 99)) for power in range(degree + 1)]
+    points = [Transreal(generator.randint(-99, 99), generator.randint(1, 99)) for point in range(count)]
+    polynomial = transmaths.TransrealPolynomial(coefficients)
+
+    expected, naive_time = time_call(naive_evaluate, coefficients, points)
+    print(f"degree {degree}, {count} points")
+    print(f"{'Horner on Transreal objects':>30} {count / naive_time:>12.0f} points/s")
+    values, list_time = time_call(polynomial.evaluate, points)
+    if values != expected:
+        raise AssertionError("The values of the polynomial differ!")
+    print(f"{'TransrealPolynomial (list)':>30} {count / list_time:>12.0f} points/s {naive_time / list_time:>7.1f}x")
+
+    if transmaths.numpy is not None:
+        array = transmaths.TransrealArray(points)
+        values, array_time = time_call(lambda: polynomial.evaluate(array).tolist())
+        if values != expected:
+            raise AssertionError("The values of the polynomial differ!")
+        print(f"{'TransrealPolynomial (array)':>30} {count / array_time:>12.0f} points/s "
+              f"{naive_time / array_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*(arguments + [10, 10000][len(arguments):]))
@@ -0,0 +1,76 @@
+"""Times writing transreal numbers to a text file with transmaths.format_many and reading them back with
+transmaths.parse_many, against fractions.Fraction and round-tripping through floats.
+
+Run with `python3 benchmark_transmaths_text.py [lines]` (the default is 1000000)."""
+import fractions
+import os
+import random
+import sys
+import tempfile
+import time
+import transmaths
+
+Transreal = transmaths.Transreal
+
+
+def random_values(count):
+    """Return count transreal numbers: mostly whole numbers and fractions, with some approximate and non-finite
+    ones."""
+    generator = random.Random(count)
+    values = []
+    for _ in range(count):
+        choice = generator.random()
+        if choice < 0.4:
+            values.append(Transreal(generator.randint(-10**6, 10**6)))
+        elif choice < 0.9:
+            values.append(Transreal(generator.randint(-10**9, 10**9), generator.randint(1, 10**9)))
+        elif choice < 0.98:
+            values.append(Transreal(generator.randint(-10**9, 10**9), generator.randint(1, 10**9), approximate=True))
+        else:
+            values.append(generator.choice([transmaths.INFINITY, transmaths.NEGATIVE_INFINITY, transmaths.NULLITY]))
+    return values
+
+
+def time_call(function, *arguments):
+    """Return the result of calling function and how long it took, in seconds."""
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def write(path, lines):
+    with open(path, "w") as file:
+        file.writelines(lines)
+
+
+def read(path, parse):
+    with open(path) as file:
+        return list(parse(file))
+
+
+def main(count):
+    values = random_values(count)
+    # Fraction and float can't read the non-finite values, or the ~ on approximate ones
+    finite = [str(value).lstrip("~") + "\n" for value in values if value._kind == transmaths._FINITE]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "values.txt")
+        print(f"{count} lines, {len(finite)} of them finite")
+
+        _, format_time = time_call(write, path, transmaths.format_many(values))
+        print(f"{'format_many':>24} {count / format_time:>12.0f} lines/s")
+        parsed, parse_time = time_call(read, path, transmaths.parse_many)
+        if list(map(str, parsed)) != list(map(str, values)):
+            raise AssertionError("The values read back differ!")
+        print(f"{'parse_many':>24} {count / parse_time:>12.0f} lines/s")
+
+        write(path, finite)
+        _, fraction_time = time_call(read, path, lambda file: map(fractions.Fraction, file))
+        print(f"{'Fraction(line)':>24} {len(finite) / fraction_time:>12.0f} lines/s")
+
+        write(path, [repr(float(fractions.Fraction(line))) + "\n" for line in finite])
+        _, float_time = time_call(read, path, lambda file: map(float, file))
+        print(f"{'float(line)':>24} {len(finite) / float_time:>12.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
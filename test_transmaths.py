@@ -1,4 +1,16 @@
 """Unit tests for the transmaths module."""
+import contextlib
+import fractions
+import functools
+import io
+import itertools
+import math
+import operator
+import os
+import pickle
+import random
+import sqlite3
+import tempfile
 import unittest
 import transmaths
 
@@ -8,15 +20,52 @@ Transcomplex = transmaths.Transcomplex
 class TestTransreal(unittest.TestCase):
     """Tests the Transreal object."""
 
+    def test_add_dyadic(self):
+        """Numbers with power-of-two denominators (like floats) are added and subtracted exactly, in lowest terms."""
+        values = [0.1, -0.375, 1e-300, 3.0, -0.1, 2.0**-1074]
+        for a in values:
+            for b in values:
+                total = fractions.Fraction(a) + fractions.Fraction(b)
+                difference = fractions.Fraction(a) - fractions.Fraction(b)
+                self.assertEqual(str(Transreal(a) + Transreal(b)), str(Transreal(total.numerator, total.denominator)))
+                self.assertEqual(
+                    str(Transreal(a) - Transreal(b)), str(Transreal(difference.numerator, difference.denominator)))
+        self.assertEqual(str(Transreal(1, 2, approximate=True) - Transreal(0.25)), "~1/4")
+
     def test_add_exception(self):
         """Strings cannot be added to transreal numbers."""
         with self.assertRaises(TypeError):
             Transreal(1) + "one"
 
+    def test_add_infinity(self):
+        """infinity + infinity = infinity, infinity + -infinity = nullity."""
+        self.assertIs(transmaths.INFINITY + transmaths.INFINITY, transmaths.INFINITY)
+        self.assertIs(transmaths.INFINITY + -transmaths.INFINITY, transmaths.NULLITY)
+
     def test_add_nullity(self):
         """nullity + x = nullity."""
         self.assertEqual(transmaths.NULLITY + 1, transmaths.NULLITY)
 
+    def test_bytes(self):
+        """Transreal numbers can be encoded as bytes, and decoded exactly."""
+        for value in [Transreal(1, 3), Transreal(-5, 2, approximate=True), Transreal(0), Transreal(2**2000 + 1, 3),
+                      transmaths.INFINITY, transmaths.NEGATIVE_INFINITY, transmaths.NULLITY]:
+            decoded = Transreal.from_bytes(value.to_bytes())
+            self.assertEqual((str(decoded), decoded.approximate), (str(value), value.approximate))
+        self.assertEqual(len(Transreal(1, 3).to_bytes()), 5)
+        self.assertIs(Transreal.from_bytes(transmaths.NULLITY.to_bytes()), transmaths.NULLITY)
+        for data in [b"", b"\x05", b"\x00\x01\x01", b"\x00\x01\x01\x00", b"\x00\x01\x01\x01\x01\x00"]:
+            with self.assertRaises(ValueError):
+                Transreal.from_bytes(data)
+
+    def test_divmod(self):
+        """The quotient is rounded down, and the remainder has the sign of the divisor."""
+        self.assertEqual(divmod(Transreal(7, 2), Transreal(-3, 4)), (-5, Transreal(-1, 4)))
+
+    def test_divmod_zero(self):
+        """Dividing by zero gives an infinite quotient, and a remainder of nullity."""
+        self.assertEqual(divmod(Transreal(7, 2), 0), (transmaths.INFINITY, transmaths.NULLITY))
+
     def test_eq_exception(self):
         """Transreal numbers are not equal to strings."""
         self.assertNotEqual(Transreal(2), "two")
@@ -34,10 +83,47 @@ class TestTransreal(unittest.TestCase):
         with self.assertRaises(TypeError):
             Transreal(1) // "foo"
 
+    def test_format(self):
+        """Transreal numbers are formatted exactly, like floats, without converting them to floats first."""
+        third = Transreal(1, 3)
+        for format_spec, expected in [(".3e", "3.333e-01"), (".2f", "0.33"), ("g", "0.333333"), (".2%", "33.33%"),
+                                      ("*^10.1f", "***0.3****"), ("+.1f", "+0.3"), ("", "1/3")]:
+            self.assertEqual(format(third, format_spec), expected)
+        self.assertEqual(format(Transreal(10 ** 30 + 1, 3), ".25g"), "3.333333333333333333333333e+29")
+        self.assertEqual(format(Transreal(5, 2), ".0f"), "2")
+        self.assertEqual(format(-Transreal(1, 3, approximate=True), ".3f"), "~-0.333")
+        self.assertEqual(format(transmaths.NULLITY, "+.2f"), "nullity")
+        self.assertEqual(format(transmaths.NEGATIVE_INFINITY, ">10"), " -infinity")
+
+    def test_format_many(self):
+        """Transreal numbers written by format_many are read back the same by parse_many, which skips blank lines."""
+        values = [Transreal(1, 3), Transreal(-2), Transreal(1, 3, approximate=True), transmaths.INFINITY,
+                  transmaths.NULLITY]
+        lines = list(transmaths.format_many(values))
+        self.assertEqual(lines[0], "1/3\n")
+        parsed = list(transmaths.parse_many(lines + ["\n", "  "]))
+        self.assertEqual([str(value) for value in parsed], [str(value) for value in values])
+
+    def test_from_string(self):
+        """Transreal numbers can be made from their strings, and exactly from decimal notation."""
+        for string in ["1/3", "-2", "~-1/3", "infinity", "-infinity", "nullity"]:
+            self.assertEqual(str(Transreal.from_string(string)), string)
+        self.assertEqual(Transreal.from_string(" 1.25 "), Transreal(5, 4))
+        self.assertEqual(Transreal.from_string("-1e-3"), Transreal(-1, 1000))
+        self.assertEqual(Transreal.from_string("0.1"), Transreal(1, 10))
+        for string in ["", ".", "1/", "1.2.3", "foo"]:
+            with self.assertRaises(ValueError):
+                Transreal.from_string(string)
+
     def test_ge(self):
         """Transreal numbers can be compared using "greater than or equal to"."""
         self.assertGreaterEqual(Transreal(3), 1)
 
+    def test_ge_nullity(self):
+        """Nullity is only greater than or equal to itself."""
+        self.assertGreaterEqual(transmaths.NULLITY, transmaths.NULLITY)
+        self.assertFalse(transmaths.NULLITY >= 1)
+
     def test_gt_exception(self):
         """Transreal numbers cannot be compared to strings."""
         with self.assertRaises(TypeError):
@@ -47,6 +133,11 @@ class TestTransreal(unittest.TestCase):
         """Nullity is not greater than any transreal number."""
         self.assertFalse(Transreal(1) > transmaths.NULLITY)
 
+    def test_hash(self):
+        """Equal numbers have equal hashes, whether or not they are transreal."""
+        self.assertEqual(hash(Transreal(1, 2)), hash(0.5))
+        self.assertEqual(hash(transmaths.INFINITY), hash(float("inf")))
+
     def test_iadd(self):
         """In-place addition."""
         t = Transreal(1)
@@ -59,6 +150,11 @@ class TestTransreal(unittest.TestCase):
         t //= 2
         self.assertEqual(t, 2)
 
+    def test_immutable(self):
+        """Transreal numbers cannot be modified."""
+        with self.assertRaises(AttributeError):
+            Transreal(1).numerator = 2
+
     def test_init_exceptions(self):
         """Initialising a transreal incorrectly raises an exception."""
         # non-int denominator
@@ -87,6 +183,13 @@ class TestTransreal(unittest.TestCase):
         """Initalise transreal infinity from a transreal number and an imprecice number."""
         self.assertFalse(Transreal(Transreal(2).root(2), 0).approximate)
 
+    def test_init_singletons(self):
+        """Infinity, -infinity and nullity are singletons."""
+        self.assertIs(Transreal(2, 0), transmaths.INFINITY)
+        self.assertIs(Transreal(-2, 0), transmaths.NEGATIVE_INFINITY)
+        self.assertIs(Transreal(0, 0), transmaths.NULLITY)
+        self.assertIs(-transmaths.INFINITY, transmaths.NEGATIVE_INFINITY)
+
     def test_init_transreal_int(self):
         """Initialise a transreal number from a transreal numerator and a int denominator."""
         t = Transreal(Transreal(4), 2)
@@ -125,6 +228,17 @@ class TestTransreal(unittest.TestCase):
         """Transreal numbers can be compared using "less than or equal to"."""
         self.assertLessEqual(Transreal(1), Transreal(2))
 
+    def test_limit_denominator(self):
+        """The closest fraction with a small enough denominator is the same as for Fraction, and approximate."""
+        for numerator, denominator, max_denominator in [(314159, 100000, 100), (-314159, 100000, 7), (10, 3, 3)]:
+            limited = Transreal(numerator, denominator).limit_denominator(max_denominator)
+            expected = fractions.Fraction(numerator, denominator).limit_denominator(max_denominator)
+            self.assertEqual((limited.numerator, limited.denominator), (expected.numerator, expected.denominator))
+            self.assertEqual(limited.approximate, expected != fractions.Fraction(numerator, denominator))
+        self.assertIs(transmaths.INFINITY.limit_denominator(1), transmaths.INFINITY)
+        with self.assertRaises(ValueError):
+            Transreal(1, 3).limit_denominator(0)
+
     def test_lt_exception(self):
         """Transreal numbers cannot be compared to strings."""
         with self.assertRaises(TypeError):
@@ -140,6 +254,16 @@ class TestTransreal(unittest.TestCase):
         with self.assertRaises(TypeError):
             Transreal(2) * "two"
 
+    def test_pickle(self):
+        """Transreal numbers can be pickled, and infinity, -infinity and nullity are still singletons."""
+        for value in [Transreal(1, 3), Transreal(-5, 2, approximate=True), Transreal(2**100, 3)]:
+            unpickled = pickle.loads(pickle.dumps(value))
+            self.assertEqual((str(unpickled), unpickled.approximate), (str(value), value.approximate))
+        for value in [transmaths.INFINITY, transmaths.NEGATIVE_INFINITY, transmaths.NULLITY]:
+            self.assertIs(pickle.loads(pickle.dumps(value)), value)
+        complex_value = Transcomplex(Transreal(2), Transreal(1, 2))
+        self.assertEqual(pickle.loads(pickle.dumps(complex_value)), complex_value)
+
     def test_pos(self):
         """Test the positive unary operator "yields its numeric argument unchanged"."""
         self.assertEqual(+Transreal(1), 1)
@@ -153,6 +277,14 @@ class TestTransreal(unittest.TestCase):
         """Three argument pow (self, power, modulus) is supported."""
         self.assertEqual(pow(Transreal(64), 6, 9), 1)
 
+    def test_pow_mod_fraction(self):
+        """Three argument pow works with fractions."""
+        self.assertEqual(pow(Transreal(3, 2), 3, Transreal(2)), Transreal(11, 8))
+
+    def test_pow_mod_large(self):
+        """Three argument pow doesn't work out huge powers in full."""
+        self.assertEqual(pow(Transreal(123456789), 10**6, 10**9 + 7), pow(123456789, 10**6, 10**9 + 7))
+
     def test_pow_nullity_1(self):
         """nullity**0 == nullityIf the power is zero, the result is (mostly) 1."""
         self.assertEqual(transmaths.NULLITY ** 0, transmaths.NULLITY)
@@ -232,6 +364,15 @@ class TestTransreal(unittest.TestCase):
         """The cube root of 64 is exactly 4 (not 3.9999999999999996)."""
         self.assertEqual(Transreal(64).root(3), 4)
 
+    def test_root_exact_fraction(self):
+        """The square root of 9/4 is exactly 3/2."""
+        self.assertFalse(Transreal(9, 4).root(2).approximate)
+        self.assertEqual(Transreal(9, 4).root(2), Transreal(3, 2))
+
+    def test_root_fraction(self):
+        """The (1/2)th root of a number is its square."""
+        self.assertEqual(Transreal(2).root(Transreal(1, 2)), 4)
+
     def test_root_infinity(self):
         """The square root of infinity is infinity."""
         self.assertEqual(transmaths.INFINITY.root(2), transmaths.INFINITY)
@@ -244,6 +385,23 @@ class TestTransreal(unittest.TestCase):
         """The infinite root of a real number is 0."""
         self.assertEqual(Transreal(1).root(transmaths.INFINITY), 0)
 
+    def test_root_large(self):
+        """Roots of large numbers are rounded down."""
+        self.assertEqual(Transreal(10**40 + 1).root(2), 10**20)
+        self.assertTrue(Transreal(10**40 + 1).root(2).approximate)
+
+    def test_root_many(self):
+        """Many roots can be found at once, with the same results as finding them one at a time."""
+        radicands = [2, Transreal(9, 4), 2, transmaths.NULLITY, transmaths.INFINITY, Transreal(64), 0]
+        self.assertEqual(
+            [str(root) for root in Transreal.root_many(radicands, 3)],
+            [str(Transreal(radicand).root(3)) for radicand in radicands])
+        self.assertEqual(Transreal.root_many([-1], 2), [Transcomplex(1, transmaths.PI / 2)])
+        roots = Transreal.root_many([-4, -4], 2)
+        self.assertIsNot(roots[0], roots[1])
+        roots[0].magnitude = Transreal(7)
+        self.assertEqual(roots[1].magnitude, 2)
+
     def test_root_negative(self):
         """The square root of -1 should be a complex number, but for now is nullity."""
         self.assertEqual(Transreal(-1).root(2), Transcomplex(1, transmaths.PI / 2))
@@ -256,6 +414,10 @@ class TestTransreal(unittest.TestCase):
         """The square root of nullity is nullity."""
         self.assertEqual(transmaths.NULLITY.root(2), transmaths.NULLITY)
 
+    def test_root_precision(self):
+        """Irrational roots are rounded down to the requested number of decimal places."""
+        self.assertEqual(str(Transreal(2).root(2, precision=3)), "~707/500")
+
     def test_sign_negative(self):
         """Test the sign function for negative numbers."""
         self.assertEqual(Transreal(-1).sign(), -1)
@@ -303,5 +465,812 @@ class TestTransreal(unittest.TestCase):
             Transreal(2) / "two"
 
 
+class TestBudget(unittest.TestCase):
+    """Tests limiting roots and powers with a Budget."""
+
+    def test_max_bits(self):
+        """Roots which would need too many bits are rounded to fewer bits instead."""
+        root = Transreal(2).root(2, budget=transmaths.Budget(max_bits=20))
+        self.assertTrue(root.approximate)
+        self.assertLess(abs(root - Transreal(2).root(2)), Transreal(1, 100))
+
+    def test_max_iterations(self):
+        """Roots which would need too many iterations are approximate."""
+        budget = transmaths.Budget(max_iterations=2)
+        root = Transreal(2).root(5, precision=300, budget=budget)
+        self.assertTrue(root.approximate)
+        self.assertGreater(root ** 5, 2)
+        self.assertEqual(budget.iterations, 3)
+
+    def test_pow_fraction(self):
+        """Fractional powers which would need too many bits are approximate."""
+        self.assertTrue(Transreal(3).pow(Transreal(10**9 + 1, 10**9), budget=transmaths.Budget(max_bits=1000)).approximate)
+
+    def test_pow_whole(self):
+        """Whole powers which would need too many bits raise an exception."""
+        with self.assertRaises(transmaths.BudgetExceeded):
+            Transreal(3).pow(10**9, budget=transmaths.Budget(max_bits=1000))
+
+    def test_strict(self):
+        """Strict budgets raise an exception when they run out."""
+        with self.assertRaises(transmaths.BudgetExceeded):
+            Transreal(2).root(2, budget=transmaths.Budget(max_bits=20, strict=True))
+
+
+class TestBitLimit(unittest.TestCase):
+    """Tests rounding every transreal number to a limited number of bits."""
+
+    def tearDown(self):
+        transmaths.set_bit_limit(None)
+
+    def test_bit_limit(self):
+        """Numbers stay within the limit however long a computation goes on, and are approximate."""
+        x = Transreal(1, 3)
+        with transmaths.bit_limit(64):
+            for _ in range(100):
+                x = Transreal(7, 2) * x * (1 - x)
+                self.assertLessEqual(max(x.numerator.bit_length(), x.denominator.bit_length()), 64)
+        self.assertTrue(x.approximate)
+        self.assertIsNone(transmaths.set_bit_limit(None))
+        self.assertEqual(Transreal(1, 2**70).denominator, 2**70)
+
+    def test_exact(self):
+        """Numbers which already fit, or can't be made to fit, are left alone."""
+        transmaths.set_bit_limit(8)
+        self.assertEqual(str(Transreal(3, 7) + Transreal(1, 7)), "4/7")
+        self.assertEqual(str(Transreal(2**20 + 1, 3)), "~349526")
+        self.assertIs(Transreal(10**30, 0), transmaths.INFINITY)
+        self.assertEqual(transmaths.set_bit_limit(None), 8)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests counting operations, coercions, gcd calls, root iterations and trigonometric calls."""
+
+    def setUp(self):
+        transmaths.instrumentation_snapshot(reset=True)
+
+    def tearDown(self):
+        transmaths.set_instrumentation(False)
+        transmaths.instrumentation_snapshot(reset=True)
+
+    def test_counts(self):
+        """Operations, constructions and the rest are counted while instrumentation is on, and only then."""
+        Transreal(1, 3) + Transreal(1, 6)
+        self.assertEqual(transmaths.instrumentation_snapshot()["operations"], {})
+        with transmaths.instrumentation():
+            x = Transreal(1, 3) + Transreal(1, 6) * 2
+            Transreal(2**200 + 1).root(3)
+        self.assertEqual(str(x), "2/3")
+        snapshot = transmaths.instrumentation_snapshot(reset=True)
+        self.assertEqual(snapshot["operations"]["Transreal.__add__"], 1)
+        self.assertEqual(snapshot["operations"]["Transreal.__mul__"], 1)
+        self.assertEqual(snapshot["operations"]["Transreal.root"], 1)
+        self.assertGreaterEqual(snapshot["constructions"]["Transreal"], 2)
+        self.assertEqual(snapshot["coercions"], {"Transreal": {"int": 2}})
+        self.assertGreater(snapshot["gcd_calls"], 0)
+        self.assertEqual(sum(snapshot["gcd_operand_bits"].values()), snapshot["gcd_calls"])
+        self.assertGreater(snapshot["gcd_operand_bits"]["256"], 0)
+        self.assertGreater(snapshot["root_iterations"], 0)
+        self.assertGreater(snapshot["max_numerator_bits"], 64)
+        self.assertEqual(transmaths.instrumentation_snapshot()["gcd_calls"], 0)
+        with transmaths.instrumentation():
+            z = Transcomplex(Transreal(2), Transreal(1, 3))
+            z + z
+        snapshot = transmaths.instrumentation_snapshot()
+        self.assertEqual(snapshot["operations"], {"Transcomplex.__add__": 1})
+        self.assertEqual(snapshot["constructions"]["Transcomplex"], 2)
+        self.assertEqual(snapshot["trigonometric_calls"], {"math.cos": 1, "math.sin": 1})
+
+    def test_off(self):
+        """Turning instrumentation on and off leaves the methods and modules alone."""
+        add = Transreal.__add__
+        self.assertFalse(transmaths.set_instrumentation(True))
+        self.assertIs(Transreal.__add__, add)
+        self.assertIs(transmaths.gcd, math.gcd)
+        self.assertIs(transmaths.math, math)
+        self.assertEqual(str(Transreal.from_string("0.5") + 1), "3/2")
+        self.assertTrue(transmaths.set_instrumentation(False))
+        self.assertFalse(transmaths.set_instrumentation(False))
+        self.assertIs(Transreal.__add__, add)
+        self.assertEqual(str(Transreal.from_string("0.5") + 1), "3/2")
+        self.assertEqual(transmaths.instrumentation_snapshot()["operations"], {"Transreal.__add__": 1})
+
+    def test_prometheus(self):
+        """The counts can be exported in the Prometheus text format."""
+        with transmaths.instrumentation():
+            Transreal(1, 3) * 3
+        text = transmaths.instrumentation_prometheus()
+        self.assertIn('transmaths_operations_total{method="Transreal.__mul__"} 1\n', text)
+        self.assertIn('transmaths_coercions_total{to="Transreal",from="int"} 1\n', text)
+        self.assertIn("# TYPE transmaths_gcd_operand_bits histogram\n", text)
+        self.assertIn('transmaths_gcd_operand_bits_bucket{le="+Inf"} ', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_timing_hooks(self):
+        """Timing hooks are called with each operation and how long it took."""
+        calls = []
+        hook = lambda operation, seconds: calls.append((operation, seconds >= 0))
+        transmaths.add_timing_hook(hook)
+        try:
+            with transmaths.instrumentation():
+                Transreal(1, 3) - Transreal(1, 2)
+        finally:
+            transmaths.remove_timing_hook(hook)
+        self.assertIn(("Transreal.__sub__", True), calls)
+        count = len(calls)
+        with transmaths.instrumentation():
+            Transreal(1, 3) - Transreal(1, 2)
+        self.assertEqual(len(calls), count)
+
+
+class TestTransrealAccumulator(unittest.TestCase):
+    """Tests the TransrealAccumulator object."""
+
+    def test_add(self):
+        """Accumulated sums are identical to adding transreal numbers one at a time."""
+        values = [Transreal(n, d) for n in range(-5, 6) for d in range(1, 8)] + [Transreal(2).root(2)]
+        accumulator = transmaths.TransrealAccumulator()
+        total = Transreal(0)
+        for value in values:
+            accumulator += value
+            total += value
+        self.assertEqual(accumulator, total)
+        self.assertEqual(str(accumulator), str(total))
+
+    def test_add_nullity(self):
+        """Infinity and -infinity sum to nullity."""
+        accumulator = transmaths.TransrealAccumulator(1)
+        accumulator += transmaths.INFINITY
+        accumulator -= transmaths.INFINITY
+        accumulator += 1
+        self.assertIs(accumulator.value, transmaths.NULLITY)
+
+    def test_max_bits(self):
+        """The sum is reduced once the denominator grows too large."""
+        accumulator = transmaths.TransrealAccumulator(Transreal(1, 2), max_bits=2)
+        accumulator += Transreal(1, 6)
+        self.assertEqual(accumulator.value, Transreal(2, 3))
+        self.assertEqual(str(accumulator.value), "2/3")
+        accumulator += Transreal(1, 12)
+        self.assertEqual(str(accumulator.value), "3/4")
+
+    def test_sub(self):
+        """Values can be subtracted from the sum."""
+        accumulator = transmaths.TransrealAccumulator(Transreal(1, 2))
+        accumulator -= Transreal(1, 3)
+        self.assertEqual(accumulator.value, Transreal(1, 6))
+
+
+class TestSorting(unittest.TestCase):
+    """Tests sorting and searching collections of transreal numbers."""
+
+    values = [Transreal(1, 2), transmaths.NULLITY, transmaths.INFINITY, Transreal(-3), transmaths.NEGATIVE_INFINITY,
+              Transreal(2, 3), Transreal(0)]
+    ordered = [transmaths.NEGATIVE_INFINITY, Transreal(-3), Transreal(0), Transreal(1, 2), Transreal(2, 3),
+               transmaths.INFINITY, transmaths.NULLITY]
+
+    def test_argsort(self):
+        """argsort gives the indices which sort the values."""
+        self.assertEqual(transmaths.argsort(self.values), [4, 3, 6, 0, 5, 2, 1])
+
+    def test_bisect(self):
+        """Values can be found in a sorted list, either side of any equal values."""
+        self.assertEqual(transmaths.bisect_left(self.ordered, Transreal(1, 2)), 3)
+        self.assertEqual(transmaths.bisect_right(self.ordered, Transreal(1, 2)), 4)
+        self.assertEqual(transmaths.bisect_left(self.ordered, transmaths.NULLITY), 6)
+        self.assertEqual(transmaths.bisect_right(self.ordered, 100), 5)
+
+    def test_compare_large(self):
+        """Comparing numbers with big denominators gives the same answers as comparing the fractions."""
+        numbers = [Transreal(n * 3**200 + 1, 7**150) for n in (-2, -1, 0, 1, 2)]
+        numbers += [Transreal(3**400, 7**150 + 1), Transreal(-(3**400), 7**150 + 1), Transreal(0)]
+        numbers += [transmaths.INFINITY, transmaths.NEGATIVE_INFINITY]
+        for a in numbers:
+            for b in numbers:
+                if a.denominator == b.denominator:
+                    left, right = a.numerator, b.numerator
+                else:
+                    left, right = a.numerator * b.denominator, b.numerator * a.denominator
+                self.assertEqual(a < b, left < right)
+                self.assertEqual(a > b, left > right)
+                self.assertEqual(a <= b, left <= right)
+                self.assertEqual(a >= b, left >= right)
+
+    def test_encode_key(self):
+        """Keys compare byte by byte in the same order as the numbers, and give the numbers back."""
+        values = self.values + [Transreal(-1, 3), Transreal(-2, 5), Transreal(3, 2**300), Transreal(-(3**400), 7),
+                                Transreal(3**400, 7), Transreal(3**400 + 1, 7), Transreal(1, 2, approximate=True)]
+        keys = [transmaths.encode_key(value) for value in values]
+        self.assertEqual([str(transmaths.decode_key(key)) for key in sorted(keys)],
+                         [str(value) for value in transmaths.sort(values)])
+        for key, value in zip(keys, values):
+            self.assertEqual(str(transmaths.decode_key(key)), str(value))
+        for key in [b"", b"\x07", b"\x04\x01", b"\x04\x01\xff\x02"]:
+            with self.assertRaises(ValueError):
+                transmaths.decode_key(key)
+
+    def test_min_max(self):
+        """Nullity is the biggest value in the total order."""
+        self.assertIs(transmaths.minimum(self.values), transmaths.NEGATIVE_INFINITY)
+        self.assertIs(transmaths.maximum(self.values), transmaths.NULLITY)
+        self.assertEqual(transmaths.minimum([3, Transreal(5, 2)]), Transreal(5, 2))
+
+    def test_searchsorted(self):
+        """Many values can be found in a sorted list at once."""
+        self.assertEqual(transmaths.searchsorted(self.ordered, [Transreal(2, 3), -10]), [4, 1])
+        self.assertEqual(transmaths.searchsorted(self.ordered, [Transreal(2, 3), -10], side="right"), [5, 1])
+        with self.assertRaises(ValueError):
+            transmaths.searchsorted(self.ordered, [1], side="middle")
+
+    def test_sort(self):
+        """Sorting puts nullity after infinity."""
+        self.assertEqual([str(value) for value in transmaths.sort(self.values)], [str(value) for value in self.ordered])
+        self.assertEqual(transmaths.sort(self.values, reverse=True)[0], transmaths.NULLITY)
+
+    def test_sort_close(self):
+        """Numbers too close together to be told apart as floats are still sorted."""
+        a = Transreal(10**30 + 1, 10**30)
+        b = Transreal(10**30 + 2, 10**30)
+        c = Transreal(10**400, 3)
+        self.assertEqual(transmaths.sort([c, b, a, 1]), [1, a, b, c])
+
+    def test_sqlite(self):
+        """SQLite stores transreal numbers, and compares them in the total order."""
+        transmaths.register_sqlite()
+        connection = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        self.addCleanup(connection.close)
+        connection.execute("CREATE TABLE numbers (value TRANSREAL)")
+        connection.execute("CREATE INDEX numbers_value ON numbers (value)")
+        connection.executemany("INSERT INTO numbers VALUES (?)", [(value,) for value in self.values])
+        rows = connection.execute("SELECT value FROM numbers WHERE value > ? ORDER BY value", (Transreal(-1, 2),))
+        self.assertEqual([str(value) for value, in rows], [str(value) for value in self.ordered[2:]])
+
+    def test_top_k(self):
+        """The k biggest or smallest values can be found without sorting everything."""
+        self.assertEqual([str(value) for value in transmaths.top_k(self.values, 2)], ["nullity", "infinity"])
+        self.assertEqual(transmaths.top_k(self.values, 2, largest=False), [transmaths.NEGATIVE_INFINITY, -3])
+
+
+@unittest.skipIf(transmaths.numpy is None, "NumPy is not installed")
+class TestTransrealArray(unittest.TestCase):
+    """Tests the TransrealArray object."""
+
+    values = [transmaths.INFINITY, transmaths.NEGATIVE_INFINITY, transmaths.NULLITY, Transreal(0),
+              Transreal(0, 1, approximate=True), Transreal(1), Transreal(-7, 3, approximate=True), Transreal(3, 4),
+              Transreal(2**62, 3), Transreal(2**70 + 1, 2**65)]
+
+    def assertElementsIdentical(self, array, values):
+        """Asserts that the elements of a transreal array are identical to the transreal numbers in values."""
+        self.assertEqual([str(element) for element in array], [str(Transreal(value)) for value in values])
+
+    def test_arithmetic(self):
+        """Arithmetic on arrays gives the same results as arithmetic on each element."""
+        pairs = [(a, b) for a in self.values for b in self.values]
+        array1 = transmaths.TransrealArray(a for a, b in pairs)
+        array2 = transmaths.TransrealArray(b for a, b in pairs)
+        for operation in (operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv):
+            self.assertElementsIdentical(operation(array1, array2), [operation(a, b) for a, b in pairs])
+
+    def test_chained(self):
+        """Results which haven't been put in lowest terms yet give the same results."""
+        array = transmaths.TransrealArray(self.values)
+        result = (array + Transreal(1, 6)) * Transreal(3, 10) - Transreal(1, 4)
+        values = [(value + Transreal(1, 6)) * Transreal(3, 10) - Transreal(1, 4) for value in self.values]
+        self.assertElementsIdentical(result, values)
+        self.assertEqual(result.denominators.tolist(), [value.denominator for value in values])
+
+    def test_compare(self):
+        """Comparisons are done element by element, and nullity is only equal to itself."""
+        array = transmaths.TransrealArray(self.values)
+        for operation in (operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge):
+            for value in self.values:
+                self.assertEqual(operation(array, value).tolist(), [operation(a, value) for a in self.values])
+
+    def test_floats(self):
+        """Arrays can be made from floats exactly, and turned back into them, with NaN as nullity."""
+        floats = [0.1, -2.5, 0.0, 1e300, 1e-300, float("inf"), float("-inf")]
+        array = transmaths.TransrealArray.from_floats(floats + [float("nan")])
+        self.assertElementsIdentical(array, floats + [transmaths.NULLITY])
+        self.assertEqual(array.to_floats().tolist()[:-1], floats)
+        self.assertTrue(math.isnan(array.to_floats()[-1]))
+
+    def test_masks(self):
+        """Infinity, -infinity and nullity can be found without looking at each element."""
+        array = transmaths.TransrealArray(self.values)
+        self.assertEqual(array.is_infinity().tolist()[:4], [True, False, False, False])
+        self.assertEqual(array.is_negative_infinity().tolist()[:4], [False, True, False, False])
+        self.assertEqual(array.is_nullity().tolist()[:4], [False, False, True, False])
+        self.assertEqual(array.is_finite().tolist()[:4], [False, False, False, True])
+
+    def test_overflow(self):
+        """Numerators and denominators which don't fit in an int64 are stored as Python ints."""
+        array = transmaths.TransrealArray([2**62, Transreal(1, 3)])
+        self.assertEqual(array.numerators.dtype, transmaths.numpy.int64)
+        self.assertEqual((array * 4).numerators.dtype, object)
+        self.assertEqual((array * 4).numerators.tolist(), [2**64, 4])
+
+    def test_pow(self):
+        """Powers of arrays give the same results as powers of each element."""
+        array = transmaths.TransrealArray(self.values)
+        for power in (0, 1, 2, 3, -1, -2, Transreal(2, approximate=True), 40):
+            self.assertElementsIdentical(array ** power, [value ** power for value in self.values])
+
+    def test_unary(self):
+        """abs, -, floor and sign give the same results as they do for each element."""
+        array = transmaths.TransrealArray(self.values)
+        self.assertElementsIdentical(abs(array), [abs(value) for value in self.values])
+        self.assertElementsIdentical(-array, [-value for value in self.values])
+        self.assertElementsIdentical(array.floor(), [value.floor() for value in self.values])
+        self.assertElementsIdentical(array.sign(), [value.sign() for value in self.values])
+
+
+class TestTransrealColumn(unittest.TestCase):
+    """Tests save_column and the TransrealColumn object."""
+
+    values = TestTransrealArray.values + [
+        Transreal(-2**63 + 1), Transreal(2**63), Transreal(-1, 2**80, approximate=True)]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "column")
+
+    def test_bad_file(self):
+        """Opening a file which wasn't written by save_column is an error."""
+        with open(self.path, "wb") as file:
+            file.write(b"not a transreal column")
+        with self.assertRaises(ValueError):
+            transmaths.TransrealColumn(self.path)
+
+    def test_empty(self):
+        """A column can have no numbers."""
+        transmaths.save_column(self.path, [])
+        with transmaths.TransrealColumn(self.path) as column:
+            self.assertEqual(list(column), [])
+
+    def test_read(self):
+        """The numbers read back are the same as the numbers written, one at a time or all at once."""
+        transmaths.save_column(self.path, self.values)
+        with transmaths.TransrealColumn(self.path) as column:
+            self.assertEqual(len(column), len(self.values))
+            self.assertEqual([str(value) for value in column], [str(value) for value in self.values])
+            self.assertEqual(str(column[-1]), str(self.values[-1]))
+            self.assertEqual([str(value) for value in column[2:5]], [str(value) for value in self.values[2:5]])
+            self.assertIs(column[2], transmaths.NULLITY)
+            with self.assertRaises(IndexError):
+                column[len(self.values)]
+
+    @unittest.skipIf(transmaths.numpy is None, "NumPy is not installed")
+    def test_to_array(self):
+        """Columns can be read as transreal arrays, and written from them."""
+        for values in [self.values, self.values[3:8]]:
+            transmaths.save_column(self.path, transmaths.TransrealArray(values))
+            with transmaths.TransrealColumn(self.path) as column:
+                array = column.to_array()
+            # the array is still usable after the column is closed
+            self.assertEqual([str(value) for value in array + 0], [str(value) for value in values])
+
+
+class TestReductions(unittest.TestCase):
+    """Tests the sum, prod and mean functions."""
+
+    values = [3, Transreal(1, 2), -0.25, Transreal(-7, 3, approximate=True), 0, Transreal(5, 6)]
+
+    def assertIdentical(self, first, second):
+        """Asserts that two transreal numbers have the same value and are both exact or both approximate."""
+        self.assertEqual(str(first), str(second))
+
+    def test_fsum(self):
+        """Floats are added up exactly, with NaN as nullity."""
+        values = [0.1, 1e100, -0.3, -1e100, 2.0**-1074, 5]
+        self.assertEqual(str(transmaths.fsum(values)), str(transmaths.sum(values)))
+        self.assertIs(transmaths.fsum([1.5, float("inf"), 2.0]), transmaths.INFINITY)
+        self.assertIs(transmaths.fsum([float("-inf"), float("inf")]), transmaths.NULLITY)
+        self.assertIs(transmaths.fsum([float("nan"), 1.0]), transmaths.NULLITY)
+        with self.assertRaises(TypeError):
+            transmaths.fsum([Transreal(1, 3)])
+
+    def test_mean(self):
+        """The mean is the sum divided by how many values there are, so the mean of nothing is nullity."""
+        self.assertIdentical(transmaths.mean(self.values), transmaths.sum(self.values) / len(self.values))
+        self.assertIs(transmaths.mean([]), transmaths.NULLITY)
+
+    def test_nullity(self):
+        """Reductions stop as soon as the result is nullity, even on endless iterables."""
+        self.assertIs(transmaths.sum(itertools.chain([1, transmaths.NULLITY], itertools.count())), transmaths.NULLITY)
+        self.assertIs(transmaths.sum(itertools.chain(
+            [transmaths.INFINITY, 2, transmaths.NEGATIVE_INFINITY], itertools.count())), transmaths.NULLITY)
+        self.assertIs(transmaths.prod(itertools.chain([0, transmaths.INFINITY], itertools.count())), transmaths.NULLITY)
+
+    def test_parallel_map(self):
+        """Mapping in a pool of processes gives the same results as mapping one at a time."""
+        values = self.values * 5 + [Transreal(2**100, 3), transmaths.NULLITY]
+        expected = [str(-Transreal(value)) for value in values]
+        self.assertEqual([str(value) for value in transmaths.parallel_map(operator.neg, values, 2, 4)], expected)
+        self.assertEqual(transmaths.parallel_map(operator.neg, []), [])
+        if transmaths.numpy is not None:
+            array = transmaths.parallel_map(operator.neg, transmaths.TransrealArray(values), 2, 4)
+            self.assertIsInstance(array, transmaths.TransrealArray)
+            self.assertEqual([str(value) for value in array], expected)
+
+    def test_parallel_reduce(self):
+        """Reducing in a pool of processes is identical to reducing one at a time, when the function is associative."""
+        values = self.values[:-2] * 3
+        self.assertIdentical(transmaths.parallel_reduce(operator.mul, values, chunk_size=4),
+                             functools.reduce(operator.mul, values))
+        self.assertIdentical(transmaths.parallel_reduce(operator.mul, values, 2, chunk_size=4),
+                             functools.reduce(operator.mul, values, Transreal(2)))
+
+    def test_parallel_sum(self):
+        """Adding up in a pool of processes is identical to sum."""
+        values = self.values * 5
+        self.assertIdentical(transmaths.parallel_sum(values, 10, processes=2, chunk_size=4),
+                             transmaths.sum(values, 10))
+        self.assertIs(transmaths.parallel_sum(values + [transmaths.INFINITY], chunk_size=4), transmaths.INFINITY)
+
+    def test_prod(self):
+        """Products are identical to multiplying transreal numbers one at a time."""
+        product = Transreal(1)
+        for value in self.values[:-2]:
+            product *= value
+        self.assertIdentical(transmaths.prod(self.values[:-2]), product)
+        self.assertIdentical(transmaths.prod(self.values), Transreal(0))
+        self.assertIs(transmaths.prod([-2, transmaths.INFINITY, Transreal(1, 3)]), transmaths.NEGATIVE_INFINITY)
+        self.assertIdentical(transmaths.prod([], start=Transreal(0, 1, approximate=True)), "~0")
+
+    def test_sum(self):
+        """Sums are identical to adding transreal numbers one at a time."""
+        total = Transreal(10)
+        for value in self.values:
+            total += value
+        self.assertIdentical(transmaths.sum(self.values, start=10), total)
+        self.assertIs(transmaths.sum([1, transmaths.INFINITY, -5, transmaths.INFINITY]), transmaths.INFINITY)
+
+    def test_sum_max_bits(self):
+        """The sum is the same however often it is put in lowest terms."""
+        values = [Transreal(1, n) for n in range(1, 50)]
+        self.assertIdentical(transmaths.sum(values, max_bits=8), transmaths.sum(values))
+
+
+class TestTransrealMatrix(unittest.TestCase):
+    """Tests the TransrealMatrix object."""
+
+    matrix = transmaths.TransrealMatrix([[2, Transreal(1, 3), -1], [0, 4, Transreal(5, 2)], [-3, 1, Transreal(2, 7)]])
+    singular = transmaths.TransrealMatrix([[1, 2, 3], [2, 4, 6], [1, 0, 1]])
+
+    def determinant(self, rows):
+        """Work out a determinant with fractions, from the sum over every permutation."""
+        determinant = fractions.Fraction(0)
+        for permutation in itertools.permutations(range(len(rows))):
+            inversions = sum(a > b for a, b in itertools.combinations(permutation, 2))
+            term = fractions.Fraction((-1) ** inversions)
+            for row, column in enumerate(permutation):
+                value = rows[row][column]
+                term *= fractions.Fraction(value._numerator, value._denominator)
+            determinant += term
+        return Transreal(determinant.numerator, determinant.denominator)
+
+    def test_construct(self):
+        """Matrices can be indexed, and their rows must all be the same length."""
+        self.assertEqual(self.matrix.shape, (3, 3))
+        self.assertEqual(self.matrix[1, 2], Transreal(5, 2))
+        self.assertEqual(self.matrix[0], (2, Transreal(1, 3), -1))
+        self.assertEqual(str(transmaths.TransrealMatrix.identity(2)), "[[1, 0], [0, 1]]")
+        self.assertEqual(self.matrix.transpose()[0, 2], -3)
+        with self.assertRaises(ValueError):
+            transmaths.TransrealMatrix([[1, 2], [3]])
+
+    def test_determinant(self):
+        """Determinants are exact, and approximate if any element is."""
+        for rows in [self.matrix, self.singular, [[0, 1], [1, 0]], [[Transreal(1, 3)]]]:
+            rows = transmaths.TransrealMatrix(rows)
+            self.assertEqual(rows.determinant(), self.determinant(rows))
+        self.assertEqual(self.singular.determinant(), 0)
+        self.assertEqual(str(transmaths.TransrealMatrix([[Transreal(1, 1, True), 0], [0, 2]]).determinant()), "~2")
+        self.assertIs(transmaths.TransrealMatrix([[transmaths.INFINITY, 1], [0, 1]]).determinant(), transmaths.INFINITY)
+
+    def test_inverse(self):
+        """The inverse of a singular matrix is its adjugate divided by 0."""
+        self.assertEqual(self.matrix @ self.matrix.inverse(), transmaths.TransrealMatrix.identity(3))
+        inverse = transmaths.TransrealMatrix([[1, 1], [1, 1]]).inverse()
+        self.assertEqual(str(inverse), "[[infinity, -infinity], [-infinity, infinity]]")
+        self.assertEqual(str(transmaths.TransrealMatrix([[0, 0], [0, 0]]).inverse()),
+                         "[[nullity, nullity], [nullity, nullity]]")
+
+    def test_matmul(self):
+        """Products are identical to summing products of transreal numbers."""
+        other = transmaths.TransrealMatrix([[1, Transreal(2, 3, True)], [0, 5], [Transreal(-1, 4), 0]])
+        self.assertEqual(str(self.matrix @ other), str(transmaths.TransrealMatrix([
+            [sum((self.matrix[row, index] * other[index, column] for index in range(3)), Transreal(0))
+             for column in range(2)] for row in range(3)])))
+        self.assertEqual(str(other.transpose() @ transmaths.TransrealMatrix([[0], [1], [transmaths.INFINITY]])),
+                         "[[-infinity], [nullity]]")
+        with self.assertRaises(ValueError):
+            other @ other
+
+    def test_rank(self):
+        """The rank is the number of linearly independent rows."""
+        self.assertEqual(self.matrix.rank(), 3)
+        self.assertEqual(self.singular.rank(), 2)
+        self.assertEqual(transmaths.TransrealMatrix([[1, 2, 3], [2, 4, 6]]).rank(), 1)
+        with self.assertRaises(ValueError):
+            transmaths.TransrealMatrix([[transmaths.NULLITY]]).rank()
+
+    def test_solve(self):
+        """Solutions are exact, and a singular matrix gives infinities or nullity."""
+        vector = [1, Transreal(-2, 5), 3]
+        self.assertEqual(list(self.matrix @ transmaths.TransrealMatrix([[x] for x in self.matrix.solve(vector)])),
+                         [(value,) for value in vector])
+        self.assertEqual(str(self.singular.solve([1, 2, 0])), "[nullity, nullity, nullity]")
+        self.assertEqual(str(self.singular.solve([1, 1, 0])), "[infinity, infinity, -infinity]")
+        self.assertEqual(str(transmaths.TransrealMatrix([[1, 0], [0, 2]]).solve([transmaths.INFINITY, 1])),
+                         "[infinity, 1/2]")
+        with self.assertRaises(ValueError):
+            self.matrix.solve([1, 2])
+
+
+class TestTransrealPolynomial(unittest.TestCase):
+    """Tests the TransrealPolynomial object."""
+
+    # 3x^3 - 1/2x + 2/3
+    polynomial = transmaths.TransrealPolynomial([Transreal(2, 3), Transreal(-1, 2), 0, 3])
+    points = [0, Transreal(1, 3), -2, Transreal(5, 7, approximate=True),
+              transmaths.INFINITY, transmaths.NEGATIVE_INFINITY, transmaths.NULLITY]
+
+    def horner(self, coefficients, point):
+        """Evaluate a polynomial with Horner's method on transreal numbers."""
+        value = coefficients[-1]
+        for coefficient in reversed(coefficients[:-1]):
+            value = value * point + coefficient
+        return value
+
+    def test_add(self):
+        """Polynomials add coefficient by coefficient, and trailing zeroes are dropped."""
+        other = transmaths.TransrealPolynomial([1, 2, 0, -3])
+        self.assertEqual((self.polynomial + other).coefficients, (Transreal(5, 3), Transreal(3, 2)))
+        self.assertEqual((self.polynomial - self.polynomial).degree, -1)
+        self.assertEqual((1 - self.polynomial).coefficients[0], Transreal(1, 3))
+
+    def test_call(self):
+        """Values are identical to Horner's method in transreal arithmetic."""
+        for point in self.points:
+            self.assertEqual(str(self.polynomial(point)), str(self.horner(self.polynomial.coefficients, point)))
+        self.assertIs(self.polynomial(transmaths.NEGATIVE_INFINITY), transmaths.NEGATIVE_INFINITY)
+        self.assertEqual(transmaths.TransrealPolynomial([transmaths.INFINITY, 1])(-1), transmaths.INFINITY)
+        self.assertEqual(transmaths.TransrealPolynomial()(transmaths.NULLITY), 0)
+
+    def test_derivative(self):
+        """The derivative of 3x^3 - 1/2x + 2/3 is 9x^2 - 1/2."""
+        self.assertEqual(self.polynomial.derivative(), transmaths.TransrealPolynomial([Transreal(-1, 2), 0, 9]))
+
+    @unittest.skipIf(transmaths.numpy is None, "NumPy is not installed")
+    def test_evaluate(self):
+        """Evaluating at many points is identical to evaluating at each one."""
+        expected = [str(self.polynomial(point)) for point in self.points]
+        self.assertEqual([str(value) for value in self.polynomial.evaluate(self.points)], expected)
+        array = transmaths.TransrealArray(self.points)
+        self.assertEqual([str(value) for value in self.polynomial.evaluate(array).tolist()], expected)
+        # values which don't fit in an int64
+        big = transmaths.TransrealArray([Transreal(2**40 + 1, 3**20), 7])
+        self.assertEqual(self.polynomial.evaluate(big).tolist(), [self.polynomial(value) for value in big.tolist()])
+
+    def test_multiply(self):
+        """Products are identical to multiplying term by term, for short and long polynomials."""
+        for length in (3, 40):
+            coefficients1 = [Transreal((-3) ** power, power + 1) for power in range(length)]
+            coefficients2 = [Transreal(power - 7, 5) for power in range(length + 2)]
+            product = [Transreal(0)] * (2 * length + 1)
+            for index1, coefficient1 in enumerate(coefficients1):
+                for index2, coefficient2 in enumerate(coefficients2):
+                    product[index1 + index2] += coefficient1 * coefficient2
+            self.assertEqual(
+                (transmaths.TransrealPolynomial(coefficients1) * transmaths.TransrealPolynomial(coefficients2)),
+                transmaths.TransrealPolynomial(product))
+        self.assertEqual(str((self.polynomial * transmaths.INFINITY).coefficients),
+                         "(infinity, -infinity, nullity, infinity)")
+
+    def test_multiply_coefficients(self):
+        """Multiplying long int coefficient lists by packing them into big ints is identical to multiplying term by
+        term, with mixed signs and zeroes at the top."""
+        generator = random.Random(0)
+        for _ in range(200):
+            coefficients1 = [generator.randint(-1, 1) for _ in range(generator.randint(32, 80))]
+            coefficients2 = [generator.choice([-10**20, -1, 0, 1, 10**20]) for _ in range(generator.randint(32, 80))]
+            coefficients2[-1] = generator.choice([0, coefficients2[-1]])
+            product = [0] * (len(coefficients1) + len(coefficients2) - 1)
+            for index1, coefficient1 in enumerate(coefficients1):
+                for index2, coefficient2 in enumerate(coefficients2):
+                    product[index1 + index2] += coefficient1 * coefficient2
+            self.assertEqual(transmaths._multiply_coefficients(coefficients1, coefficients2), product)
+
+    def test_str(self):
+        """Polynomials are written highest degree first."""
+        self.assertEqual(str(self.polynomial), "3x^3 + -1/2x + 2/3")
+        self.assertEqual(str(transmaths.TransrealPolynomial([0])), "0")
+
+
+class TestTransrealFloat(unittest.TestCase):
+    """Tests the TransrealFloat object."""
+
+    def test_compare(self):
+        """Comparisons with transreal numbers are exact, and nullity is only equal to itself."""
+        TransrealFloat = transmaths.TransrealFloat
+        self.assertNotEqual(TransrealFloat(1 / 3), Transreal(1, 3))
+        self.assertGreater(Transreal(1, 3), TransrealFloat(1 / 3))
+        self.assertEqual(TransrealFloat(0.5), Transreal(1, 2))
+        self.assertEqual(TransrealFloat(float("nan")), transmaths.NULLITY)
+        self.assertGreaterEqual(TransrealFloat(float("nan")), TransrealFloat(float("nan")))
+        self.assertFalse(TransrealFloat(float("nan")) > 0 or TransrealFloat(float("nan")) < 0)
+        self.assertEqual(hash(TransrealFloat(float("nan"))), hash(transmaths.NULLITY))
+        self.assertEqual(hash(TransrealFloat(-2.5)), hash(Transreal(-5, 2)))
+
+    def test_construct(self):
+        """Transreal floats are the nearest float, and go back to transreal numbers exactly."""
+        TransrealFloat = transmaths.TransrealFloat
+        self.assertEqual(str(TransrealFloat(Transreal(1, 3))), "0.3333333333333333")
+        self.assertEqual(str(TransrealFloat(transmaths.NULLITY)), "nullity")
+        self.assertEqual(str(TransrealFloat(-10**400)), "-infinity")
+        self.assertEqual(str(TransrealFloat(-0.0)), "0.0")
+        self.assertEqual(TransrealFloat(0.1).to_transreal(), Transreal(0.1))
+        self.assertIs(TransrealFloat(float("-inf")).to_transreal(), transmaths.NEGATIVE_INFINITY)
+        with self.assertRaises(TypeError):
+            TransrealFloat("1")
+
+    def test_division(self):
+        """Dividing by zero gives infinity, -infinity or nullity."""
+        TransrealFloat = transmaths.TransrealFloat
+        self.assertEqual(str(TransrealFloat(2) / 0), "infinity")
+        self.assertEqual(str(-2 / TransrealFloat(0)), "-infinity")
+        self.assertEqual(str(TransrealFloat(0) / 0), "nullity")
+        self.assertEqual(str(divmod(TransrealFloat(7), 0)), "(infinity, nullity)")
+        self.assertEqual(str(divmod(TransrealFloat(7), -2)), "(-4.0, -1.0)")
+        self.assertEqual(TransrealFloat(-7) // transmaths.INFINITY, 0)
+
+    def test_mixed(self):
+        """Arithmetic with transreal numbers gives transreal floats, as arithmetic with fractions gives floats."""
+        value = Transreal(1, 4) + transmaths.TransrealFloat(1)
+        self.assertIsInstance(value, transmaths.TransrealFloat)
+        self.assertEqual(value, 1.25)
+        self.assertIsInstance(transmaths.NULLITY * transmaths.TransrealFloat(2), transmaths.TransrealFloat)
+
+    def test_pow(self):
+        """Whole powers follow Transreal, but roots of negative numbers are real or nullity, not transcomplex."""
+        TransrealFloat = transmaths.TransrealFloat
+        for base in [0, 2, Transreal(1, 2), -1, transmaths.INFINITY, transmaths.NULLITY]:
+            for power in [-1, 0, 2, transmaths.INFINITY, transmaths.NULLITY]:
+                self.assertEqual(TransrealFloat(base) ** power, Transreal(base) ** power)
+        self.assertEqual(TransrealFloat(2) ** 0.5, math.sqrt(2))
+        self.assertEqual(str(TransrealFloat(-8) ** 0.5), "nullity")
+        self.assertEqual(TransrealFloat(-8).root(3), -2)
+        self.assertIsInstance(Transreal(-8).root(3), Transcomplex)
+        self.assertEqual(str(TransrealFloat(-8) ** Transreal(1, 3)), "nullity")
+        self.assertEqual(str(TransrealFloat(10) ** 400), "infinity")
+
+    def test_round(self):
+        """Rounding gives the same answers as Transreal.round, rounding down."""
+        TransrealFloat = transmaths.TransrealFloat
+        for value in [2.7, -2.75, 2.25, -0.125, 1234.5, -1234.5]:
+            for decimal_places in [-2, 0, 1, 2]:
+                self.assertEqual(TransrealFloat(value).round(decimal_places),
+                                 float(Transreal(value).round(decimal_places)))
+        self.assertEqual(TransrealFloat(2.7).round(0), 2)
+        self.assertEqual(TransrealFloat(-2.75).round(1), -2.8)
+        self.assertEqual(TransrealFloat(1e300).round(10), 1e300)
+        self.assertEqual(str(TransrealFloat(float("nan")).round(2)), "nullity")
+
+
+class TestTranscomplex(unittest.TestCase):
+    """Tests the Transcomplex object."""
+
+    def test_add(self):
+        """Finite transcomplex numbers add up exactly, without any trigonometry once they are in cartesian form."""
+        total = Transcomplex(0)
+        value = Transcomplex(0.1 + 0.2j)
+        with transmaths.instrumentation():
+            for _ in range(10):
+                total += value
+        snapshot = transmaths.instrumentation_snapshot(reset=True)
+        transmaths.set_instrumentation(False)
+        self.assertEqual(snapshot["trigonometric_calls"], {})
+        self.assertEqual((total.real, total.imaginary), (Transreal(0.1) * 10, Transreal(0.2) * 10))
+        self.assertEqual(Transcomplex(3, 0) + Transcomplex.from_cartesian(1, 3), Transcomplex.from_cartesian(4, 3))
+        self.assertEqual(Transcomplex(3 + 4j) - (3 + 4j), 0)
+
+    def test_add_infinite(self):
+        """Adding infinite transcomplex numbers and nullity follows the transcomplex conventions."""
+        infinity = Transcomplex(transmaths.INFINITY, 1)
+        self.assertIs(infinity + Transcomplex(2, 3), infinity)
+        self.assertIs((Transcomplex(transmaths.INFINITY, 0) + Transcomplex(transmaths.NEGATIVE_INFINITY, 0)).magnitude,
+                      transmaths.NULLITY)
+        self.assertEqual(Transcomplex(transmaths.INFINITY, 1) + Transcomplex(transmaths.INFINITY, 2),
+                         Transcomplex(transmaths.INFINITY, Transreal(3, 2)))
+        self.assertIs((Transcomplex(transmaths.NULLITY, 0) + Transcomplex(1 + 1j)).magnitude, transmaths.NULLITY)
+
+    def test_cartesian(self):
+        """Transcomplex numbers can be made from real and imaginary parts, and the polar form is worked out lazily."""
+        value = Transcomplex.from_cartesian(3, -4)
+        self.assertIsNone(value._magnitude)
+        self.assertEqual(value.magnitude, 5)
+        self.assertEqual(float(value.angle), math.atan2(-4, 3))
+        self.assertEqual((value.real, value.imaginary), (3, -4))
+        self.assertAlmostEqual(float(Transcomplex.from_cartesian(10**400, 10**399).angle), math.atan2(1, 10))
+        value = Transcomplex.from_cartesian(Transreal(1, 10**400), Transreal(1, 10**399))
+        self.assertAlmostEqual(float(value.angle), math.atan2(10, 1))
+        self.assertEqual(Transcomplex(2, 0).real, 2)
+        self.assertEqual(Transcomplex(2, 0).imaginary, 0)
+        self.assertTrue(Transcomplex(2, Transreal(1, 3)).real.approximate)
+        self.assertEqual(Transcomplex.from_cartesian(transmaths.INFINITY, 0), Transcomplex(transmaths.INFINITY, 0))
+        self.assertIs(Transcomplex.from_cartesian(1, transmaths.NULLITY).magnitude, transmaths.NULLITY)
+        self.assertIs(Transcomplex(complex(math.nan, 1)).magnitude, transmaths.NULLITY)
+
+    def test_complex(self):
+        """Complex numbers are converted to polar form, without printing anything."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            value = Transcomplex(3 + 4j)
+            value * (1 + 1j)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(value.magnitude, 5)
+        self.assertEqual(value.angle, math.atan2(4, 3))
+
+    def test_conventions(self):
+        """Angles of infinity or nullity give the point at nullity, and a magnitude of zero gives an angle of 0."""
+        for magnitude, angle in [(transmaths.NULLITY, 2), (2, transmaths.NULLITY), (1, transmaths.INFINITY),
+                                 (1, transmaths.NEGATIVE_INFINITY)]:
+            value = Transcomplex(magnitude, angle)
+            self.assertIs(value.magnitude, transmaths.NULLITY)
+            self.assertEqual(value.angle, 0)
+        self.assertEqual(Transcomplex(0, 3).angle, 0)
+        self.assertEqual(Transcomplex(transmaths.INFINITY, 3).angle, 3)
+
+    def test_copy(self):
+        """Creating a transcomplex number from another copies it."""
+        value = Transcomplex(Transreal(2), Transreal(1, 3))
+        copy = Transcomplex(value)
+        self.assertIsNot(copy, value)
+        self.assertIs(copy.magnitude, value.magnitude)
+        self.assertIs(copy.angle, value.angle)
+
+    def test_multiply(self):
+        """Multiplication and division work in polar form, whichever form their operands are in."""
+        self.assertEqual(Transcomplex(2, Transreal(1, 3)) * Transcomplex(3, Transreal(1, 6)),
+                         Transcomplex(6, Transreal(1, 2)))
+        product = Transcomplex.from_cartesian(0, 2) * Transcomplex.from_cartesian(3, 0)
+        self.assertEqual(product.magnitude, 6)
+        self.assertAlmostEqual(float(product.angle), math.pi / 2)
+        self.assertEqual(Transcomplex(5, 2) / 0, Transcomplex(transmaths.INFINITY, 2))
+        # inexact magnitudes are as precise as floats, even when the parts don't fit in one
+        square = Transcomplex(1 + 1j) * Transcomplex(1 + 1j)
+        self.assertAlmostEqual(float(square.magnitude), 2, places=15)
+        self.assertAlmostEqual(float(square.angle), math.pi / 2, places=15)
+        self.assertEqual(Transcomplex.from_cartesian(Transreal(1, 3), Transreal(1, 4)).magnitude, Transreal(5, 12))
+        for scale in [Transreal(1, 10**200), Transreal(10**400)]:
+            magnitude = Transcomplex.from_cartesian(scale, scale).magnitude / scale
+            self.assertAlmostEqual(float(magnitude), math.sqrt(2), places=15)
+
+    def test_parts(self):
+        """The magnitude and angle are always transreal numbers, and there is no __dict__."""
+        for value in [Transcomplex(2, 0.5), Transcomplex(1j), Transcomplex(Transreal(1, 3)), Transcomplex(0, 1)]:
+            self.assertIsInstance(value.magnitude, Transreal)
+            self.assertIsInstance(value.angle, Transreal)
+            self.assertFalse(hasattr(value, "__dict__"))
+        self.assertEqual(Transcomplex(Transreal(1, 3)), Transcomplex(Transreal(1, 3), 0))
+
+    def test_pickle(self):
+        """Pickling keeps whichever forms have been worked out, so cartesian forms stay exact."""
+        value = Transcomplex.from_cartesian(Transreal(1, 3), Transreal(-2, 7))
+        unpickled = pickle.loads(pickle.dumps(value))
+        self.assertEqual((unpickled.real, unpickled.imaginary), (Transreal(1, 3), Transreal(-2, 7)))
+        self.assertIsNone(unpickled._magnitude)
+
+    def test_type_error(self):
+        """Anything other than numbers raises a TypeError."""
+        for arguments in [("two", 1), (1, 2, 3), (), ([1, 2],)]:
+            with self.assertRaises(TypeError):
+                Transcomplex(*arguments)
+        with self.assertRaises(TypeError):
+            Transcomplex(1, 2) * "two"
+
+
 if __name__ == "__main__":
     unittest.main()
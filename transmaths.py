@@ -1,163 +1,440 @@
 """Allows the use of transmathematics (https://bh96.link/transmaths) in Python."""
 from math import gcd
+import bisect
+import builtins
 import cmath
+import contextlib
+import functools
+import heapq
+import itertools
 
 # see https://docs.python.org/3/reference/datamodel.html#emulating-numeric-types
 import math
+import mmap
+import operator
+import re
+import struct
+import sys
+import threading
+import time
+
+try:
+    import numpy
+except ImportError: # pragma: no cover (NumPy is optional, and only needed for TransrealArray)
+    numpy = None
+
+# what kind of transreal number something is, so that the non-finite cases can be found without any arithmetic
+_FINITE = 0
+_INFINITY = 1
+_NEGATIVE_INFINITY = 2
+_NULLITY = 3
+
+# the most bits a transreal number may have before it is rounded, or None for no limit (see set_bit_limit)
+_bit_limit = None
+
+# whether operations are being counted (see set_instrumentation)
+_instrumented = False
+
+# decimal notation (e.g. 1.25 or -1e-3) for Transreal.from_string
+_DECIMAL = re.compile(r"([+-]?)([0-9]*)(?:\.([0-9]*))?(?:[eE]([+-]?[0-9]+))?")
+
+# the parts of the format specifications Transreal.__format__ understands ([[fill]align][sign][width][.precision][type])
+_FORMAT_SPEC = re.compile(
+    r"(?:(?P<fill>.)?(?P<align>[<>^]))?(?P<sign>[-+ ])?(?P<width>[0-9]+)?(?:\.(?P<precision>[0-9]+))?(?P<type>[eEfFgG%]?)",
+    re.DOTALL)
 
 
 class Transreal:
-    """A transreal number."""
+    """A transreal number. Transreal numbers are immutable."""
 
-    def __init__(self, numerator, denominator=1, approximate=False):
-        """Initialise a transreal number based on a numerator and denominator."""
-        # if the numerator or the denominator are transreal, just do the maths
-        if isinstance(numerator, Transreal) or isinstance(denominator, Transreal):
-            if denominator == 1:
-                self.numerator = numerator.numerator
-                self.denominator = numerator.denominator
-                self.approximate = numerator.approximate
-            else:
-                result = numerator / denominator
-                self.numerator = result.numerator
-                self.denominator = result.denominator
-                if abs(result) == INFINITY or result == NULLITY:
-                    self.approximate = False
-                else:
-                    self.approximate = result.approximate
-            return
+    __slots__ = ("_numerator", "_denominator", "_approximate", "_kind")
 
-        # check numerator and denominator are integers
-        if not isinstance(denominator, int):
-            raise TypeError("The denominator must be an int!")
-        if not isinstance(numerator, int):
-            if isinstance(numerator, float):
-                try:
-                    self.numerator, self.denominator = (numerator).as_integer_ratio()
-                    self.approximate = False
-                except OverflowError:
-                    # this means that the numerator is + or - infinity
-                    if numerator == float("inf"):
-                        self.numerator = 1
-                        self.denominator = 0
-                        self.approximate = False
-                    elif numerator == float("-inf"):
-                        self.numerator = -1
-                        self.denominator = 0
-                        self.approximate = False
-                    else: # pragma: no cover (we should never hit this...)
-                        raise
-                return
-            else:
-                raise TypeError("The numerator must be an int or float!")
+    def __new__(cls, numerator, denominator=1, approximate=False):
+        """Create a transreal number based on a numerator and denominator."""
+        # the numerator and denominator are usually both integers, so deal with everything else separately
+        if not (isinstance(numerator, int) and isinstance(denominator, int)):
+            return cls._from_non_integers(numerator, denominator)
 
         # check the fraction won't be improper, multiply numerator and denominator by -1 if required
         if denominator < 0:
             numerator *= -1
             denominator *= -1
 
+        # infinity, -infinity and nullity are singletons, so they can be compared by identity
+        if denominator == 0:
+            if numerator > 0:
+                return INFINITY
+            elif numerator < 0:
+                return NEGATIVE_INFINITY
+            else:
+                return NULLITY
+
         # simplify the numerator and denominator if possible
+        if _instrumented:
+            _count_gcd(numerator, denominator)
         common_factor = gcd(numerator, denominator)
         if common_factor > 1:
             numerator = numerator // common_factor
             denominator = denominator // common_factor
 
-        # set the values
-        self.numerator = numerator
-        self.denominator = denominator
-        if denominator == 0:
-            self.approximate = False
+        if _bit_limit is not None and (numerator.bit_length() > _bit_limit or denominator.bit_length() > _bit_limit):
+            return _clamp(numerator, denominator, approximate)
+
+        if _instrumented:
+            _count_construction("Transreal", numerator, denominator)
+        self = object.__new__(cls)
+        self._numerator = numerator
+        self._denominator = denominator
+        self._approximate = approximate
+        self._kind = _FINITE
+        return self
+
+
+    @classmethod
+    def _from_non_integers(cls, numerator, denominator):
+        """Create a transreal number from a numerator and denominator which are not both integers."""
+        # if the numerator or the denominator are transreal, just do the maths
+        if isinstance(numerator, Transreal) or isinstance(denominator, Transreal):
+            if denominator == 1 and isinstance(numerator, Transreal):
+                # transreal numbers are immutable, so there is no need to copy the numerator
+                return numerator
+            # infinities and nullity are never approximate, the division takes care of that
+            return numerator / denominator
+
+        # check numerator and denominator are integers
+        if not isinstance(denominator, int):
+            raise TypeError("The denominator must be an int!")
+        if not isinstance(numerator, float):
+            raise TypeError("The numerator must be an int or float!")
+
+        return cls._from_float(numerator)
+
+
+    @classmethod
+    def _from_float(cls, value):
+        """Create a transreal number from a float."""
+        try:
+            numerator, denominator = (value).as_integer_ratio()
+        except OverflowError:
+            # this means that the value is + or - infinity
+            if value == float("inf"):
+                return INFINITY
+            elif value == float("-inf"):
+                return NEGATIVE_INFINITY
+            else: # pragma: no cover (we should never hit this...)
+                raise
+        return cls._from_normalized(numerator, denominator)
+
+
+    @classmethod
+    def _from_normalized(cls, numerator, denominator, approximate=False, kind=_FINITE):
+        """Create a transreal number from a numerator and denominator which are already in lowest terms, with a
+        denominator which is not negative. No checks are performed, and the number is assumed to be finite unless
+        another kind is given!"""
+        if _bit_limit is not None and (numerator.bit_length() > _bit_limit or denominator.bit_length() > _bit_limit):
+            return _clamp(numerator, denominator, approximate)
+
+        if _instrumented:
+            _count_construction("Transreal", numerator, denominator)
+        self = object.__new__(cls)
+        self._numerator = numerator
+        self._denominator = denominator
+        self._approximate = approximate
+        self._kind = kind
+        return self
+
+
+    @classmethod
+    def from_string(cls, string):
+        """Create a transreal number from a string written as str writes them (e.g. "~3/7", "-5", "infinity" or
+        "nullity"), or in decimal notation (e.g. "1.25" or "1e-3"), exactly. Raises a ValueError if this is not
+        possible."""
+        text = string.strip()
+        approximate = text.startswith("~")
+        if approximate:
+            text = text[1:]
+
+        # whole numbers and fractions are the most common, so try them first
+        try:
+            return Transreal._from_normalized(int(text), 1, approximate)
+        except ValueError:
+            pass
+        numerator, slash, denominator = text.partition("/")
+        if slash:
+            try:
+                return Transreal(int(numerator), int(denominator), approximate)
+            except ValueError:
+                pass
+        elif text in ("infinity", "+infinity"):
+            return INFINITY
+        elif text == "-infinity":
+            return NEGATIVE_INFINITY
+        elif text == "nullity":
+            return NULLITY
         else:
-            self.approximate = approximate
+            match = _DECIMAL.fullmatch(text)
+            if match is not None and (match.group(2) or match.group(3)):
+                sign, whole, fraction, exponent = match.groups("")
+                fraction = fraction or ""
+                numerator = int(sign + (whole + fraction or "0"))
+                exponent = int(exponent or 0) - len(fraction)
+                if exponent >= 0:
+                    return Transreal._from_normalized(numerator * 10 ** exponent, 1, approximate)
+                return Transreal(numerator, 10 ** -exponent, approximate)
+        raise ValueError("Can't make a transreal number from {!r}!".format(string))
+
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Create a transreal number from bytes written by Transreal.to_bytes. Raises a ValueError if this is not
+        possible."""
+        value, end = _decode(data, 0)
+        if end != len(data):
+            raise ValueError("Can't make a transreal number from {!r}!".format(data))
+        return value
+
+
+    @property
+    def numerator(self):
+        """The numerator of self, in lowest terms."""
+        return self._numerator
 
-        return
+
+    @property
+    def denominator(self):
+        """The denominator of self, in lowest terms. Always 0 or positive."""
+        return self._denominator
+
+
+    @property
+    def approximate(self):
+        """Whether self is an approximation (e.g. the result of an irrational root)."""
+        return self._approximate
 
 
     def __abs__(self):
-        if self.numerator < 0:
+        if self._numerator < 0:
             return -self
         else:
             return self
 
 
     def __add__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__add__", Transreal.__add__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        # nullity + x or x + nullity always equals nullity (axiom 4)
-        if self == NULLITY or other == NULLITY:
-            return NULLITY
+        if self._kind or other._kind:
+            # nullity + x or x + nullity always equals nullity (axiom 4)
+            if self is NULLITY or other is NULLITY:
+                return NULLITY
+            # infinity + -infinity is nullity, otherwise the sum is whichever number is infinite
+            if self._kind and other._kind:
+                return Transreal(self._numerator + other._numerator, 0)
+            return self if self._kind else other
 
         # if the denominators are the same, add the fractions simply
-        if self.denominator == other.denominator:
+        if self._denominator == other._denominator:
             return Transreal(
-                self.numerator + other.numerator,
-                self.denominator,
-                self.approximate or other.approximate)
+                self._numerator + other._numerator,
+                self._denominator,
+                self._approximate or other._approximate)
+        # if either number is an integer, the sum is already in lowest terms
+        elif self._denominator == 1 or other._denominator == 1:
+            return Transreal._from_normalized(
+                (self._numerator * other._denominator) + (other._numerator * self._denominator),
+                self._denominator * other._denominator,
+                self._approximate or other._approximate
+            )
+        # if both denominators are powers of two (as they are for floats), the sum can be found by shifting
+        elif not (self._denominator & (self._denominator - 1) or other._denominator & (other._denominator - 1)):
+            return _add_dyadic(
+                self._numerator, self._denominator, other._numerator, other._denominator,
+                self._approximate or other._approximate
+            )
         else:
             return Transreal(
-                (self.numerator * other.denominator) + (other.numerator * self.denominator),
-                self.denominator * other.denominator,
-                self.approximate or other.approximate
+                (self._numerator * other._denominator) + (other._numerator * self._denominator),
+                self._denominator * other._denominator,
+                self._approximate or other._approximate
             )
 
 
+    def __copy__(self):
+        # transreal numbers are immutable, so copies can be the same object
+        return self
+
+
+    def __deepcopy__(self, memo):
+        return self
+
+
     def __divmod__(self, other):
-        floordiv = self // other
-        mod = self - (other * floordiv)
-        return (floordiv, mod)
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__divmod__", Transreal.__divmod__, self, other)
+        # if other isn't transreal, try to make it transreal
+        try:
+            other = _coerce(other)
+        except TypeError:
+            return NotImplemented
+
+        # dividing by zero or involving non-finite numbers is rare, so just do the maths
+        if self._kind or other._kind or other._numerator == 0:
+            floordiv = self // other
+            return (floordiv, self - (other * floordiv))
+
+        # n1/d1 = q * n2/d2 + r/(d1*d2), where q and r are the quotient and remainder of (n1*d2) / (n2*d1)
+        approximate = self._approximate or other._approximate
+        floordiv, mod = divmod(self._numerator * other._denominator, other._numerator * self._denominator)
+        return (
+            Transreal._from_normalized(floordiv, 1, approximate and self._numerator != 0),
+            Transreal(mod, self._denominator * other._denominator, self._approximate or (
+                floordiv != 0 and (other._approximate or (approximate and self._numerator != 0))))
+        )
 
 
     def __eq__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__eq__", Transreal.__eq__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        return self.numerator == other.numerator and self.denominator == other.denominator
+        return self._numerator == other._numerator and self._denominator == other._denominator
 
 
     def __float__(self):
         # returning float of 1/0 (naturally!) results in a division by zero exception. workaround is to return
         # float('inf') in this case - this is fine, as float('inf') can be cast back to transmaths.INFINITY just fine.
-        if self == INFINITY:
+        if self is INFINITY:
             return float('inf')
-        if self == -INFINITY:
+        if self is NEGATIVE_INFINITY:
             return float('-inf')
-        return self.numerator / self.denominator
+        return self._numerator / self._denominator
 
 
     def __floordiv__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__floordiv__", Transreal.__floordiv__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        return (self / other).floor()
+        # dividing by zero or involving non-finite numbers is rare, so just do the maths
+        if self._kind or other._kind or other._numerator == 0:
+            return (self / other).floor()
+
+        # zero divided by anything is exactly zero
+        if self._numerator == 0:
+            return Transreal._from_normalized(0, 1)
+
+        return Transreal._from_normalized(
+            (self._numerator * other._denominator) // (other._numerator * self._denominator),
+            1,
+            self._approximate or other._approximate
+        )
+
+
+    def __format__(self, format_spec):
+        # with a precision or a type, finite numbers are written in decimal (as floats would be), worked out exactly
+        match = _FORMAT_SPEC.fullmatch(format_spec)
+        if match is None:
+            raise ValueError("Invalid format specifier {!r} for a transreal number!".format(format_spec))
+        fill, align, sign, width, precision, kind = match.groups()
+        numerator = abs(self._numerator)
+        if self._kind or (precision is None and not kind):
+            string = str(self).lstrip("~-")
+        elif kind in "fF%":
+            if kind == "%":
+                numerator *= 100
+            string = _fixed(numerator, self._denominator, 6 if precision is None else int(precision))
+            if kind == "%":
+                string += "%"
+        elif kind in "eE":
+            string = _scientific(numerator, self._denominator, 6 if precision is None else int(precision), kind)
+        else:
+            string = _general(numerator, self._denominator, max(1, 6 if precision is None else int(precision)), kind)
+
+        if self._numerator < 0:
+            string = "-" + string
+        elif sign in ("+", " ") and self is not NULLITY:
+            string = sign + string
+        if self._approximate:
+            string = "~" + string
+        if width is not None:
+            string = format(string, (fill or " ") + (align or ">") + width)
+        return string
 
 
     def __ge__(self, other):
-        return self > other or self == other
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__ge__", Transreal.__ge__, self, other)
+        # if other isn't transreal, try to make it transreal
+        try:
+            other = _coerce(other)
+        except TypeError:
+            return NotImplemented
+
+        # nullity is only equal to itself
+        if self is NULLITY or other is NULLITY:
+            return self is other
+        elif self._denominator == other._denominator:
+            return self._numerator >= other._numerator
+        elif (self._denominator | other._denominator) >> 64:
+            # big denominators make cross-multiplying slow, so try to avoid it
+            return _cross_compare(self._numerator, self._denominator, other._numerator, other._denominator) >= 0
+        else:
+            return self._numerator * other._denominator >= other._numerator * self._denominator
 
 
     def __gt__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__gt__", Transreal.__gt__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        if self == NULLITY or other == NULLITY:
+        if self is NULLITY or other is NULLITY:
             return False
-        elif self.denominator == other.denominator:
-            return self.numerator > other.numerator
+        elif self._denominator == other._denominator:
+            return self._numerator > other._numerator
+        elif (self._denominator | other._denominator) >> 64:
+            # big denominators make cross-multiplying slow, so try to avoid it
+            return _cross_compare(self._numerator, self._denominator, other._numerator, other._denominator) > 0
+        else:
+            return self._numerator * other._denominator > other._numerator * self._denominator
+
+
+    def __hash__(self):
+        # equal numbers must have equal hashes, including ints and floats (e.g. Transreal(1, 2) == 0.5), so use the
+        # same algorithm as for other Python numbers (https://docs.python.org/3/library/stdtypes.html#hashing)
+        if self._denominator == 0:
+            if self._numerator > 0:
+                return sys.hash_info.inf
+            elif self._numerator < 0:
+                return -sys.hash_info.inf
+            else:
+                return 0
+        try:
+            inverse = pow(self._denominator, -1, sys.hash_info.modulus)
+        except ValueError:
+            # the denominator is a multiple of the modulus, so it has no inverse
+            hash_value = sys.hash_info.inf
         else:
-            return self.numerator * other.denominator > other.numerator * self.denominator
+            hash_value = hash(hash(abs(self._numerator)) * inverse)
+        if self._numerator < 0:
+            hash_value = -hash_value
+        return -2 if hash_value == -1 else hash_value
 
 
     def __iadd__(self, other):
@@ -181,7 +458,7 @@ class Transreal:
 
 
     def __int__(self):
-        return self.numerator // self.denominator
+        return self._numerator // self._denominator
 
 
     def __ipow__(self, other):
@@ -200,48 +477,84 @@ class Transreal:
 
 
     def __le__(self, other):
-        return self < other or self == other
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__le__", Transreal.__le__, self, other)
+        # if other isn't transreal, try to make it transreal
+        try:
+            other = _coerce(other)
+        except TypeError:
+            return NotImplemented
+
+        # nullity is only equal to itself
+        if self is NULLITY or other is NULLITY:
+            return self is other
+        elif self._denominator == other._denominator:
+            return self._numerator <= other._numerator
+        elif (self._denominator | other._denominator) >> 64:
+            # big denominators make cross-multiplying slow, so try to avoid it
+            return _cross_compare(self._numerator, self._denominator, other._numerator, other._denominator) <= 0
+        else:
+            return self._numerator * other._denominator <= other._numerator * self._denominator
 
 
     def __lt__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__lt__", Transreal.__lt__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        if self == NULLITY or other == NULLITY:
+        if self is NULLITY or other is NULLITY:
             return False
-        elif self.denominator == other.denominator:
-            return self.numerator < other.numerator
+        elif self._denominator == other._denominator:
+            return self._numerator < other._numerator
+        elif (self._denominator | other._denominator) >> 64:
+            # big denominators make cross-multiplying slow, so try to avoid it
+            return _cross_compare(self._numerator, self._denominator, other._numerator, other._denominator) < 0
         else:
-            return self.numerator * other.denominator < other.numerator * self.denominator
+            return self._numerator * other._denominator < other._numerator * self._denominator
 
 
     def __mod__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__mod__", Transreal.__mod__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        return self - (other * (self // other))
+        return divmod(self, other)[1]
 
 
     def __mul__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__mul__", Transreal.__mul__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        if self == 0 or other == 0:
-            return Transreal(self.numerator * other.numerator, self.denominator * other.denominator)
+        if self._kind or other._kind:
+            # nullity * x is nullity, infinity * 0 is nullity, otherwise the signs multiply
+            return Transreal(self._numerator * other._numerator, 0)
+        elif self._numerator == 0 or other._numerator == 0:
+            # zero is exact, regardless of the other operand
+            return Transreal._from_normalized(0, 1)
         else:
-            return Transreal(
-                self.numerator * other.numerator,
-                self.denominator * other.denominator,
-                self.approximate or other.approximate
+            # cancel the common factors first, so that the product is already in lowest terms
+            if _instrumented:
+                _count_gcd(self._numerator, other._denominator)
+                _count_gcd(other._numerator, self._denominator)
+            self_factor = gcd(self._numerator, other._denominator)
+            other_factor = gcd(other._numerator, self._denominator)
+            return Transreal._from_normalized(
+                (self._numerator // self_factor) * (other._numerator // other_factor),
+                (self._denominator // other_factor) * (other._denominator // self_factor),
+                self._approximate or other._approximate
             )
 
 
@@ -250,7 +563,15 @@ class Transreal:
 
 
     def __neg__(self):
-        return self * -1
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__neg__", Transreal.__neg__, self)
+        if self._kind:
+            # the opposite of infinity is -infinity, and nullity is its own opposite
+            return Transreal(-self._numerator, 0)
+        elif self._numerator == 0:
+            return Transreal._from_normalized(0, 1)
+        else:
+            return Transreal._from_normalized(-self._numerator, self._denominator, self._approximate)
 
 
     def __pos__(self):
@@ -260,125 +581,143 @@ class Transreal:
 
 
     def __pow__(self, power, modulo=None):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__pow__", Transreal.__pow__, self, power, modulo)
         # if the power isn't transreal, try to make it transreal
         try:
-            power = Transreal(power)
+            power = _coerce(power)
         except TypeError:
             return NotImplemented
 
-        # if the power is negative, invert the fraction and make the power positive
-        if power < 0:
-            self = Transreal(self.denominator, self.numerator, self.approximate)
-            power *= -1
-
-        # if the power is zero, the result is (mostly) 1
-        if power == 0:
-            if self == 0 or self == NULLITY:
-                raised = NULLITY
-            else:
-                raised = 1
-
-        # if the power is less than 1 (can't be a whole number, must be between 0 and 1)
-        elif power < 1:
-            raised = (self ** power.numerator).root(power.denominator)
-
-        # if the power is 1, the result is (mostly) self
-        elif power == 1:
-            raised = self
-
-        # if the power is nullity, the result is nullity
-        elif power == NULLITY:
-            raised = NULLITY
-
-        # if the power is infinity, the result is...
-        elif power == INFINITY:
-            # nullity if the absolute value of self is less than 1
-            if abs(self) < 1:
-                raised = 0
-            # 1 if the absolute value of self is equal to 1
-            elif abs(self) == 1:
-                raised = NULLITY
-            # infinity if the absolute value is self is greater than 1
-            else:
-                raised = INFINITY
-
-        # if the power is a whole number
-        elif power.denominator == 1:
-            raised = Transreal(
-                self.numerator ** power.numerator,
-                self.denominator ** power.numerator,
-                self.approximate or power.approximate)
-
-        # the power is not a whole number and greater than 1
-        else:
-            whole, fraction = divmod(power.numerator, power.denominator)
-            fraction = Transreal(fraction, power.denominator, power.approximate)
-            raised = (self ** whole) * (self ** fraction)
-
-        if modulo is None:
-            return raised
-        else:
-            return raised % modulo
+        return self.pow(power, modulo)
 
 
     def __str__(self):
         string = ""
         # if the number is approximate, prefix with a tilde
-        if self.approximate:
+        if self._approximate:
             string += "~"
 
         # if the denominator is 1, it's an integer so just print the numerator
-        if self.denominator == 1:
-            string += str(self.numerator)
+        if self._denominator == 1:
+            string += str(self._numerator)
 
         # if the denominator is 0, work out if it's -infinity, infinity, or nullity
-        elif self.denominator == 0:
-            if self.numerator < 0:
+        elif self._denominator == 0:
+            if self._numerator < 0:
                 string += "-infinity"
-            elif self.numerator > 0:
+            elif self._numerator > 0:
                 string += "infinity"
             else:
                 string += "nullity"
 
         # for all other denominators, print the fraction
         else:
-            string += str(self.numerator) + "/" + str(self.denominator)
+            string += str(self._numerator) + "/" + str(self._denominator)
 
         # return the string we built
         return string
 
 
     def __sub__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__sub__", Transreal.__sub__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        return self + (other * -1)
+        if self._kind or other._kind:
+            # nullity - x or x - nullity always equals nullity
+            if self is NULLITY or other is NULLITY:
+                return NULLITY
+            # infinity - infinity is nullity, otherwise the difference is whichever number is infinite (or its opposite)
+            if self._kind and other._kind:
+                return Transreal(self._numerator - other._numerator, 0)
+            return self if self._kind else Transreal(-other._numerator, 0)
+
+        # subtracting zero gives an exact zero, so it doesn't make the result approximate
+        approximate = self._approximate or (other._approximate and other._numerator != 0)
+
+        # if the denominators are the same, subtract the fractions simply
+        if self._denominator == other._denominator:
+            return Transreal(self._numerator - other._numerator, self._denominator, approximate)
+        # if either number is an integer, the difference is already in lowest terms
+        elif self._denominator == 1 or other._denominator == 1:
+            return Transreal._from_normalized(
+                (self._numerator * other._denominator) - (other._numerator * self._denominator),
+                self._denominator * other._denominator,
+                approximate
+            )
+        # if both denominators are powers of two (as they are for floats), the difference can be found by shifting
+        elif not (self._denominator & (self._denominator - 1) or other._denominator & (other._denominator - 1)):
+            return _add_dyadic(self._numerator, self._denominator, -other._numerator, other._denominator, approximate)
+        else:
+            return Transreal(
+                (self._numerator * other._denominator) - (other._numerator * self._denominator),
+                self._denominator * other._denominator,
+                approximate
+            )
 
 
     def __truediv__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__truediv__", Transreal.__truediv__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
-        # multiply self by the inverse of other
-        return self * (other ** -1)
+        # dividing by zero or involving non-finite numbers is rare, so multiply self by the inverse of other
+        if self._kind or other._kind or other._numerator == 0:
+            return self * (other ** -1)
+
+        # zero divided by anything is exactly zero
+        if self._numerator == 0:
+            return Transreal._from_normalized(0, 1)
+
+        # make the denominator of the inverse positive, and cancel the common factors first, so that the result is
+        # already in lowest terms
+        if other._numerator < 0:
+            inverse_numerator, inverse_denominator = -other._denominator, -other._numerator
+        else:
+            inverse_numerator, inverse_denominator = other._denominator, other._numerator
+        if _instrumented:
+            _count_gcd(self._numerator, inverse_denominator)
+            _count_gcd(inverse_numerator, self._denominator)
+        numerator_factor = gcd(self._numerator, inverse_denominator)
+        denominator_factor = gcd(inverse_numerator, self._denominator)
+        return Transreal._from_normalized(
+            (self._numerator // numerator_factor) * (inverse_numerator // denominator_factor),
+            (self._denominator // denominator_factor) * (inverse_denominator // numerator_factor),
+            self._approximate or other._approximate
+        )
 
 
     def __rdivmod__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__rdivmod__", Transreal.__rdivmod__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
         return divmod(other, self)
 
 
+    def __reduce__(self):
+        # pickle infinity, -infinity and nullity by name so that they are still singletons when unpickled, and leave
+        # out the default arguments, so that pickles are small
+        if self._kind != _FINITE:
+            return ("INFINITY", "NEGATIVE_INFINITY", "NULLITY")[self._kind - 1]
+        if self._approximate:
+            return (_unpickle, (self._numerator, self._denominator, True))
+        return (_unpickle, (self._numerator, self._denominator))
+
+
     __repr__ = __str__
 
 
@@ -386,9 +725,11 @@ class Transreal:
 
 
     def __rmod__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__rmod__", Transreal.__rmod__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
@@ -399,9 +740,11 @@ class Transreal:
 
 
     def __rpow__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__rpow__", Transreal.__rpow__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
@@ -409,9 +752,11 @@ class Transreal:
 
 
     def __rsub__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__rsub__", Transreal.__rsub__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
@@ -419,9 +764,11 @@ class Transreal:
 
 
     def __rtruediv__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.__rtruediv__", Transreal.__rtruediv__, self, other)
         # if other isn't transreal, try to make it transreal
         try:
-            other = Transreal(other)
+            other = _coerce(other)
         except TypeError:
             return NotImplemented
 
@@ -431,52 +778,198 @@ class Transreal:
     def floor(self):
         """Return the floor of (the largest integer value less than or equal to) self."""
         # for non-finite numbers or numbers with a denominator of 1 just return the number
-        if self.denominator == 0 or self.denominator == 1:
+        if self._kind or self._denominator == 1:
             return self
         else:
-            return Transreal(self.numerator // self.denominator, approximate=self.approximate)
+            return Transreal._from_normalized(self._numerator // self._denominator, 1, self._approximate)
 
 
-    def root(self, power):
-        """Returns the power-th root of self using Newton's method."""
+    def limit_denominator(self, max_denominator):
+        """Returns the closest transreal number to self with a denominator of at most max_denominator, which is
+        approximate unless it is self."""
+        if max_denominator < 1:
+            raise ValueError("max_denominator should be at least 1!")
+        if self._kind or self._denominator <= max_denominator:
+            return self
+        numerator, denominator = _limit_denominator(self._numerator, self._denominator, max_denominator)
+        return Transreal._from_normalized(numerator, denominator, True)
+
+
+    def pow(self, power, modulo=None, budget=None):
+        """Returns self to the power of power (modulo modulo), like pow(self, power, modulo). Fractional powers involve
+        roots, which can be limited with a Budget."""
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.pow", Transreal.pow, self, power, modulo, budget)
+        # if the power isn't transreal, try to make it transreal
+        power = _coerce(power)
+
+        # if the power is negative, invert the fraction and make the power positive
+        if power._numerator < 0:
+            self = Transreal(self._denominator, self._numerator, self._approximate)
+            power = -power
+
+        # whole powers with a modulus can be reduced as they are worked out, rather than all at the end
+        if modulo is not None and power._denominator == 1 and power._numerator > 1 and not self._kind:
+            raised = self._pow_mod(power, modulo, budget)
+            if raised is not NotImplemented:
+                return raised
+
+        # if the power is nullity, the result is nullity
+        if power is NULLITY:
+            raised = NULLITY
+
+        # if the power is infinity, the result is...
+        elif power is INFINITY:
+            # nullity if the absolute value of self is less than 1
+            if abs(self._numerator) < self._denominator:
+                raised = 0
+            # 1 if the absolute value of self is equal to 1
+            elif abs(self._numerator) == 1 and self._denominator == 1:
+                raised = NULLITY
+            # infinity if the absolute value is self is greater than 1
+            else:
+                raised = INFINITY
+
+        # if the power is zero, the result is (mostly) 1
+        elif power._numerator == 0:
+            if self._numerator == 0:
+                # zero or nullity
+                raised = NULLITY
+            else:
+                raised = 1
+
+        # if the power is less than 1 (can't be a whole number, must be between 0 and 1)
+        elif power._numerator < power._denominator:
+            raised = self.pow(power._numerator, budget=budget).root(power._denominator, budget=budget)
+
+        # if the power is 1, the result is (mostly) self
+        elif power._numerator == 1 and power._denominator == 1:
+            raised = self
+
+        # if the power is a whole number
+        elif power._denominator == 1:
+            if budget is not None:
+                # whole powers are exact, so if they are too big they can't be approximated
+                budget._check_bits(
+                    max(self._numerator.bit_length(), self._denominator.bit_length()) * power._numerator, strict=True)
+            raised = Transreal(
+                self._numerator ** power._numerator,
+                self._denominator ** power._numerator,
+                self._approximate or power._approximate)
+
+        # the power is not a whole number and greater than 1
+        else:
+            whole, fraction = divmod(power._numerator, power._denominator)
+            fraction = Transreal(fraction, power._denominator, power._approximate)
+            raised = self.pow(whole, budget=budget) * self.pow(fraction, budget=budget)
+
+        if modulo is None:
+            return raised
+        else:
+            return raised % modulo
+
+
+    def _pow_mod(self, power, modulo, budget):
+        """Returns self to the power of the whole number power, modulo modulo, without working out the power in full.
+        Returns NotImplemented if the modulus isn't finite, non-zero and exact."""
+        try:
+            modulo = _coerce(modulo)
+        except TypeError:
+            return NotImplemented
+        if modulo._kind or modulo._numerator == 0 or modulo._approximate:
+            return NotImplemented
+
+        # n**e/d**e modulo p/q is ((n**e * q) modulo (p * d**e)) / (q * d**e), and modular arithmetic lets n**e be
+        # reduced modulo p * d**e as it is worked out
+        if budget is not None:
+            budget._check_bits(
+                self._denominator.bit_length() * power._numerator + modulo._numerator.bit_length(), strict=True)
+        denominator = self._denominator ** power._numerator
+        modulus = modulo._numerator * denominator
+        return Transreal(
+            pow(self._numerator, power._numerator, modulus) * modulo._denominator % modulus,
+            modulo._denominator * denominator,
+            self._approximate or power._approximate
+        )
+
+
+    def root(self, power, precision=9, budget=None):
+        """Returns the power-th root of self. If the root is irrational, the result is approximate: it is rounded down
+        to precision decimal places. The work done can be limited with a Budget."""
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.root", Transreal.root, self, power, precision, budget)
         # if the power isn't transreal, try to make it transreal
-        power = Transreal(power)
+        power = _coerce(power)
 
-        if self < 0:
+        if self._numerator < 0:
             # if self is less than 0, the answer is complex
-            return Transcomplex((self * -1).root(power), PI / 2)
+            return Transcomplex((-self).root(power, precision, budget), PI / 2)
 
-        if self == NULLITY or power == NULLITY:
+        if self is NULLITY or power is NULLITY:
             return NULLITY
 
-        if self == INFINITY:
-            if abs(power) == INFINITY:
+        if self is INFINITY:
+            if power._kind:
                 return NULLITY
-            elif power < 0:
-                return -INFINITY
+            elif power._numerator < 0:
+                return NEGATIVE_INFINITY
             else:
                 return INFINITY
 
-        if abs(power) == INFINITY:
+        if power._kind:
             return 0
 
-        PRECISION = 9 # accurate to 1 billionth
+        # the (p/q)-th root is the same as the p-th root of self to the power of q
+        if power._denominator != 1:
+            return self.pow(power._denominator, budget=budget).root(power._numerator, precision, budget)
 
-        # source: http://mathforum.org/library/drmath/view/52628.html
-        prev_guess = Transreal(0)
-        guess = Transreal(1)
+        # the zeroth root is the same as raising self to the power of 1/0 (infinity)
+        if power._numerator == 0:
+            return self ** INFINITY
 
-        while Transreal(1, 10**PRECISION) < abs(guess - prev_guess):
-            prev_guess = guess.round(PRECISION * 2)
-            guess = prev_guess - (prev_guess**power - self)/(power * prev_guess**(power-1))
+        # the negative root is the same as the root of the reciprocal
+        if power._numerator < 0:
+            reciprocal = Transreal(self._denominator, self._numerator, self._approximate)
+            return reciprocal.root(-power._numerator, precision, budget)
 
-        result = guess.round(PRECISION)
+        return _finite_root(self, power._numerator, 10 ** precision, None, budget)
 
-        if result ** power == self:
-            return result
-        else:
-            result.approximate = True
-            return result
+
+    @staticmethod
+    def root_many(radicands, power, precision=9, budget=None):
+        """Returns a list of the power-th roots of each of radicands, in the same order. This gives the same results
+        as calling root on each radicand, but is much faster."""
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transreal.root_many", Transreal.root_many, radicands, power, precision, budget)
+        # if the power isn't transreal, try to make it transreal
+        power = _coerce(power)
+
+        # root rewrites other powers in terms of positive whole powers, so there is nothing to be gained here
+        if power._kind or power._denominator != 1 or power._numerator <= 0:
+            return [_coerce(radicand).root(power, precision, budget) for radicand in radicands]
+
+        power = power._numerator
+        scale = 10 ** precision
+        scale_to_power = scale ** power
+
+        # radicands are often repeated, so remember the roots which have already been found
+        roots = {}
+        results = []
+        for radicand in radicands:
+            radicand = _coerce(radicand)
+            key = (radicand._numerator, radicand._denominator, radicand._approximate)
+            result = roots.get(key)
+            if result is None:
+                if radicand._kind or radicand._numerator < 0:
+                    result = radicand.root(power, precision, budget)
+                else:
+                    result = _finite_root(radicand, power, scale, scale_to_power, budget)
+                roots[key] = result
+            # transcomplex numbers are mutable, so every position gets its own copy
+            if isinstance(result, Transcomplex):
+                result = Transcomplex(result)
+            results.append(result)
+        return results
 
 
     def round(self, decimal_places):
@@ -487,174 +980,3490 @@ class Transreal:
 
     def sign(self):
         """Returns the sign of self."""
-        if self > 0:
-            return Transreal(1)
-        elif self == 0:
-            return Transreal(0)
-        elif self < 0:
-            return Transreal(-1)
-        else:
+        if self is NULLITY:
             return NULLITY
+        elif self._numerator > 0:
+            return Transreal._from_normalized(1, 1)
+        elif self._numerator == 0:
+            return Transreal._from_normalized(0, 1)
+        else:
+            return Transreal._from_normalized(-1, 1)
+
+
+    def to_bytes(self):
+        """Returns a compact binary encoding of self, which Transreal.from_bytes can read back. This is a byte holding
+        the kind of number, whether it is approximate and its sign, then for finite numbers the absolute value of the
+        numerator and the denominator, each as a length (in a varint) followed by little-endian bytes."""
+        if self._kind != _FINITE:
+            return bytes((self._kind,))
+        numerator = self._numerator
+        header = _FINITE | self._approximate << 2 | (numerator < 0) << 3
+        return bytes((header,)) + _encode_integer(abs(numerator)) + _encode_integer(self._denominator)
+
+
+
+def _coerce(value):
+    """Convert value to a transreal number as cheaply as possible. Raises a TypeError if this is not possible."""
+    if isinstance(value, Transreal):
+        return value
+    if _instrumented:
+        _count_coercion("Transreal", value)
+    if type(value) is int:
+        # an integer is already in lowest terms
+        return Transreal._from_normalized(value, 1)
+    if type(value) is float:
+        return Transreal._from_float(value)
+    return Transreal(value)
+
+
+def _coerce_transcomplex(value):
+    """Convert value to a transcomplex number, without copying it if it already is one. Raises a TypeError if this is
+    not possible."""
+    if isinstance(value, Transcomplex):
+        return value
+    if _instrumented:
+        _count_coercion("Transcomplex", value)
+    return Transcomplex(value)
+
+
+def _complex_part(value):
+    """Convert the real or imaginary part of a complex number to a transreal number, with NaN as nullity."""
+    if value != value:
+        return NULLITY
+    return Transreal._from_float(value)
+
+
+def _inexact(value):
+    """Convert a float which is the result of an inexact calculation (e.g. a cosine) to an approximate transreal
+    number."""
+    numerator, denominator = value.as_integer_ratio()
+    return Transreal._from_normalized(numerator, denominator, True)
+
+
+def _angle_of(real, imaginary):
+    """Return the angle of the point (real, imaginary), given as transreal numbers which aren't nullity: exactly 0 on
+    the positive real axis, and approximately everywhere else."""
+    if imaginary == 0 and real >= 0:
+        return _ZERO
+    if _instrumented:
+        _count_trigonometric("math.atan2")
+    if real._kind or imaginary._kind:
+        return _inexact(math.atan2(_float_of(imaginary), _float_of(real)))
+
+    # the angle only depends on the ratio of the parts, so scale both by the same power of two to bring the bigger
+    # one near 1 before converting them to floats (which might otherwise overflow or underflow)
+    shift = max(part._numerator.bit_length() - part._denominator.bit_length()
+                for part in (real, imaginary) if part._numerator)
+    real, imaginary = [(part._numerator << max(-shift, 0)) / (part._denominator << max(shift, 0))
+                       for part in (real, imaginary)]
+    return _inexact(math.atan2(imaginary, real))
+
+
+def _add_dyadic(numerator1, denominator1, numerator2, denominator2, approximate):
+    """Return numerator1/denominator1 + numerator2/denominator2 as a transreal number, where both denominators are
+    powers of two. The fractions are lined up by shifting, and put in lowest terms by taking out trailing zeroes, so
+    there is no need to multiply or find a greatest common divisor."""
+    if denominator1 < denominator2:
+        numerator1, denominator1, numerator2, denominator2 = numerator2, denominator2, numerator1, denominator1
+    numerator = numerator1 + (numerator2 << (denominator1.bit_length() - denominator2.bit_length()))
+    if numerator == 0:
+        return Transreal._from_normalized(0, 1, approximate)
+
+    # the only common factors of the numerator and denominator can be twos
+    trailing_zeroes = min((numerator & -numerator).bit_length(), denominator1.bit_length()) - 1
+    return Transreal._from_normalized(numerator >> trailing_zeroes, denominator1 >> trailing_zeroes, approximate)
+
+
+def _cross_compare(numerator1, denominator1, numerator2, denominator2):
+    """Return -1, 0 or 1 as numerator1/denominator1 is less than, equal to or greater than numerator2/denominator2."""
+    # numbers with different signs (or zeroes) can be compared without multiplying anything
+    sign = (numerator1 > 0) - (numerator1 < 0)
+    other_sign = (numerator2 > 0) - (numerator2 < 0)
+    if sign != other_sign or sign == 0:
+        return (sign > other_sign) - (sign < other_sign)
+
+    # if one cross product has at least two more bits than the other, it must be bigger in magnitude (this only
+    # works if neither product is zero, but multiplying by zero is quick anyway)
+    if denominator1 and denominator2:
+        size = numerator1.bit_length() + denominator2.bit_length()
+        other_size = numerator2.bit_length() + denominator1.bit_length()
+        if size < other_size - 1:
+            return -sign
+        if other_size < size - 1:
+            return sign
+
+    left = numerator1 * denominator2
+    right = numerator2 * denominator1
+    return (left > right) - (left < right)
+
+
+
+def _limit_denominator(numerator, denominator, max_denominator):
+    """Return the numerator and denominator of the closest fraction to numerator/denominator (in lowest terms) with a
+    denominator of at most max_denominator, found from its continued fraction as Fraction.limit_denominator does."""
+    # the convergents p1/q1 of the continued fraction are the best approximations, but the best one with a small
+    # enough denominator may be between the last two that fit (a semiconvergent)
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    n, d = numerator, denominator
+    while True:
+        a = n // d
+        q2 = q0 + a * q1
+        if q2 > max_denominator:
+            break
+        p0, q0, p1, q1 = p1, q1, p0 + a * p1, q2
+        n, d = d, n - a * d
+    k = (max_denominator - q0) // q1
+    if 2 * d * (q0 + k * q1) <= denominator:
+        return p1, q1
+    return p0 + k * p1, q0 + k * q1
+
+
+def _clamp(numerator, denominator, approximate):
+    """Return the closest transreal number to numerator/denominator (in lowest terms) with a numerator and denominator
+    of at most _bit_limit bits, or with a denominator of 1 if it is too big for that. It is approximate unless it is
+    exact."""
+    max_denominator = max(1, (1 << _bit_limit) // (abs(numerator) // denominator + 1))
+    if denominator > max_denominator:
+        numerator, denominator = _limit_denominator(numerator, denominator, max_denominator)
+        approximate = True
+    if _instrumented:
+        _count_construction("Transreal", numerator, denominator)
+    self = object.__new__(Transreal)
+    self._numerator = numerator
+    self._denominator = denominator
+    self._approximate = approximate
+    self._kind = _FINITE
+    return self
+
+
+def _round_scaled(numerator, denominator, exponent):
+    """Return numerator/denominator * 10**exponent (which is not negative) rounded to the nearest int, or the even one
+    if it is halfway between two."""
+    if exponent >= 0:
+        numerator *= 10 ** exponent
+    else:
+        denominator *= 10 ** -exponent
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def _significant(numerator, denominator, digits):
+    """Return numerator/denominator (which is not negative) rounded to digits significant figures, as an int of digits
+    digits (or 0) and the exponent of the power of 10 of its first digit."""
+    if numerator == 0:
+        return 0, 0
+
+    # estimate the exponent from the sizes of the numerator and denominator, then correct it
+    exponent = int((numerator.bit_length() - denominator.bit_length()) * 0.3010299956639812)
+    while not _at_least_power(numerator, denominator, exponent):
+        exponent -= 1
+    while _at_least_power(numerator, denominator, exponent + 1):
+        exponent += 1
+
+    mantissa = _round_scaled(numerator, denominator, digits - 1 - exponent)
+    if mantissa == 10 ** digits:
+        # rounding up went up to the next power of 10
+        mantissa //= 10
+        exponent += 1
+    return mantissa, exponent
+
+
+def _at_least_power(numerator, denominator, exponent):
+    """Return whether numerator/denominator is at least 10**exponent."""
+    if exponent >= 0:
+        return numerator >= denominator * 10 ** exponent
+    return numerator * 10 ** -exponent >= denominator
+
+
+def _point(digits, places):
+    """Return the string of the int digits divided by 10**places, with places decimal places."""
+    if places == 0:
+        return str(digits)
+    string = str(digits).rjust(places + 1, "0")
+    return string[:-places] + "." + string[-places:]
+
+
+def _fixed(numerator, denominator, places):
+    """Format numerator/denominator (which is not negative) with places decimal places, like the "f" format type."""
+    return _point(_round_scaled(numerator, denominator, places), places)
+
+
+def _scientific(numerator, denominator, places, kind):
+    """Format numerator/denominator (which is not negative) with places decimal places after the first significant
+    figure, like the "e" format type (or "E" if kind is "E")."""
+    mantissa, exponent = _significant(numerator, denominator, places + 1)
+    return "{}{}{:+03d}".format(_point(mantissa, places), kind, exponent)
+
+
+def _general(numerator, denominator, digits, kind):
+    """Format numerator/denominator (which is not negative) to digits significant figures, like the "g" format type
+    (or "G" if kind is "G"): in scientific notation if the exponent is small or big, and without trailing zeroes."""
+    mantissa, exponent = _significant(numerator, denominator, digits)
+    if -4 <= exponent < digits:
+        string = _point(mantissa, digits - 1 - exponent)
+        suffix = ""
+    else:
+        string = _point(mantissa, digits - 1)
+        suffix = "{}{:+03d}".format("E" if kind == "G" else "e", exponent)
+    if "." in string:
+        string = string.rstrip("0").rstrip(".")
+    return string + suffix
+
+
+def _integer_root(number, power, budget=None):
+    """Returns the power-th root of the non-negative integer number, rounded down, using Newton's method. If the budget
+    runs out, the result is too big (but as close as Newton's method got)."""
+    if number < 2:
+        return number
+    if power == 2:
+        return math.isqrt(number)
+    if power >= number.bit_length():
+        # 2 ** power is more than number
+        return 1
+
+    # if the root fits in a float, the floating point root is at most a little out
+    iterations = 0
+    if number.bit_length() <= min(53 * power, 1000):
+        guess = int(number ** (1 / power))
+        while guess ** power > number:
+            guess -= 1
+            iterations += 1
+        while (guess + 1) ** power <= number:
+            guess += 1
+            iterations += 1
+    else:
+        # start from a power of two which is at least the root, so that each guess decreases towards the answer
+        # source: https://en.wikipedia.org/wiki/Integer_square_root#Algorithm_using_Newton's_method
+        guess = 1 << -(-number.bit_length() // power)
+        while True:
+            next_guess = ((power - 1) * guess + number // guess ** (power - 1)) // power
+            iterations += 1
+            if next_guess >= guess:
+                break
+            guess = next_guess
+            if budget is not None and not budget._iterate():
+                break
+
+    if _instrumented:
+        _counters.root_iterations += iterations
+    return guess
+
+
+def _finite_root(radicand, power, scale, scale_to_power, budget=None):
+    """Returns the power-th root of the finite, non-negative transreal radicand. If the root is irrational, it is
+    rounded down to a multiple of 1/scale. scale_to_power must be scale ** power, or None to work it out."""
+    numerator_bits = radicand._numerator.bit_length()
+    denominator_bits = radicand._denominator.bit_length()
+
+    # if the numerator and denominator are both perfect powers, the root is exact
+    if budget is None or budget._check_bits(max(numerator_bits, denominator_bits)):
+        numerator_root = _integer_root(radicand._numerator, power, budget)
+        if numerator_root ** power == radicand._numerator:
+            denominator_root = _integer_root(radicand._denominator, power, budget)
+            if denominator_root ** power == radicand._denominator:
+                return Transreal._from_normalized(numerator_root, denominator_root, radicand._approximate)
+
+    # otherwise, the root is irrational: round it down
+    scale_to_power_bits = power * scale.bit_length() if scale_to_power is None else scale_to_power.bit_length()
+    if budget is None or budget._check_bits(numerator_bits + scale_to_power_bits - denominator_bits):
+        if scale_to_power is None:
+            scale_to_power = scale ** power
+        return Transreal(
+            _integer_root(radicand._numerator * scale_to_power // radicand._denominator, power, budget),
+            scale,
+            approximate=True
+        )
+
+    # if there aren't enough bits to round it to the requested number of decimal places, round it to as many bits as
+    # the budget allows instead
+    return _approximate_root(radicand, power, budget.max_bits)
+
+
+def _approximate_root(radicand, power, max_bits):
+    """Returns the power-th root of the finite, positive transreal radicand, rounded to about max_bits bits."""
+    numerator_bits = radicand._numerator.bit_length()
+    denominator_bits = radicand._denominator.bit_length()
+
+    if power > max_bits:
+        # the root is very close to 1, so floating point is as good as anything
+        try:
+            root = math.exp((math.log(radicand._numerator) - math.log(radicand._denominator)) / power)
+        except OverflowError:
+            raise BudgetExceeded("the root is too large to approximate") from None
+        root = Transreal(root)
+        return Transreal._from_normalized(root._numerator, root._denominator, True)
+
+    # radicand is about mantissa * 2**exponent, so its root is about root(mantissa) * 2**(exponent / power)
+    exponent = (numerator_bits - denominator_bits - max_bits) // power * power
+    if exponent < 0:
+        mantissa = (radicand._numerator << -exponent) // radicand._denominator
+        return Transreal(_integer_root(mantissa, power), 1 << (-exponent // power), approximate=True)
+    else:
+        mantissa = radicand._numerator // (radicand._denominator << exponent)
+        return Transreal(_integer_root(mantissa, power) << (exponent // power), approximate=True)
+
+
+def _unpickle(numerator, denominator, approximate=False):
+    """Create a finite transreal number from a pickle (see Transreal.__reduce__)."""
+    return Transreal._from_normalized(numerator, denominator, approximate)
+
+
+def _unpickle_transcomplex(magnitude, angle, real, imaginary):
+    """Recreate a pickled transcomplex number, with whichever of its forms had been worked out."""
+    self = object.__new__(Transcomplex)
+    self._magnitude = magnitude
+    self._angle = angle
+    self._real = real
+    self._imaginary = imaginary
+    return self
+
+
+def _encode_integer(value):
+    """Return a non-negative integer as its length in bytes (in a varint, 7 bits per byte, least significant first,
+    with the top bit set on every byte but the last) followed by its little-endian bytes."""
+    size = (value.bit_length() + 7) // 8
+    data = value.to_bytes(size, "little")
+    length = bytearray()
+    while size > 127:
+        length.append(size & 127 | 128)
+        size >>= 7
+    length.append(size)
+    return bytes(length) + data
+
+
+def _decode_integer(data, offset):
+    """Return a non-negative integer written by _encode_integer at offset in data, and the offset after it."""
+    size = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        size |= (byte & 127) << shift
+        if byte < 128:
+            break
+        shift += 7
+    end = offset + size
+    if end > len(data):
+        raise IndexError("The integer is cut short!")
+    return int.from_bytes(data[offset:end], "little"), end
+
+
+def _decode(data, offset):
+    """Return a transreal number written by Transreal.to_bytes at offset in data (bytes, a memoryview or an mmap),
+    and the offset after it. Raises a ValueError if the bytes are not a transreal number."""
+    try:
+        header = data[offset]
+        kind = header & 3
+        if kind != _FINITE:
+            if header == kind:
+                return (INFINITY, NEGATIVE_INFINITY, NULLITY)[kind - 1], offset + 1
+        elif header < 16:
+            numerator, offset = _decode_integer(data, offset + 1)
+            denominator, offset = _decode_integer(data, offset)
+            if denominator > 0:
+                return Transreal(-numerator if header & 8 else numerator, denominator, bool(header & 4)), offset
+    except IndexError:
+        pass
+    raise ValueError("Can't make a transreal number from these bytes!")
+
+
+def _kind_of(value):
+    """Return the kind (finite, infinity, -infinity or nullity) of a number which may or may not be transreal."""
+    if isinstance(value, Transreal):
+        return value._kind
+    return _coerce(value)._kind
+
+
+
+def parse_many(lines):
+    """Return an iterator of transreal numbers parsed from an iterable of strings (such as a file, which is read a
+    line at a time), as Transreal.from_string parses them. Blank lines are skipped."""
+    for line in lines:
+        # most lines are usually whole numbers, so try them first
+        try:
+            value = int(line)
+        except ValueError:
+            if line.isspace() or not line:
+                continue
+            yield Transreal.from_string(line)
+        else:
+            yield Transreal._from_normalized(value, 1)
+
+
+def format_many(values):
+    """Return an iterator of lines (ending in newlines) with each of values written as str writes it, which
+    parse_many and Transreal.from_string can read back, e.g. with file.writelines(format_many(values))."""
+    for value in values:
+        yield str(_coerce(value)) + "\n"
+
+
+# the start of a file written by save_column: an identifier, how many numbers there are, and how many of them are in
+# the side table because their numerator or denominator doesn't fit in an int64
+_COLUMN_HEADER = struct.Struct("<8sQQ")
+_COLUMN_MAGIC = b"TRANSRL1"
+
+
+def save_column(path, values):
+    """Write transreal numbers (e.g. a list or a TransrealArray) to a columnar file at path, which TransrealColumn
+    can read without decoding everything up front. The numerators, the denominators and whether the numbers are
+    approximate are each stored one after another, as little-endian int64s (and bytes for approximate). Numbers
+    whose numerator or denominator don't fit in an int64 have a denominator of -1 and a numerator which is their
+    index in a side table, which stores them as Transreal.to_bytes does."""
+    with open(path, "wb") as file:
+        file.writelines(_column_parts(values)[1])
+
+
+def _column_parts(values):
+    """Return how many values there are, and a list of bytes which together are a file for save_column."""
+    if numpy is not None and isinstance(values, TransrealArray):
+        # the fractions in transreal arrays aren't always in lowest terms
+        values._reduce()
+    if numpy is not None and isinstance(values, TransrealArray) and values._numerators.dtype != object:
+        count = len(values)
+        numerators = values._numerators.astype("<i8").tobytes()
+        denominators = values._denominators.astype("<i8").tobytes()
+        approximate = values._approximate.astype(numpy.uint8).tobytes()
+        big = []
+    else:
+        numerators = []
+        denominators = []
+        approximate = bytearray()
+        big = []
+        for value in values:
+            value = _coerce(value)
+            if -_INT64_MAX <= value._numerator <= _INT64_MAX and value._denominator <= _INT64_MAX:
+                numerators.append(value._numerator)
+                denominators.append(value._denominator)
+            else:
+                numerators.append(len(big))
+                denominators.append(-1)
+                big.append(value.to_bytes())
+            approximate.append(value._approximate)
+        count = len(approximate)
+        numerators = struct.pack("<{}q".format(count), *numerators)
+        denominators = struct.pack("<{}q".format(count), *denominators)
+
+    # the side table starts with the offset of each number in it (and of its end), which are 8 byte aligned
+    offsets = [0]
+    for data in big:
+        offsets.append(offsets[-1] + len(data))
+    return count, [
+        _COLUMN_HEADER.pack(_COLUMN_MAGIC, count, len(big)),
+        numerators,
+        denominators,
+        approximate,
+        bytes(-count % 8),
+        struct.pack("<{}Q".format(len(offsets)), *offsets)
+    ] + big
+
+
+
+class TransrealColumn:
+    """A read-only sequence of transreal numbers in a file written by save_column. The file is memory-mapped, and
+    numbers are only decoded when they are looked at (or all at once, with no copying if they fit in int64s, by
+    to_array), so opening even a very large file is quick."""
+
+    __slots__ = ("_buffer", "_length", "_big_length", "_denominators", "_approximate", "_offsets", "_big")
+
+    def __init__(self, path):
+        """Open the file at path, which must have been written by save_column."""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._set(buffer)
+        except ValueError:
+            buffer.close()
+            raise ValueError("{!r} wasn't written by save_column!".format(path)) from None
+
+
+    @classmethod
+    def _from_buffer(cls, buffer):
+        """Create a transreal column from a buffer (e.g. shared memory) holding what save_column writes to files.
+        Raises a ValueError if it doesn't."""
+        self = object.__new__(cls)
+        self._set(buffer)
+        return self
 
 
+    def _set(self, buffer):
+        """Read the header at the start of buffer, and work out where each part of the column starts."""
+        try:
+            magic, length, big_length = _COLUMN_HEADER.unpack_from(buffer)
+        except struct.error:
+            magic = None
+        if magic != _COLUMN_MAGIC:
+            raise ValueError("The buffer doesn't hold a transreal column!")
+        self._buffer = buffer
+        self._length = length
+        self._big_length = big_length
+        self._denominators = _COLUMN_HEADER.size + 8 * length
+        self._approximate = self._denominators + 8 * length
+        self._offsets = self._approximate + length + -length % 8
+        self._big = self._offsets + 8 * (big_length + 1)
+
+
+    def __enter__(self):
+        return self
 
-class Transcomplex:
-    """A transcomplex number. A transcomplex number is a polar vector of two transreal parts. """
 
-    def __init__(self, *args):
-        """Create a transcomplex number."""
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
 
-        # first check what format the input number is in; in most cases this will be in polar form already; but for
-        # the sake of completion we should accept a cmath 'complex number'.
 
-        if isinstance(args[0], Transcomplex):
-            # nothing to do here, really.
-            self.magnitude = args[0].magnitude
-            self.angle = args[0].angle
-            return
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return list(self._values(start, stop))
+            return [self._value(index) for index in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("The index is out of range!")
+        return self._value(index)
 
-        if isinstance(args[0], complex):
-            try:
-                self.polar = cmath.polar(args[0])
-                print(self.polar)
-            except TypeError:
-                print("Error: Input was not a tuple or complex number of the form n+ij")
-                return
 
-            # We need, for transcomplex arithemtic, the polar form of the complex number.
-            self.magnitude = self.polar[0]
-            self.angle = self.polar[1]
+    def __iter__(self):
+        return self._values(0, self._length)
 
-            return
 
-        # we have r and t as arguments. Lets make them transreal.
-        # TODO: Add checks for correct types here.
+    def __len__(self):
+        return self._length
 
-        self.magnitude = args[0]
-        self.angle = args[1]
 
-        # if we've been provided two arguments, there's a possibility one is nullity.
+    def _value(self, index):
+        """Decode the number at index, which must be in range."""
+        numerator, = struct.unpack_from("<q", self._buffer, _COLUMN_HEADER.size + 8 * index)
+        denominator, = struct.unpack_from("<q", self._buffer, self._denominators + 8 * index)
+        if denominator < 0:
+            return self._big_value(numerator)
+        return Transreal(numerator, denominator, self._buffer[self._approximate + index] == 1)
+
+
+    def _values(self, start, stop, normalized=False):
+        """Return an iterator of the numbers from start to stop, which must be in range. If normalized is True, the
+        fractions are assumed to be in lowest terms (e.g. when this module wrote them), which is faster."""
+        # decode a block of numerators and denominators at a time, rather than each one separately
+        for block in range(start, stop, 4096):
+            count = min(4096, stop - block)
+            numerators = struct.unpack_from("<{}q".format(count), self._buffer, _COLUMN_HEADER.size + 8 * block)
+            denominators = struct.unpack_from("<{}q".format(count), self._buffer, self._denominators + 8 * block)
+            approximate = bytes(self._buffer[self._approximate + block:self._approximate + block + count])
+            for numerator, denominator, flag in zip(numerators, denominators, approximate):
+                if denominator < 0:
+                    yield self._big_value(numerator)
+                elif normalized and denominator:
+                    yield Transreal._from_normalized(numerator, denominator, flag == 1)
+                else:
+                    yield Transreal(numerator, denominator, flag == 1)
+
+
+    def _big_value(self, big_index):
+        """Decode the number at big_index in the side table."""
+        start, = struct.unpack_from("<Q", self._buffer, self._offsets + 8 * big_index)
+        return _decode(self._buffer, self._big + start)[0]
+
+
+    def _arrays(self):
+        """Return NumPy arrays of the numerators, denominators and whether the numbers are approximate, which share
+        the buffer's memory unless there are numbers in the side table."""
+        length = self._length
+        numerators = numpy.frombuffer(self._buffer, "<i8", length, _COLUMN_HEADER.size)
+        denominators = numpy.frombuffer(self._buffer, "<i8", length, self._denominators)
+        approximate = numpy.frombuffer(self._buffer, bool, length, self._approximate)
+        if not self._big_length:
+            # the columns are little-endian, so this only copies them on big-endian machines
+            return numerators.astype(numpy.int64, copy=False), denominators.astype(numpy.int64, copy=False), approximate
+        numerators = numerators.astype(object)
+        denominators = denominators.astype(object)
+        for index in numpy.flatnonzero(denominators < 0):
+            value = self._big_value(numerators[index])
+            numerators[index] = value._numerator
+            denominators[index] = value._denominator
+        return numerators, denominators, approximate
+
+
+    def close(self):
+        """Close the file. Transreal arrays from to_array which share its memory keep it open until they are
+        garbage collected."""
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
 
-        if self._check_nullity():
-            # if this returns true, we're done building the transcomplex number
-            return
 
-        if self.angle == INFINITY or self.angle == -INFINITY:
-            # any transcomplex number of angle infinity or -infinity is the point at nullity.
+    def to_array(self):
+        """Returns the numbers as a TransrealArray. If every numerator and denominator fits in an int64, the array
+        shares the file's memory rather than copying it."""
+        if numpy is None:
+            raise ImportError("TransrealArray needs NumPy!")
+        # the numbers are in lowest terms if save_column wrote them, but check in case they weren't
+        return TransrealArray._from_arrays(*self._arrays(), False)
 
-            self.magnitude = NULLITY
-            self.angle = 0
 
-            return
 
-        # any transcomplex number of magnitude zero is the point at zero (mag 0 ang 0)
-        if self.magnitude == 0:
-            self.angle = 0
-            return
+class TransrealFloat:
+    """A transreal number stored as a float, for when speed matters more than exactness. Nullity is NaN (and NaN is
+    nullity), and division by zero gives infinity, -infinity or nullity as it does for Transreal. Transreal floats
+    are immutable.
 
-        try:
-            self.magnitude = Transreal(self.magnitude)
-            self.angle = Transreal(self.angle)
-        except TypeError:
-            print("Error: magnitude or angle are not numbers.")
-            return
+    Unlike Transreal, roots and fractional powers of negative numbers never give transcomplex numbers: odd roots of
+    negative numbers are negative (e.g. the cube root of -8 is -2), and the rest (e.g. -8 ** (1/3), as for floats)
+    are nullity."""
 
+    __slots__ = ("_value",)
 
-        return
+    def __new__(cls, value=0.0):
+        """Create a transreal float from an int, float, transreal number or transreal float (the nearest float to
+        it)."""
+        if isinstance(value, TransrealFloat):
+            return value
+        return _transreal_float(_float_of(value))
 
-    def __mul__(self, other):
-        # check that other is transcomplex
 
+    def __abs__(self):
+        return _transreal_float(abs(self._value))
+
+
+    def __add__(self, other):
+        # if other isn't a transreal float, try to make it a float
         try:
-            other = Transcomplex(other)
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
         except TypeError:
             return NotImplemented
 
-        magnitude = self.magnitude*other.magnitude
+        # inf + -inf is NaN, which is nullity. This is _transreal_float written out, as calling it takes as long as
+        # the rest of the method
+        result = object.__new__(TransrealFloat)
+        value = self._value + other
+        result._value = value + 0.0 if value == value else math.nan
+        return result
 
-        angle = self.angle + other.angle
 
-        ans = Transcomplex(magnitude, angle)
+    def __copy__(self):
+        # transreal floats are immutable, so copies can be the same object
+        return self
 
-        # conform to convention for nullity angles.
-        ans._check_nullity()
 
-        return ans
+    def __deepcopy__(self, memo):
+        return self
 
-    def __truediv__(self, other):
 
-        # r1/r2 , theta1-theta2
+    def __divmod__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        # as for Transreal, dividing by zero or involving non-finite numbers is self - other * (self // other)
+        if other == 0 or not (math.isfinite(self._value) and math.isfinite(other)):
+            floordiv = self // other
+            return (floordiv, self - floordiv * other)
+        floordiv, mod = divmod(self._value, other)
+        return (_transreal_float(floordiv), _transreal_float(mod))
 
-        # check that both numbers are Transcomplex
 
+    def __eq__(self, other):
+        # compare exactly with transreal numbers, as Python does for floats and fractions
+        if isinstance(other, Transreal):
+            return self.to_transreal() == other
         try:
-            other = Transcomplex(other)
+            other = other._value if type(other) is TransrealFloat else _comparable(other)
         except TypeError:
             return NotImplemented
 
-        magnitude = self.magnitude/other.magnitude
-
-        angle = self.angle - other.angle
+        # nullity is equal to itself
+        return self._value == other or (self._value != self._value and other != other)
 
-        ans = Transcomplex(magnitude, angle)
 
-        ans._check_nullity()
+    def __float__(self):
+        return self._value
 
-        return ans
 
-    def __itruediv__(self, other):
+    def __floordiv__(self, other):
+        # if other isn't a transreal float, try to make it a float
         try:
-            other = Transcomplex(other)
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
         except TypeError:
             return NotImplemented
 
-        self.magnitude = self.magnitude/other.magnitude
-        self.angle = self.angle/other.angle
+        if other == 0 or not (math.isfinite(self._value) and math.isfinite(other)):
+            return (self / other).floor()
+        return _transreal_float(self._value // other)
 
-        return self
 
-    def __iadd__(self, other):
+    def __ge__(self, other):
+        # compare exactly with transreal numbers, as Python does for floats and fractions
+        if isinstance(other, Transreal):
+            return self.to_transreal() >= other
         try:
-            other = Transcomplex(other)
+            other = other._value if type(other) is TransrealFloat else _comparable(other)
         except TypeError:
             return NotImplemented
 
+        # nullity is only equal to itself
+        if self._value != self._value or other != other:
+            return self._value != self._value and other != other
+        return self._value >= other
 
 
-    def __add__(self, other):
-
+    def __gt__(self, other):
+        # compare exactly with transreal numbers, as Python does for floats and fractions
+        if isinstance(other, Transreal):
+            return self.to_transreal() > other
         try:
-            other = Transcomplex(other)
+            other = other._value if type(other) is TransrealFloat else _comparable(other)
         except TypeError:
             return NotImplemented
 
-        """Add two transcomplex numbers together. for adding real vectors, there is no reason not to use the cmath
-        library for complex number addition. First here we should deal with the transreals; that is:
-        - Nullity
-        - Infinity + Infinity ( bisector )
+        # comparisons with NaN are always false, as they are for nullity
+        return self._value > other
+
+
+    def __hash__(self):
+        # equal numbers must have equal hashes, and nullity has the same hash as Transreal's nullity
+        if self._value != self._value:
+            return 0
+        return hash(self._value)
+
+
+    def __int__(self):
+        return int(self._value)
+
+
+    def __le__(self, other):
+        # compare exactly with transreal numbers, as Python does for floats and fractions
+        if isinstance(other, Transreal):
+            return self.to_transreal() <= other
+        try:
+            other = other._value if type(other) is TransrealFloat else _comparable(other)
+        except TypeError:
+            return NotImplemented
+
+        # nullity is only equal to itself
+        if self._value != self._value or other != other:
+            return self._value != self._value and other != other
+        return self._value <= other
+
+
+    def __lt__(self, other):
+        # compare exactly with transreal numbers, as Python does for floats and fractions
+        if isinstance(other, Transreal):
+            return self.to_transreal() < other
+        try:
+            other = other._value if type(other) is TransrealFloat else _comparable(other)
+        except TypeError:
+            return NotImplemented
+
+        # comparisons with NaN are always false, as they are for nullity
+        return self._value < other
+
+
+    def __mod__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        return divmod(self, other)[1]
+
+
+    def __mul__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        # infinity * 0 is NaN, which is nullity
+        result = object.__new__(TransrealFloat)
+        value = self._value * other
+        result._value = value + 0.0 if value == value else math.nan
+        return result
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
+    def __neg__(self):
+        return _transreal_float(-self._value)
+
+
+    def __pos__(self):
+        return self
+
+
+    def __pow__(self, power, modulo=None):
+        # if the power isn't a transreal float, try to make it a float
+        try:
+            power = power._value if type(power) is TransrealFloat else _float_of(power)
+        except TypeError:
+            return NotImplemented
+
+        value = self._value
+        if modulo is None and value and power and math.isfinite(value) and math.isfinite(power) and (
+                value > 0 or power.is_integer()):
+            try:
+                return _transreal_float(value ** power)
+            except OverflowError:
+                # a negative number to an odd power is negative
+                return _transreal_float(-math.inf if value < 0 and power % 2 == 1 else math.inf)
+
+        # a negative number to a fractional power isn't real, so (like the NaN float gives) it is nullity
+        if value < 0 and math.isfinite(power) and not power.is_integer():
+            return _transreal_float(math.nan)
+
+        # zero and non-finite numbers and powers are rare, so do the maths with Transreal
+        raised = self.to_transreal().pow(TransrealFloat(power).to_transreal(), modulo)
+        return TransrealFloat(raised) if isinstance(raised, (Transreal, int)) else raised
+
+
+    def __rdivmod__(self, other):
+        # if other isn't a transreal float, try to make it one
+        try:
+            other = TransrealFloat(other)
+        except TypeError:
+            return NotImplemented
+
+        return divmod(other, self)
+
+
+    def __reduce__(self):
+        return (TransrealFloat, (self._value,))
+
+
+    def __str__(self):
+        if self._value != self._value:
+            return "nullity"
+        elif self._value == math.inf:
+            return "infinity"
+        elif self._value == -math.inf:
+            return "-infinity"
+        return repr(self._value)
+
+
+    __repr__ = __str__
+
+
+    __radd__ = __add__
+
+
+    def __rfloordiv__(self, other):
+        # if other isn't a transreal float, try to make it one
+        try:
+            other = TransrealFloat(other)
+        except TypeError:
+            return NotImplemented
+
+        return other // self
+
+
+    def __rmod__(self, other):
+        # if other isn't a transreal float, try to make it one
+        try:
+            other = TransrealFloat(other)
+        except TypeError:
+            return NotImplemented
+
+        return other % self
+
+
+    __rmul__ = __mul__
+
+
+    def __rpow__(self, other):
+        # if other isn't a transreal float, try to make it one
+        try:
+            other = TransrealFloat(other)
+        except TypeError:
+            return NotImplemented
+
+        return other ** self
+
+
+    def __rsub__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        return _transreal_float(other - self._value)
+
+
+    def __rtruediv__(self, other):
+        # if other isn't a transreal float, try to make it one
+        try:
+            other = TransrealFloat(other)
+        except TypeError:
+            return NotImplemented
+
+        return other / self
+
+
+    def __sub__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        # inf - inf is NaN, which is nullity
+        result = object.__new__(TransrealFloat)
+        value = self._value - other
+        result._value = value + 0.0 if value == value else math.nan
+        return result
+
+
+    def __truediv__(self, other):
+        # if other isn't a transreal float, try to make it a float
+        try:
+            other = other._value if type(other) is TransrealFloat else _float_of(other)
+        except TypeError:
+            return NotImplemented
+
+        # dividing by zero is multiplying by the reciprocal of zero, infinity (so 0/0 is nullity)
+        result = object.__new__(TransrealFloat)
+        value = self._value * math.inf if other == 0 else self._value / other
+        result._value = value + 0.0 if value == value else math.nan
+        return result
+
+
+    def floor(self):
+        """Return the floor of (the largest integer value less than or equal to) self."""
+        # for non-finite numbers just return the number
+        if not math.isfinite(self._value):
+            return self
+        return _transreal_float(float(math.floor(self._value)))
+
+
+    def root(self, power):
+        """Returns the power-th root of self (self to the power of 1/power). Odd roots of negative numbers are negative,
+        and other roots of negative numbers are nullity."""
+        power = TransrealFloat(power)
+        if self._value < 0 and power._value.is_integer() and power._value % 2 == 1:
+            return -((-self) ** (1 / power))
+        return self ** (1 / power)
+
+
+    def round(self, decimal_places):
+        """Returns self rounded to the specified number of decimal places."""
+        if not math.isfinite(self._value):
+            return self
+        # round down, like Transreal.round
+        scaled = self._value * 10**decimal_places
+        if not math.isfinite(scaled):
+            # too big for a float, so there are no more decimal places to lose
+            return self
+        return _transreal_float(math.floor(scaled) / 10**decimal_places)
+
+
+    def sign(self):
+        """Returns the sign of self."""
+        if self._value != self._value:
+            return self
+        return _transreal_float(float((self._value > 0) - (self._value < 0)))
+
+
+    def to_transreal(self):
+        """Return self as a transreal number, exactly."""
+        if self._value != self._value:
+            return NULLITY
+        return Transreal._from_float(self._value)
+
+
+
+def _transreal_float(value):
+    """Make a transreal float from a float, with NaN as (one) nullity and no negative zero."""
+    self = object.__new__(TransrealFloat)
+    # -0.0 + 0.0 is 0.0, and nothing else is changed
+    self._value = value + 0.0 if value == value else math.nan
+    return self
+
+
+def _float_of(value):
+    """Convert an int, float or transreal number to the nearest float, with infinity, -infinity and nullity as inf,
+    -inf and NaN. Raises a TypeError if this is not possible."""
+    if type(value) is float:
+        return value
+    value = _from_numpy(value)
+    if value is NULLITY:
+        return math.nan
+    if isinstance(value, (int, float, Transreal)):
+        try:
+            return float(value)
+        except OverflowError:
+            # too big for a float
+            return math.inf if value > 0 else -math.inf
+    raise TypeError("A transreal float can only be made from an int, float or transreal number!")
+
+
+def _comparable(value):
+    """Convert a number to something a float can be compared with exactly: ints are left as they are, and everything
+    else is converted to a float. Raises a TypeError if this is not possible."""
+    value = _from_numpy(value)
+    if type(value) is int:
+        return value
+    return _float_of(value)
+
+
+
+class BudgetExceeded(ArithmeticError):
+    """Raised when a computation runs out of budget."""
+
+
+class Budget:
+    """A limit on how much work roots (and fractional powers) may do, so that huge inputs can't take forever.
+
+    max_iterations limits the number of iterations of Newton's method, max_bits limits the size of the integers used,
+    and timeout is a number of seconds from when the budget is created. A budget is used up by every computation it is
+    given to. When it runs out, roots are rounded to whatever precision they have reached (and are approximate), or if
+    strict is True, BudgetExceeded is raised. Whole powers are exact, so if they need more than max_bits bits
+    BudgetExceeded is always raised. The timeout is only checked between iterations, so use max_bits as well for a
+    hard limit."""
+
+    __slots__ = ("max_iterations", "max_bits", "deadline", "strict", "iterations")
+
+    def __init__(self, max_iterations=None, max_bits=None, timeout=None, strict=False):
+        """Create a budget. None means no limit."""
+        self.max_iterations = max_iterations
+        self.max_bits = max_bits
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.strict = strict
+        self.iterations = 0
+
+
+    def __repr__(self):
+        return "Budget(max_iterations={}, max_bits={}, deadline={}, strict={}, iterations={})".format(
+            self.max_iterations, self.max_bits, self.deadline, self.strict, self.iterations)
+
+
+    def _check_bits(self, bits, strict=False):
+        """Returns whether a computation on integers of the given number of bits is within the budget. If it isn't
+        and the budget (or the computation) is strict, raises BudgetExceeded."""
+        if self.max_bits is None or bits <= self.max_bits:
+            return True
+        if self.strict or strict:
+            raise BudgetExceeded("{} bits are needed, but the budget is {} bits".format(bits, self.max_bits))
+        return False
+
+
+    def _iterate(self):
+        """Counts an iteration, and returns whether the budget has any left. If it hasn't and the budget is strict,
+        raises BudgetExceeded."""
+        self.iterations += 1
+        if self.max_iterations is not None and self.iterations > self.max_iterations:
+            reason = "more than {} iterations are needed".format(self.max_iterations)
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            reason = "the timeout has passed"
+        else:
+            return True
+        if self.strict:
+            raise BudgetExceeded(reason)
+        return False
+
+
+
+def set_bit_limit(max_bits):
+    """Round every transreal number made from now on (including the result of every operation) whose numerator or
+    denominator has more than max_bits bits to the closest number which fits, marking it approximate. This keeps the
+    cost of long iterative computations from growing without limit. Numbers too big to fit are rounded to integers.
+    None removes the limit. The limit applies to every thread. Returns the previous limit."""
+    global _bit_limit
+    if max_bits is not None and max_bits < 1:
+        raise ValueError("max_bits should be at least 1!")
+    previous = _bit_limit
+    _bit_limit = max_bits
+    return previous
+
+
+@contextlib.contextmanager
+def bit_limit(max_bits):
+    """Set the bit limit (see set_bit_limit) inside a with statement, putting the previous one back afterwards."""
+    previous = set_bit_limit(max_bits)
+    try:
+        yield
+    finally:
+        set_bit_limit(previous)
+
+
+def set_instrumentation(enabled):
+    """Start (or stop) counting operations on transreal and transcomplex numbers by method, constructions by type,
+    coercions (e.g. of an int to a transreal number) by type, gcd calls (and how many bits their operands have),
+    Newton's method iterations in roots, trigonometric function calls and the biggest numerator and denominator made,
+    and calling the timing hooks (see add_timing_hook). This is off by default, and costs almost nothing when off, as
+    each place where something is counted only checks a flag. The counts are kept when it is turned off (see
+    instrumentation_snapshot). It is on or off for every thread at once. Returns whether it was on."""
+    global _instrumented
+    with _instrumentation_lock:
+        previous = _instrumented
+        _instrumented = bool(enabled)
+    return previous
+
+
+@contextlib.contextmanager
+def instrumentation():
+    """Turn instrumentation (see set_instrumentation) on inside a with statement, putting it back afterwards."""
+    previous = set_instrumentation(True)
+    try:
+        yield
+    finally:
+        set_instrumentation(previous)
+
+
+def instrumentation_snapshot(reset=False):
+    """Return the counts so far (see set_instrumentation) as a dictionary, starting them again from zero if reset is
+    True."""
+    with _instrumentation_lock:
+        snapshot = {
+            "operations": dict(_counters.operations),
+            "constructions": dict(_counters.constructions),
+            "coercions": {kind: dict(counts) for kind, counts in _counters.coercions.items()},
+            "gcd_calls": builtins.sum(_counters.gcd_operand_bits),
+            "gcd_operand_bits": {
+                str(bound): count for bound, count in zip(_GCD_BIT_BUCKETS + ("+Inf",), _counters.gcd_operand_bits)},
+            "gcd_operand_bits_total": _counters.gcd_operand_bits_total,
+            "root_iterations": _counters.root_iterations,
+            "trigonometric_calls": dict(_counters.trigonometric_calls),
+            "max_numerator_bits": _counters.max_numerator_bits,
+            "max_denominator_bits": _counters.max_denominator_bits,
+        }
+        if reset:
+            _counters.reset()
+    return snapshot
+
+
+def instrumentation_prometheus():
+    """Return the counts so far (see set_instrumentation) in the Prometheus text format, for a metrics exporter."""
+    snapshot = instrumentation_snapshot()
+    lines = []
+
+    def metric(name, kind, description, samples):
+        lines.append("# HELP transmaths_{} {}".format(name, description))
+        lines.append("# TYPE transmaths_{} {}".format(name, kind))
+        for suffix, labels, value in samples:
+            label_text = ",".join('{}="{}"'.format(label, label_value) for label, label_value in labels)
+            lines.append("transmaths_{}{}{} {}".format(name, suffix, "{" + label_text + "}" if labels else "", value))
+
+    metric("operations_total", "counter", "Operations on transmaths objects, by method.",
+           [("", [("method", method)], count) for method, count in sorted(snapshot["operations"].items())])
+    metric("constructions_total", "counter", "Transmaths objects constructed, by type.",
+           [("", [("type", kind)], count) for kind, count in sorted(snapshot["constructions"].items())])
+    metric("coercions_total", "counter", "Values converted to transmaths objects by operations, by type.",
+           [("", [("to", kind), ("from", source)], count)
+            for kind, counts in sorted(snapshot["coercions"].items()) for source, count in sorted(counts.items())])
+    # Prometheus histogram buckets count everything less than or equal to their bound
+    buckets = list(itertools.accumulate(snapshot["gcd_operand_bits"].values()))
+    metric("gcd_operand_bits", "histogram", "Bits in the bigger operand of each gcd call.",
+           [("_bucket", [("le", bound)], count) for bound, count in zip(snapshot["gcd_operand_bits"], buckets)]
+           + [("_sum", [], snapshot["gcd_operand_bits_total"]), ("_count", [], snapshot["gcd_calls"])])
+    metric("root_iterations_total", "counter", "Newton's method iterations in integer roots.",
+           [("", [], snapshot["root_iterations"])])
+    metric("trigonometric_calls_total", "counter", "Trigonometric function calls, by function.",
+           [("", [("function", function)], count)
+            for function, count in sorted(snapshot["trigonometric_calls"].items())])
+    metric("max_numerator_bits", "gauge", "Bits in the biggest numerator made.",
+           [("", [], snapshot["max_numerator_bits"])])
+    metric("max_denominator_bits", "gauge", "Bits in the biggest denominator made.",
+           [("", [], snapshot["max_denominator_bits"])])
+    return "\n".join(lines) + "\n"
+
+
+def add_timing_hook(hook):
+    """Call hook(method, seconds) after every operation counted while instrumentation is on (see
+    set_instrumentation), with the method's name (e.g. "Transreal.__add__") and how long it took."""
+    _timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    """Stop calling a hook added by add_timing_hook."""
+    _timing_hooks.remove(hook)
+
+
+# the upper bounds of the ranges of operand bits counted for gcd calls (the last range has no upper bound)
+_GCD_BIT_BUCKETS = (64, 256, 1024, 4096, 16384)
+
+# the functions called after every counted operation, with its name and how long it took
+_timing_hooks = []
+
+# held while instrumentation is turned on or off, or its counts are reset
+_instrumentation_lock = threading.Lock()
+
+
+class _InstrumentationState(threading.local):
+    """Whether this thread is in the middle of a counted operation, in which case the operations it is made of (e.g.
+    the additions in a root) aren't counted as well."""
+
+    active = False
+
+
+_instrumenting = _InstrumentationState()
+
+
+class _Counters:
+    """The counts kept by instrumentation (see set_instrumentation)."""
+
+    __slots__ = ("operations", "constructions", "coercions", "gcd_operand_bits", "gcd_operand_bits_total",
+                 "root_iterations", "trigonometric_calls", "max_numerator_bits", "max_denominator_bits")
+
+    def __init__(self):
+        self.reset()
+
+
+    def reset(self):
+        """Start counting again from zero."""
+        self.operations = {}
+        self.constructions = {}
+        self.coercions = {}
+        self.gcd_operand_bits = [0] * (len(_GCD_BIT_BUCKETS) + 1)
+        self.gcd_operand_bits_total = 0
+        self.root_iterations = 0
+        self.trigonometric_calls = {}
+        self.max_numerator_bits = 0
+        self.max_denominator_bits = 0
+
+
+_counters = _Counters()
+
+
+def _instrument(label, method, *arguments):
+    """Call method with arguments (for a method which has found that instrumentation is on), counting the call as an
+    operation called label and calling the timing hooks."""
+    _counters.operations[label] = _counters.operations.get(label, 0) + 1
+    _instrumenting.active = True
+    try:
+        if _timing_hooks:
+            start = time.perf_counter()
+            result = method(*arguments)
+            seconds = time.perf_counter() - start
+        else:
+            return method(*arguments)
+    finally:
+        _instrumenting.active = False
+    for hook in list(_timing_hooks):
+        hook(label, seconds)
+    return result
+
+
+def _count_construction(kind, numerator=0, denominator=0):
+    """Count a transreal (with numerator and denominator) or transcomplex number being made."""
+    _counters.constructions[kind] = _counters.constructions.get(kind, 0) + 1
+    _counters.max_numerator_bits = max(_counters.max_numerator_bits, numerator.bit_length())
+    _counters.max_denominator_bits = max(_counters.max_denominator_bits, denominator.bit_length())
+
+
+def _count_coercion(kind, value):
+    """Count value being converted to a transreal or transcomplex number (kind) by an operation."""
+    counts = _counters.coercions.setdefault(kind, {})
+    source = type(value).__name__
+    counts[source] = counts.get(source, 0) + 1
+
+
+def _count_gcd(integer1, integer2):
+    """Count a gcd call, by how many bits the bigger operand has."""
+    bits = max(integer1.bit_length(), integer2.bit_length())
+    _counters.gcd_operand_bits[bisect.bisect_left(_GCD_BIT_BUCKETS, bits)] += 1
+    _counters.gcd_operand_bits_total += bits
+
+
+def _count_trigonometric(function):
+    """Count a call of a trigonometric function."""
+    _counters.trigonometric_calls[function] = _counters.trigonometric_calls.get(function, 0) + 1
+
+
+class TransrealAccumulator:
+    """A running sum of transreal numbers. The sum is only reduced to lowest terms when it is needed (e.g. compared,
+    hashed or printed) or when its denominator grows beyond max_bits bits, which makes long sums much faster than
+    adding transreal numbers one at a time. The result is always identical to adding them one at a time."""
+
+    __slots__ = ("_numerator", "_denominator", "_approximate", "_result", "max_bits")
+
+    def __init__(self, start=0, max_bits=4096):
+        """Create an accumulator, starting from start."""
+        start = _coerce(start)
+        self._numerator = start._numerator
+        self._denominator = start._denominator
+        self._approximate = start._approximate
+        # once the sum is no longer finite, it is just a transreal number
+        self._result = start if start._kind else None
+        self.max_bits = max_bits
+
+
+    def __eq__(self, other):
+        return self.value == other
+
+
+    def __float__(self):
+        return float(self.value)
+
+
+    def __ge__(self, other):
+        return self.value >= other
+
+
+    def __gt__(self, other):
+        return self.value > other
+
+
+    # accumulators change, so cannot be hashed; hash the value instead
+    __hash__ = None
+
+
+    def __iadd__(self, other):
+        # if other isn't transreal, try to make it transreal
+        try:
+            other = _coerce(other)
+        except TypeError:
+            return NotImplemented
+
+        if self._result is not None or other._kind:
+            self._result = self.value + other
+            return self
+
+        # add the fractions without simplifying them, if possible without making the denominator any bigger than it
+        # has to be (the denominators of floats are powers of two, so one is always a multiple of the other)
+        if other._denominator == 1:
+            self._numerator += other._numerator * self._denominator
+        elif self._denominator % other._denominator == 0:
+            self._numerator += other._numerator * (self._denominator // other._denominator)
+        else:
+            if other._denominator % self._denominator == 0:
+                self._numerator = self._numerator * (other._denominator // self._denominator) + other._numerator
+                self._denominator = other._denominator
+            else:
+                self._numerator = self._numerator * other._denominator + other._numerator * self._denominator
+                self._denominator *= other._denominator
+            if self._denominator.bit_length() > self.max_bits:
+                self._normalize()
+        self._approximate = self._approximate or other._approximate
+        return self
+
+
+    def __isub__(self, other):
+        # if other isn't transreal, try to make it transreal
+        try:
+            other = _coerce(other)
+        except TypeError:
+            return NotImplemented
+
+        self += -other
+        return self
+
+
+    def __le__(self, other):
+        return self.value <= other
+
+
+    def __lt__(self, other):
+        return self.value < other
+
+
+    def __ne__(self, other):
+        return self.value != other
+
+
+    def __str__(self):
+        return str(self.value)
+
+
+    __repr__ = __str__
+
+
+    def _normalize(self):
+        """Reduce the running sum to lowest terms."""
+        if _instrumented:
+            _count_gcd(self._numerator, self._denominator)
+        common_factor = gcd(self._numerator, self._denominator)
+        if common_factor > 1:
+            self._numerator //= common_factor
+            self._denominator //= common_factor
+
+
+    @property
+    def value(self):
+        """The sum so far, as a transreal number."""
+        if self._result is not None:
+            return self._result
+        self._normalize()
+        return Transreal._from_normalized(self._numerator, self._denominator, self._approximate)
+
+
+
+def sum(values, start=0, max_bits=4096):
+    """Return start plus the sum of values (ints, floats or transreal numbers), as a transreal number. This gives the
+    same result as adding them one at a time, but is much faster: like TransrealAccumulator, the sum is only put in
+    lowest terms when its denominator is more than max_bits long, and it stops as soon as the sum is nullity."""
+    start = _coerce(start)
+    if start is NULLITY:
+        return NULLITY
+    # transreal addition is associative, so start can be added on at the end
+    return start + _sum(values, max_bits)[0]
+
+
+def prod(values, start=1, max_bits=4096):
+    """Return start times the product of values (ints, floats or transreal numbers), as a transreal number. This gives
+    the same result as multiplying them one at a time, but is much faster: the product is only put in lowest terms
+    when its denominator is more than max_bits long, and it stops as soon as the product is nullity."""
+    start = _coerce(start)
+    if start is NULLITY:
+        return NULLITY
+
+    numerator = denominator = 1
+    approximate = negative = zero = infinite = False
+    empty = True
+    for value in values:
+        empty = False
+        value = _coerce(value)
+        if value._numerator < 0:
+            negative = not negative
+        if value._kind:
+            # nullity times anything is nullity, as is infinity times zero
+            if value is NULLITY or zero:
+                return NULLITY
+            infinite = True
+        elif value._numerator == 0:
+            if infinite:
+                return NULLITY
+            zero = True
+        elif not (zero or infinite):
+            # once the product is zero or infinite, only the signs of the other values matter
+            numerator *= value._numerator
+            denominator *= value._denominator
+            approximate = approximate or value._approximate
+            if denominator.bit_length() > max_bits:
+                if _instrumented:
+                    _count_gcd(numerator, denominator)
+                common_factor = gcd(numerator, denominator)
+                numerator //= common_factor
+                denominator //= common_factor
+
+    # transreal multiplication is associative, so start can be multiplied in at the end (unless there is nothing to
+    # multiply it by, as multiplying an approximate zero by 1 would make it exact)
+    if empty:
+        return start
+    if infinite:
+        return start * (NEGATIVE_INFINITY if negative else INFINITY)
+    if zero:
+        return start * Transreal._from_normalized(0, 1)
+    return start * Transreal(numerator, denominator, approximate)
+
+
+def mean(values, max_bits=4096):
+    """Return the mean of values (ints, floats or transreal numbers), as a transreal number. This gives the same result
+    as adding them one at a time and dividing by how many there are, so the mean of no values is 0/0 (nullity)."""
+    total, count = _sum(values, max_bits)
+    return total / count
+
+
+def fsum(values):
+    """Return the exact sum of floats (or ints), as a transreal number. This is like math.fsum, but nothing is rounded:
+    every float is a whole number divided by a power of two, so the sum can be kept as one big whole number divided by
+    a power of two, found by shifting. NaN is treated as nullity, as are infinity and -infinity together."""
+    numerator = 0
+    # the sum so far is numerator / 2**shift
+    shift = 0
+    infinity = None
+    for value in values:
+        try:
+            value_numerator, value_denominator = float.as_integer_ratio(value)
+        except TypeError:
+            if not isinstance(value, int):
+                raise
+            value_numerator, value_denominator = value, 1
+        except (OverflowError, ValueError):
+            # infinity, -infinity or NaN
+            if value != value or (infinity is not None and infinity != value):
+                return NULLITY
+            infinity = value
+            continue
+
+        value_shift = value_denominator.bit_length() - 1
+        if value_shift > shift:
+            numerator = (numerator << (value_shift - shift)) + value_numerator
+            shift = value_shift
+        else:
+            numerator += value_numerator << (shift - value_shift)
+
+    if infinity is not None:
+        return INFINITY if infinity > 0 else NEGATIVE_INFINITY
+    return _add_dyadic(numerator, 1 << shift, 0, 1, False)
+
+
+def _sum(values, max_bits):
+    """Return the sum of values, and how many of them were added before the sum was known."""
+    numerator, denominator = 0, 1
+    approximate = False
+    infinity = None
+    count = 0
+    for value in values:
+        count += 1
+        # integers and floats are the most common values, and can be added without making them transreal
+        if type(value) is int:
+            numerator += value * denominator
+            continue
+        if type(value) is float and -math.inf < value < math.inf:
+            value_numerator, value_denominator = value.as_integer_ratio()
+        else:
+            value = _coerce(value)
+            if value._kind:
+                # nullity plus anything is nullity, as is infinity plus -infinity
+                if value is NULLITY or (infinity is not None and infinity is not value):
+                    return NULLITY, count
+                infinity = value
+                continue
+            value_numerator, value_denominator = value._numerator, value._denominator
+            approximate = approximate or value._approximate
+        if infinity is not None:
+            # once the sum is infinite, only infinities and nullity can change it
+            continue
+
+        # add the fractions without simplifying them, if possible without making the denominator any bigger than it
+        # has to be (the denominators of floats are powers of two, so one is always a multiple of the other)
+        if value_denominator == 1:
+            numerator += value_numerator * denominator
+        elif denominator % value_denominator == 0:
+            numerator += value_numerator * (denominator // value_denominator)
+        else:
+            if value_denominator % denominator == 0:
+                numerator = numerator * (value_denominator // denominator) + value_numerator
+                denominator = value_denominator
+            else:
+                numerator = numerator * value_denominator + value_numerator * denominator
+                denominator *= value_denominator
+            if denominator.bit_length() > max_bits:
+                if _instrumented:
+                    _count_gcd(numerator, denominator)
+                common_factor = gcd(numerator, denominator)
+                numerator //= common_factor
+                denominator //= common_factor
+
+    if infinity is not None:
+        return infinity, count
+    return Transreal(numerator, denominator, approximate), count
+
+
+
+def parallel_map(function, values, processes=None, chunk_size=65536):
+    """Return function applied to each of values (ints, floats or transreal numbers), as a list of transreal numbers
+    (or a TransrealArray, if values is one), using a pool of processes (as many as there are CPUs unless processes is
+    given). The values are sent to the processes, and the results sent back, through shared memory holding their
+    numerators and denominators rather than by pickling them, though function itself must be picklable (e.g.
+    defined at the top level of a module). Needs Python 3.8 or later."""
+    from multiprocessing import shared_memory
+    array = numpy is not None and isinstance(values, TransrealArray)
+    input_memory, length = _share_column(values)
+    try:
+        # a column with no side table: the header, numerators, denominators, approximate (padded to 8 bytes) and
+        # the end offset of the side table, which is 0 (as shared memory starts off filled with zeroes)
+        output_memory = shared_memory.SharedMemory(
+            create=True, size=_COLUMN_HEADER.size + 17 * length + -length % 8 + 8)
+        try:
+            output_memory.buf[:_COLUMN_HEADER.size] = _COLUMN_HEADER.pack(_COLUMN_MAGIC, length, 0)
+            big = {}
+            for chunk_big in _run_chunks(
+                    _map_chunk,
+                    [(input_memory.name, output_memory.name, start, min(start + chunk_size, length), function)
+                     for start in range(0, length, chunk_size)],
+                    processes):
+                big.update(chunk_big)
+
+            output = TransrealColumn._from_buffer(output_memory.buf)
+            if array:
+                numerators, denominators, approximate = output._arrays()
+                if big:
+                    numerators = numerators.astype(object)
+                    denominators = denominators.astype(object)
+                    for index, value in big.items():
+                        numerators[index] = value._numerator
+                        denominators[index] = value._denominator
+                results = TransrealArray._from_arrays(numerators.copy(), denominators.copy(), approximate.copy())
+                del numerators, denominators, approximate
+            else:
+                results = list(output._values(0, length, True))
+                for index, value in big.items():
+                    results[index] = value
+            del output
+        finally:
+            output_memory.close()
+            output_memory.unlink()
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+    return results
+
+
+def parallel_reduce(function, values, initial=None, processes=None, chunk_size=65536):
+    """Return values (ints, floats or transreal numbers) reduced with function, as functools.reduce does, using a pool
+    of processes like parallel_map. Each chunk_size values are reduced separately, and then their results are
+    reduced in order, so the result doesn't depend on how many processes there are, and is identical to
+    functools.reduce if function is associative (e.g. operator.mul, or transmaths.maximum of a pair)."""
+    partials = _parallel_chunks(_fold, function, values, processes, chunk_size)
+    if initial is None:
+        return functools.reduce(function, partials)
+    return functools.reduce(function, partials, _coerce(initial))
+
+
+def parallel_sum(values, start=0, max_bits=4096, processes=None, chunk_size=65536):
+    """Return start plus the sum of values (ints, floats or transreal numbers), as a transreal number, using a pool of
+    processes like parallel_map. Transreal addition is associative, and the chunks are added up exactly, so this
+    is identical to sum."""
+    partials = _parallel_chunks(_sum, max_bits, values, processes, chunk_size)
+    return sum((partial for partial, count in partials), start, max_bits)
+
+
+def _parallel_chunks(reducer, argument, values, processes, chunk_size):
+    """Return reducer(chunk, argument) for each chunk_size values (as transreal numbers), in order, using a pool of
+    processes."""
+    memory, length = _share_column(values)
+    try:
+        return _run_chunks(
+            _reduce_chunk,
+            [(memory.name, start, min(start + chunk_size, length), reducer, argument)
+             for start in range(0, length, chunk_size)],
+            processes)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _share_column(values):
+    """Return shared memory holding values as save_column writes them, and how many values there are."""
+    from multiprocessing import shared_memory
+    length, parts = _column_parts(values)
+    memory = shared_memory.SharedMemory(create=True, size=builtins.sum(map(len, parts)))
+    offset = 0
+    for part in parts:
+        memory.buf[offset:offset + len(part)] = part
+        offset += len(part)
+    return memory, length
+
+
+def _run_chunks(function, arguments, processes):
+    """Return function called with each of arguments, in order, in a pool of processes if there is more than one
+    chunk to work on."""
+    if len(arguments) < 2 or processes == 1:
+        return [function(*chunk_arguments) for chunk_arguments in arguments]
+    from concurrent import futures
+    # the processes might not have been forked from this one, so give them the same bit limit
+    with futures.ProcessPoolExecutor(processes, initializer=set_bit_limit, initargs=(_bit_limit,)) as executor:
+        return list(executor.map(function, *zip(*arguments)))
+
+
+def _map_chunk(input_name, output_name, start, stop, function):
+    """Apply function to the numbers from start to stop in the column in the shared memory called input_name, and
+    write the results to the same places in the column in the shared memory called output_name. Returns the results
+    whose numerator or denominator don't fit in an int64 (which are left as 0/1 in the column), by index."""
+    from multiprocessing import shared_memory
+    input_memory = shared_memory.SharedMemory(input_name)
+    output_memory = shared_memory.SharedMemory(output_name)
+    try:
+        values = TransrealColumn._from_buffer(input_memory.buf)._values(start, stop, True)
+        results = [_coerce(function(value)) for value in values]
+        numerators = []
+        denominators = []
+        big = {}
+        for index, value in enumerate(results, start):
+            if -_INT64_MAX <= value._numerator <= _INT64_MAX and value._denominator <= _INT64_MAX:
+                numerators.append(value._numerator)
+                denominators.append(value._denominator)
+            else:
+                numerators.append(0)
+                denominators.append(1)
+                big[index] = value
+
+        # the output column has the same layout as the input column, but no side table
+        length = TransrealColumn._from_buffer(output_memory.buf)._length
+        count = stop - start
+        struct.pack_into("<{}q".format(count), output_memory.buf, _COLUMN_HEADER.size + 8 * start, *numerators)
+        struct.pack_into("<{}q".format(count), output_memory.buf, _COLUMN_HEADER.size + 8 * (length + start),
+                         *denominators)
+        output_memory.buf[_COLUMN_HEADER.size + 16 * length + start:_COLUMN_HEADER.size + 16 * length + stop] = bytes(
+            value._approximate for value in results)
+        return big
+    finally:
+        input_memory.close()
+        output_memory.close()
+
+
+def _reduce_chunk(name, start, stop, reducer, argument):
+    """Return reducer(numbers, argument) for the numbers from start to stop in the column in the shared memory called
+    name."""
+    from multiprocessing import shared_memory
+    memory = shared_memory.SharedMemory(name)
+    try:
+        return reducer(TransrealColumn._from_buffer(memory.buf)._values(start, stop, True), argument)
+    finally:
+        memory.close()
+
+
+def _fold(values, function):
+    """Return values reduced with function, for parallel_reduce."""
+    return functools.reduce(function, values)
+
+
+
+# where each kind of transreal number goes in the total order used for sorting
+_SORT_RANKS = {_NEGATIVE_INFINITY: 0, _FINITE: 1, _INFINITY: 2, _NULLITY: 3}
+
+
+def sort_key(value):
+    """Return a key which puts transreal numbers in a total order: -infinity, the finite numbers, infinity, nullity.
+
+    Nullity is not less than, equal to or greater than any other number, so sorting it with the normal comparisons
+    gives an unpredictable order; this key puts it after infinity instead. Finite numbers are compared by their
+    nearest float first, so big integers only need to be cross-multiplied when the floats are the same.
+    """
+    value = _coerce(value)
+    if value._kind:
+        return (_SORT_RANKS[value._kind], 0.0, value)
+    try:
+        nearest = value._numerator / value._denominator
+    except OverflowError:
+        # rounding to the nearest float never changes the order, and neither does rounding to infinity
+        nearest = math.inf if value._numerator > 0 else -math.inf
+    return (_SORT_RANKS[_FINITE], nearest, value)
+
+
+def sort(values, reverse=False):
+    """Return a new list of the values, in the order given by sort_key."""
+    return sorted(values, key=sort_key, reverse=reverse)
+
+
+def argsort(values, reverse=False):
+    """Return the indices which would put the values in the order given by sort_key."""
+    keys = [sort_key(value) for value in values]
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+
+def minimum(values):
+    """Return the first smallest of the values in the order given by sort_key (so nullity only if all are nullity)."""
+    return _coerce(min(values, key=sort_key))
+
+
+def maximum(values):
+    """Return the first biggest of the values in the order given by sort_key (so nullity if any are nullity)."""
+    return _coerce(max(values, key=sort_key))
+
+
+def top_k(values, k, largest=True):
+    """Return the k biggest (or smallest) of the values, biggest (or smallest) first, in the order given by sort_key."""
+    if largest:
+        return [_coerce(value) for value in heapq.nlargest(k, values, key=sort_key)]
+    return [_coerce(value) for value in heapq.nsmallest(k, values, key=sort_key)]
+
+
+def bisect_left(values, value, lo=0, hi=None):
+    """Return where value would go in values (sorted by sort_key), before any equal values."""
+    key = sort_key(value)
+    if hi is None:
+        hi = len(values)
+    while lo < hi:
+        middle = (lo + hi) // 2
+        if sort_key(values[middle]) < key:
+            lo = middle + 1
+        else:
+            hi = middle
+    return lo
+
+
+def bisect_right(values, value, lo=0, hi=None):
+    """Return where value would go in values (sorted by sort_key), after any equal values."""
+    key = sort_key(value)
+    if hi is None:
+        hi = len(values)
+    while lo < hi:
+        middle = (lo + hi) // 2
+        if key < sort_key(values[middle]):
+            hi = middle
+        else:
+            lo = middle + 1
+    return lo
+
+
+def searchsorted(sorted_values, values, side="left"):
+    """Return where each of the values would go in sorted_values (sorted by sort_key), like bisect_left/bisect_right."""
+    if side == "left":
+        search = bisect.bisect_left
+    elif side == "right":
+        search = bisect.bisect_right
+    else:
+        raise ValueError("side must be 'left' or 'right'")
+    # work out the keys of the sorted values only once, rather than once per search
+    keys = [sort_key(value) for value in sorted_values]
+    return [search(keys, sort_key(value)) for value in values]
+
+
+# the first byte of the keys encode_key gives for each kind of transreal number (and for each sign of finite ones)
+_KEY_NEGATIVE_INFINITY = 1
+_KEY_NEGATIVE = 2
+_KEY_ZERO = 3
+_KEY_POSITIVE = 4
+_KEY_INFINITY = 5
+_KEY_NULLITY = 6
+_NON_FINITE_KEYS = {
+    _NEGATIVE_INFINITY: bytes((_KEY_NEGATIVE_INFINITY,)),
+    _INFINITY: bytes((_KEY_INFINITY,)),
+    _NULLITY: bytes((_KEY_NULLITY,))
+}
+
+# bytes.translate table which inverts every bit
+_COMPLEMENT = bytes(range(255, -1, -1))
+
+
+def encode_key(value):
+    """Return bytes which compare (byte by byte, as in SQLite, sorted key-value stores, or Python) in the order
+    given by sort_key: -infinity, the finite numbers, infinity, nullity. decode_key gives the number back. The keys
+    of equal numbers only differ in their last byte, which is 0 for exact numbers and 1 for approximate ones.
+
+    Finite numbers are written as a sign byte and their continued fraction: each term in an order-preserving varint
+    (with every bit inverted for every other term, as a bigger term there means a smaller number), then a 255 which
+    is bigger than any term, or smaller once inverted. Negative numbers have every bit of this inverted."""
+    value = _coerce(value)
+    if value._kind:
+        return _NON_FINITE_KEYS[value._kind]
+    numerator = value._numerator
+    denominator = value._denominator
+    if numerator == 0:
+        return bytes((_KEY_ZERO, value._approximate))
+
+    if numerator < 0:
+        key = bytearray((_KEY_NEGATIVE,))
+        numerator = -numerator
+        flip = 255
+    else:
+        key = bytearray((_KEY_POSITIVE,))
+        flip = 0
+    while True:
+        term, remainder = divmod(numerator, denominator)
+        if term < 192:
+            # most terms of continued fractions are small, so they fit in one byte
+            key.append(term ^ flip)
+        else:
+            size = (term.bit_length() + 7) // 8
+            if size <= 61:
+                term_key = bytes((191 + size,)) + term.to_bytes(size, "big")
+            else:
+                term_key = b"\xfd" + size.to_bytes(8, "big") + term.to_bytes(size, "big")
+            key += term_key.translate(_COMPLEMENT) if flip else term_key
+        if remainder == 0:
+            break
+        numerator, denominator = denominator, remainder
+        flip ^= 255
+    # 255 after the last term, but for the next term (so the other way round)
+    key.append(flip)
+    key.append(value._approximate)
+    return bytes(key)
+
+
+def decode_key(key):
+    """Return the transreal number which encode_key gave key for. Raises a ValueError if key is not a transreal
+    number's key."""
+    try:
+        kind = key[0]
+        if len(key) == 1:
+            if kind == _KEY_NEGATIVE_INFINITY:
+                return NEGATIVE_INFINITY
+            if kind == _KEY_INFINITY:
+                return INFINITY
+            if kind == _KEY_NULLITY:
+                return NULLITY
+        approximate = key[-1]
+        if approximate > 1:
+            raise ValueError
+        if kind == _KEY_ZERO and len(key) == 2:
+            return Transreal._from_normalized(0, 1, approximate == 1)
+        if kind not in (_KEY_NEGATIVE, _KEY_POSITIVE):
+            raise ValueError
+
+        terms = []
+        offset = 1
+        flip = 255 if kind == _KEY_NEGATIVE else 0
+        while True:
+            byte = key[offset] ^ flip
+            offset += 1
+            if byte == 255:
+                break
+            if byte < 192:
+                term = byte
+            else:
+                if byte < 253:
+                    size = byte - 191
+                elif byte == 253:
+                    size = int.from_bytes(key[offset:offset + 8], "big") ^ (flip and 2**64 - 1)
+                    offset += 8
+                else:
+                    raise ValueError
+                if offset + size > len(key):
+                    raise ValueError
+                term = int.from_bytes(key[offset:offset + size], "big") ^ (flip and 2**(8 * size) - 1)
+                offset += size
+            terms.append(term)
+            flip ^= 255
+        if offset != len(key) - 1 or not all(terms[1:]):
+            raise ValueError
+
+        # put the continued fraction back together, from the last term
+        numerator, denominator = terms.pop(), 1
+        for term in reversed(terms):
+            numerator, denominator = term * numerator + denominator, numerator
+        if numerator == 0:
+            raise ValueError
+        return Transreal(-numerator if kind == _KEY_NEGATIVE else numerator, denominator, approximate == 1)
+    except (IndexError, ValueError):
+        raise ValueError("Can't make a transreal number from the key {!r}!".format(key)) from None
+
+
+def register_sqlite():
+    """Make sqlite3 store transreal numbers as the keys encode_key gives, so that SQLite compares and indexes them in
+    the order given by sort_key (e.g. for range queries), and give back transreal numbers from columns declared as
+    TRANSREAL when connecting with detect_types=sqlite3.PARSE_DECLTYPES."""
+    import sqlite3
+    sqlite3.register_adapter(Transreal, encode_key)
+    sqlite3.register_converter("TRANSREAL", decode_key)
+
+
+
+# the biggest numerator or denominator a TransrealArray stores as an int64 (one less than the limit, so that negating
+# never overflows)
+_INT64_MAX = 2**63 - 1
+
+
+class TransrealArray:
+    """A one-dimensional array of transreal numbers, stored as NumPy arrays of numerators and denominators so that
+    arithmetic is done on every element at once. The numerators and denominators are int64 if they fit, otherwise
+    Python ints (object dtype). Transreal arrays are immutable, and need NumPy."""
+
+    # like TransrealAccumulator, the fractions are only put in lowest terms when they need to be (when they might not
+    # fit in an int64, or when they are looked at), as finding the greatest common divisors is the slowest part
+    __slots__ = ("_numerators", "_denominators", "_approximate", "_reduced")
+
+    # stop NumPy from trying to handle operators itself, so that the reflected operators below are used instead
+    __array_ufunc__ = None
+
+    def __init__(self, values=()):
+        """Create a transreal array from an iterable of numbers which can be made transreal."""
+        if numpy is None:
+            raise ImportError("TransrealArray needs NumPy!")
+        values = [_coerce(value) for value in values]
+        self._set(
+            _integer_array([value._numerator for value in values]),
+            _integer_array([value._denominator for value in values]),
+            numpy.array([value._approximate for value in values], dtype=bool),
+            True
+        )
+
+
+    @classmethod
+    def _from_arrays(cls, numerators, denominators, approximate, reduced=True):
+        """Create a transreal array from arrays of numerators and denominators (in lowest terms unless reduced is
+        False), with denominators which are not negative, and are only 0 for 1/0, -1/0 and 0/0. No checks are
+        performed!"""
+        self = object.__new__(cls)
+        self._set(numerators, denominators, approximate, reduced)
+        return self
+
+
+    def _set(self, numerators, denominators, approximate, reduced):
+        """Store the arrays, as int64 if everything fits, and stop them from being changed."""
+        if numerators.dtype != denominators.dtype:
+            numerators = numerators.astype(object)
+            denominators = denominators.astype(object)
+        if numerators.dtype == object:
+            # Python ints can grow without limit, so always keep them in lowest terms
+            if not reduced:
+                numerators, denominators = _reduce(numerators, denominators)
+                reduced = True
+            if _magnitude(numerators) <= _INT64_MAX and _magnitude(denominators) <= _INT64_MAX:
+                numerators = numerators.astype(numpy.int64)
+                denominators = denominators.astype(numpy.int64)
+        for array in (numerators, denominators, approximate):
+            array.setflags(write=False)
+        self._numerators = numerators
+        self._denominators = denominators
+        self._approximate = approximate
+        self._reduced = reduced
+
+
+    def _reduce(self):
+        """Put the fractions in lowest terms. This doesn't change the values, so transreal arrays are still
+        immutable."""
+        if not self._reduced:
+            self._set(*_reduce(self._numerators, self._denominators), self._approximate, True)
+
+
+    @classmethod
+    def from_floats(cls, values):
+        """Create a transreal array from floats (e.g. a NumPy float array), exactly, as Transreal does for a single
+        float. NaN becomes nullity."""
+        if numpy is None:
+            raise ImportError("TransrealArray needs NumPy!")
+        values = numpy.asarray(values, dtype=numpy.float64).ravel()
+        finite = numpy.isfinite(values)
+
+        # every finite float is an integer mantissa (of at most 53 bits) times a power of two
+        mantissas, exponents = numpy.frexp(numpy.where(finite, values, 0.0))
+        numerators = (mantissas * 2.0**53).astype(numpy.int64)
+        shifts = exponents.astype(numpy.int64) - 53
+
+        # take the trailing zeroes out of the mantissa, so that the fraction is in lowest terms
+        lowest_bits = numpy.where(numerators == 0, 1, numerators & -numerators)
+        trailing_zeroes = numpy.frexp(lowest_bits.astype(numpy.float64))[1].astype(numpy.int64) - 1
+        numerators >>= trailing_zeroes
+        shifts += trailing_zeroes
+        shifts[numerators == 0] = 0
+
+        # very big or very small floats need Python ints, which is slow, but rare
+        if numpy.any(finite & ((shifts > 62 - 53) | (shifts < -62))):
+            return cls(Transreal._from_float(value) if value == value else NULLITY for value in values.tolist())
+
+        whole = shifts >= 0
+        denominators = numpy.where(whole, 1, numpy.left_shift(1, numpy.where(whole, 0, -shifts)))
+        numerators = numpy.where(whole, numpy.left_shift(numerators, numpy.where(whole, shifts, 0)), numerators)
+
+        # infinity is 1/0, -infinity is -1/0 and NaN (nullity) is 0/0
+        infinite = numpy.isinf(values)
+        numerators = numpy.where(finite, numerators, numpy.where(infinite, numpy.sign(values), 0).astype(numpy.int64))
+        denominators = numpy.where(finite, denominators, 0)
+        return cls._from_arrays(numerators, denominators, numpy.zeros(len(values), dtype=bool))
+
+
+    @property
+    def numerators(self):
+        """The numerators of self, in lowest terms, as a (read-only) NumPy array."""
+        self._reduce()
+        return self._numerators
+
+
+    @property
+    def denominators(self):
+        """The denominators of self, in lowest terms, as a (read-only) NumPy array. Always 0 or positive."""
+        self._reduce()
+        return self._denominators
+
+
+    @property
+    def approximate(self):
+        """Whether each element of self is an approximation, as a (read-only) NumPy array."""
+        return self._approximate
+
+
+    def __abs__(self):
+        numerators = self._numerators
+        if _magnitude(numerators) > _INT64_MAX:
+            numerators = numerators.astype(object)
+        return TransrealArray._from_arrays(numpy.abs(numerators), self._denominators, self._approximate, self._reduced)
+
+
+    def __add__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        # if the denominators are the same, add the fractions simply, so that the denominators don't grow
+        numerators1, denominators1, numerators2, denominators2 = _cross_operands(self, other)
+        same = denominators1 == denominators2
+        numerators = numpy.where(
+            same, numerators1 + numerators2, numerators1 * denominators2 + numerators2 * denominators1)
+        denominators = numpy.where(same, denominators1, denominators1 * denominators2)
+        # the non-finite cases are rare, so work them out one at a time
+        return _finish(
+            numerators, denominators, self._approximate | other._approximate,
+            (self._denominators == 0) | (other._denominators == 0), operator.add, self, other
+        )
+
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+
+    def __floordiv__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return (self / other).floor()
+
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TransrealArray._from_arrays(
+                self._numerators[index], self._denominators[index], self._approximate[index], self._reduced)
+        return _element(self, index)
+
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+
+    # arrays compare element by element, so cannot be hashed
+    __hash__ = None
+
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield _element(self, index)
+
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+
+    def __len__(self):
+        return len(self._numerators)
+
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+
+    def __mul__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return _multiply(
+            self, other, other._numerators, other._denominators,
+            (self._denominators == 0) | (other._denominators == 0), operator.mul
+        )
+
+
+    def __ne__(self, other):
+        equal = self == other
+        if equal is NotImplemented:
+            return NotImplemented
+        return ~equal
+
+
+    def __neg__(self):
+        numerators = self._numerators
+        if _magnitude(numerators) > _INT64_MAX:
+            numerators = numerators.astype(object)
+        # negating zero gives an exact zero
+        return TransrealArray._from_arrays(
+            -numerators, self._denominators, self._approximate & (numerators != 0), self._reduced)
+
+
+    def __pos__(self):
+        return self
+
+
+    def __pow__(self, power, modulo=None):
+        if isinstance(power, TransrealArray) or modulo is not None:
+            # other powers are rare, so work them out one at a time
+            try:
+                power = self._operand(power)
+            except TypeError:
+                return NotImplemented
+            return TransrealArray(pow(base, exponent, modulo) for base, exponent in zip(self, power))
+
+        # if the power isn't transreal, try to make it transreal
+        try:
+            power = _coerce(_from_numpy(power))
+        except TypeError:
+            return NotImplemented
+
+        if power._kind or power._denominator != 1:
+            # fractional and non-finite powers involve roots, so work them out one at a time
+            return TransrealArray(element ** power for element in self)
+
+        numerators, denominators, approximate = self._numerators, self._denominators, self._approximate
+
+        # the power of zero is 1, except for zero and nullity, where it is nullity
+        if power._numerator == 0:
+            nonzero = numerators != 0
+            return TransrealArray._from_arrays(
+                nonzero.astype(numpy.int64), nonzero.astype(numpy.int64), numpy.zeros(len(self), dtype=bool))
+
+        # if the power is negative, invert the fractions (the inverse of zero is infinity) and make the power positive
+        reduced = self._reduced
+        if power._numerator < 0:
+            zero = (numerators == 0) & (denominators != 0)
+            numerators, denominators = (
+                numpy.where(zero, 1, numpy.sign(numerators) * denominators),
+                numpy.where(zero, 0, numpy.abs(numerators))
+            )
+            approximate = approximate & (numerators != 0) & (denominators != 0)
+            power = -power
+
+        if power._numerator == 1:
+            return TransrealArray._from_arrays(numerators, denominators, approximate, reduced)
+
+        # the powers of fractions in lowest terms are in lowest terms too (and the powers of 1/0 and 0/0 are
+        # themselves), so put them in lowest terms first if the powers might not fit in an int64
+        exponent = power._numerator
+        if numerators.dtype != object and not _power_fits(numerators, denominators, exponent):
+            numerators, denominators = _reduce(numerators, denominators)
+            reduced = True
+            if not _power_fits(numerators, denominators, exponent):
+                numerators = numerators.astype(object)
+                denominators = denominators.astype(object)
+        return TransrealArray._from_arrays(
+            numerators ** exponent, denominators ** exponent,
+            (approximate | power._approximate) & (denominators != 0), reduced
+        )
+
+
+    def __str__(self):
+        return "[" + ", ".join(str(element) for element in self) + "]"
+
+
+    __repr__ = __str__
+
+
+    def __sub__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        # if the denominators are the same, subtract the fractions simply, so that the denominators don't grow
+        numerators1, denominators1, numerators2, denominators2 = _cross_operands(self, other)
+        same = denominators1 == denominators2
+        numerators = numpy.where(
+            same, numerators1 - numerators2, numerators1 * denominators2 - numerators2 * denominators1)
+        denominators = numpy.where(same, denominators1, denominators1 * denominators2)
+        # subtracting zero gives an exact zero, so it doesn't make the result approximate
+        return _finish(
+            numerators, denominators, self._approximate | (other._approximate & (other._numerators != 0)),
+            (self._denominators == 0) | (other._denominators == 0), operator.sub, self, other
+        )
+
+
+    def __truediv__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        # multiply by the inverse of other, with a positive denominator (dividing by zero is rare, so it is worked
+        # out one at a time like the non-finite cases)
+        return _multiply(
+            self, other, numpy.sign(other._numerators) * other._denominators, numpy.abs(other._numerators),
+            (self._denominators == 0) | (other._denominators == 0) | (other._numerators == 0), operator.truediv
+        )
+
+
+    __radd__ = __add__
+
+
+    def __rfloordiv__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return other // self
+
+
+    __rmul__ = __mul__
+
+
+    def __rpow__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return other ** self
+
+
+    def __rsub__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return other - self
+
+
+    def __rtruediv__(self, other):
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        return other / self
+
+
+    def _compare(self, other, comparison):
+        """Compare self with other element by element, like the comparisons of single transreal numbers."""
+        # if other isn't a transreal array, try to make it one
+        try:
+            other = self._operand(other)
+        except TypeError:
+            return NotImplemented
+
+        numerators1, denominators1, numerators2, denominators2 = _cross_operands(self, other)
+        # infinity and -infinity have the same denominator, so must be compared by their numerators alone
+        compared = numpy.where(
+            denominators1 == denominators2,
+            comparison(numerators1, numerators2),
+            comparison(numerators1 * denominators2, numerators2 * denominators1)
+        ).astype(bool)
+
+        # nullity is only equal to itself
+        self_nullity = self.is_nullity()
+        other_nullity = other.is_nullity()
+        nullity = self_nullity | other_nullity
+        if comparison is operator.eq or comparison is operator.le or comparison is operator.ge:
+            return numpy.where(nullity, self_nullity & other_nullity, compared)
+        return compared & ~nullity
+
+
+    def _operand(self, other):
+        """Return other as a transreal array the same length as self. Raises a TypeError if this is not possible."""
+        if isinstance(other, TransrealArray):
+            if len(other) != len(self):
+                raise ValueError("Transreal arrays must be the same length!")
+            return other
+        other = _coerce(_from_numpy(other))
+        if abs(other._numerator) <= _INT64_MAX and other._denominator <= _INT64_MAX:
+            dtype = numpy.int64
+        else:
+            dtype = object
+        return TransrealArray._from_arrays(
+            numpy.full(len(self), other._numerator, dtype=dtype),
+            numpy.full(len(self), other._denominator, dtype=dtype),
+            numpy.full(len(self), other._approximate, dtype=bool)
+        )
+
+
+    def floor(self):
+        """Return the floor of (the largest integer value less than or equal to) each element of self."""
+        # non-finite numbers are left alone, as are whole numbers (as n // 1 is n)
+        return TransrealArray._from_arrays(
+            self._numerators // numpy.maximum(self._denominators, 1),
+            numpy.minimum(self._denominators, 1),
+            self._approximate
+        )
+
+
+    def is_finite(self):
+        """Returns a NumPy array which is True where self is finite."""
+        return self._denominators != 0
+
+
+    def is_infinity(self):
+        """Returns a NumPy array which is True where self is infinity."""
+        return (self._denominators == 0) & (self._numerators > 0)
+
+
+    def is_negative_infinity(self):
+        """Returns a NumPy array which is True where self is -infinity."""
+        return (self._denominators == 0) & (self._numerators < 0)
+
+
+    def is_nullity(self):
+        """Returns a NumPy array which is True where self is nullity."""
+        return (self._denominators == 0) & (self._numerators == 0)
+
+
+    def sign(self):
+        """Returns the sign of each element of self."""
+        return TransrealArray._from_arrays(
+            numpy.sign(self._numerators),
+            numpy.where(self.is_nullity(), 0, 1).astype(self._denominators.dtype),
+            numpy.zeros(len(self), dtype=bool)
+        )
+
+
+    def to_floats(self):
+        """Returns self as a NumPy float array, with nullity as NaN."""
+        if _magnitude(self._numerators) > 2**53 or _magnitude(self._denominators) > 2**53:
+            self._reduce()
+        if self._numerators.dtype != object and _magnitude(self._numerators) <= 2**53 and \
+                _magnitude(self._denominators) <= 2**53:
+            # converting to float is exact, so the division is rounded correctly, as it is for Python ints
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                return self._numerators.astype(numpy.float64) / self._denominators.astype(numpy.float64)
+        return numpy.array([
+            numerator / denominator if denominator else math.copysign(math.inf, numerator) if numerator else math.nan
+            for numerator, denominator in zip(self._numerators.tolist(), self._denominators.tolist())
+        ], dtype=numpy.float64)
+
+
+    def tolist(self):
+        """Returns self as a list of transreal numbers."""
+        return list(self)
+
+
+
+def _from_numpy(value):
+    """Convert NumPy integers and floats to Python ints and floats, so that they can be made transreal."""
+    if numpy is not None and isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+
+def _integer_array(values):
+    """Convert a list of ints to an int64 NumPy array if they fit, otherwise an object one."""
+    if all(-_INT64_MAX <= value <= _INT64_MAX for value in values):
+        return numpy.array(values, dtype=numpy.int64)
+    return numpy.array(values, dtype=object)
+
+
+def _magnitude(array):
+    """Return the biggest absolute value in a NumPy array of integers, as a Python int."""
+    if len(array) == 0:
+        return 0
+    return max(int(array.max()), -int(array.min()))
+
+
+def _power_fits(numerators, denominators, exponent):
+    """Return whether n**exponent and d**exponent definitely fit in an int64, without working them out if they are
+    too big."""
+    magnitude = max(_magnitude(numerators), _magnitude(denominators))
+    if magnitude <= 1:
+        return True
+    return (magnitude.bit_length() - 1) * exponent < 63 and magnitude ** exponent <= _INT64_MAX
+
+
+def _promote(*arrays):
+    """Return the arrays as object arrays if any of them are, otherwise as they are."""
+    if any(array.dtype == object for array in arrays):
+        return tuple(array.astype(object) for array in arrays)
+    return arrays
+
+
+def _cross_operands(array1, array2):
+    """Return the numerators and denominators of two transreal arrays, in lowest terms if cross-multiplying them
+    (n1*d2 + n2*d1 and d1*d2) might overflow an int64, and as object arrays if it still might."""
+    arrays = _promote(array1._numerators, array1._denominators, array2._numerators, array2._denominators)
+    if arrays[0].dtype != object and not _cross_fits(*arrays):
+        array1._reduce()
+        array2._reduce()
+        arrays = _promote(array1._numerators, array1._denominators, array2._numerators, array2._denominators)
+        if arrays[0].dtype != object and not _cross_fits(*arrays):
+            return tuple(array.astype(object) for array in arrays)
+    return arrays
+
+
+def _cross_fits(numerators1, denominators1, numerators2, denominators2):
+    """Return whether n1*d2 + n2*d1 and d1*d2 definitely fit in an int64."""
+    numerators1, denominators1, numerators2, denominators2 = (
+        _magnitude(array) for array in (numerators1, denominators1, numerators2, denominators2))
+    return numerators1 * denominators2 + numerators2 * denominators1 <= _INT64_MAX and \
+        denominators1 * denominators2 <= _INT64_MAX
+
+
+def _reduce(numerators, denominators):
+    """Put fractions in lowest terms (1/0, -1/0 and 0/0 are already in lowest terms)."""
+    common_factors = numpy.maximum(numpy.gcd(numerators, denominators), 1)
+    return numerators // common_factors, denominators // common_factors
+
+
+def _multiply(array1, array2, numerators2, denominators2, special, operation):
+    """Multiply the fractions of array1 by numerators2/denominators2 (the fractions of array2, or their inverses),
+    giving exact zeros where either numerator is zero."""
+    numerators1, denominators1, numerators2, denominators2 = _promote(
+        array1._numerators, array1._denominators, numerators2, denominators2)
+    if numerators1.dtype != object and not _product_fits(numerators1, denominators1, numerators2, denominators2):
+        # put the fractions in lowest terms first, in case that makes them small enough
+        numerators1, denominators1 = _reduce(numerators1, denominators1)
+        numerators2, denominators2 = _reduce(numerators2, denominators2)
+        if not _product_fits(numerators1, denominators1, numerators2, denominators2):
+            numerators1, denominators1, numerators2, denominators2 = (
+                array.astype(object) for array in (numerators1, denominators1, numerators2, denominators2))
+    zero = (numerators1 == 0) | (numerators2 == 0)
+    return _finish(
+        numerators1 * numerators2,
+        numpy.where(zero, 1, denominators1 * denominators2),
+        (array1._approximate | array2._approximate) & ~zero,
+        special, operation, array1, array2
+    )
+
+
+def _product_fits(numerators1, denominators1, numerators2, denominators2):
+    """Return whether n1*n2 and d1*d2 definitely fit in an int64."""
+    return _magnitude(numerators1) * _magnitude(numerators2) <= _INT64_MAX and \
+        _magnitude(denominators1) * _magnitude(denominators2) <= _INT64_MAX
+
+
+def _finish(numerators, denominators, approximate, special, operation, array1, array2):
+    """Make a transreal array from the (not necessarily reduced) results of an operation on two transreal arrays,
+    working out the elements where special is True one at a time, with the operation on single transreal numbers."""
+    if special.any():
+        indices = numpy.flatnonzero(special).tolist()
+        results = [_coerce(operation(_element(array1, index), _element(array2, index))) for index in indices]
+        # make sure the arrays can be written to, and can hold the results
+        if numerators.dtype != object and any(
+                abs(result._numerator) > _INT64_MAX or result._denominator > _INT64_MAX for result in results):
+            numerators = numerators.astype(object)
+            denominators = denominators.astype(object)
+        else:
+            numerators = numerators.copy()
+            denominators = denominators.copy()
+        approximate = approximate.copy()
+        for index, result in zip(indices, results):
+            numerators[index] = result._numerator
+            denominators[index] = result._denominator
+            approximate[index] = result._approximate
+    return TransrealArray._from_arrays(numerators, denominators, approximate, False)
+
+
+def _element(array, index):
+    """Return an element of a transreal array as a transreal number."""
+    numerator = int(array._numerators[index])
+    denominator = int(array._denominators[index])
+    if denominator == 0:
+        return Transreal(numerator, 0)
+    if array._reduced:
+        return Transreal._from_normalized(numerator, denominator, bool(array._approximate[index]))
+    return Transreal(numerator, denominator, bool(array._approximate[index]))
+
+
+
+class TransrealMatrix:
+    """A matrix of transreal numbers. Transreal matrices are immutable."""
+
+    # matrices of finite numbers are eliminated with fraction-free (Bareiss) elimination: each row is multiplied up to
+    # whole numbers, and every division in the elimination is exact, so nothing needs putting in lowest terms until
+    # the end. solve and inverse follow Cramer's rule (x = adj(A)b / det(A)), so a singular matrix gives infinities
+    # and nullity rather than failing. Matrices (and vectors) with non-finite numbers are eliminated in transreal
+    # arithmetic instead.
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows):
+        """Create a transreal matrix from an iterable of rows, each an iterable of numbers which can be made
+        transreal."""
+        self._rows = tuple(tuple(_coerce(value) for value in row) for row in rows)
+        if any(len(row) != len(self._rows[0]) for row in self._rows):
+            raise ValueError("The rows of a matrix must all be the same length!")
+
+
+    @classmethod
+    def identity(cls, size):
+        """Return the size by size identity matrix."""
+        return cls([[int(row == column) for column in range(size)] for row in range(size)])
+
+
+    @property
+    def shape(self):
+        """The number of rows and columns of self."""
+        return (len(self._rows), len(self._rows[0]) if self._rows else 0)
+
+
+    def __eq__(self, other):
+        if not isinstance(other, TransrealMatrix):
+            return NotImplemented
+        return self._rows == other._rows
+
+
+    def __getitem__(self, index):
+        # matrix[row, column] is an element, and matrix[row] is a row
+        if isinstance(index, tuple):
+            row, column = index
+            return self._rows[row][column]
+        return self._rows[index]
+
+
+    def __hash__(self):
+        return hash(self._rows)
+
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+    def __len__(self):
+        return len(self._rows)
+
+
+    def __matmul__(self, other):
+        if not isinstance(other, TransrealMatrix):
+            return NotImplemented
+        if self.shape[1] != other.shape[0]:
+            raise ValueError("The number of columns of the first matrix must match the number of rows of the second!")
+
+        columns = list(zip(*other._rows))
+        if not (self._is_finite() and other._is_finite()):
+            # infinity and nullity need transreal arithmetic
+            return TransrealMatrix([[sum(a * b for a, b in zip(row, column)) for column in columns]
+                                    for row in self._rows])
+
+        # multiply the rows of self and the columns of other up to whole numbers, so that each element of the product
+        # is a sum of products of ints, which is only put in lowest terms once
+        row_scales, integer_rows = _integer_rows(self._rows)
+        column_scales, integer_columns = _integer_rows(columns)
+        product = [
+            [builtins.sum(map(operator.mul, integer_row, integer_column)) for integer_column in integer_columns]
+            for integer_row in integer_rows
+        ]
+
+        # an element is approximate if any of its (non-zero) products are
+        if self._is_approximate() or other._is_approximate():
+            return TransrealMatrix([
+                [Transreal(element, row_scale * column_scale, any(
+                    (a._approximate or b._approximate) and a._numerator and b._numerator for a, b in zip(row, column)))
+                 for element, column, column_scale in zip(elements, columns, column_scales)]
+                for elements, row, row_scale in zip(product, self._rows, row_scales)
+            ])
+        return TransrealMatrix([
+            [Transreal(element, row_scale * column_scale) for element, column_scale in zip(elements, column_scales)]
+            for elements, row_scale in zip(product, row_scales)
+        ])
+
+
+    def __str__(self):
+        return "[" + ", ".join("[" + ", ".join(str(value) for value in row) + "]" for row in self._rows) + "]"
+
+
+    __repr__ = __str__
+
+
+    def _adjugate(self):
+        """Return the adjugate (the transpose of the matrix of cofactors) of a square matrix of finite numbers, and
+        its determinant, as a list of lists of transreal numbers and a transreal number."""
+        size = len(self._rows)
+        approximate = self._is_approximate()
+        scales, integer_rows = _integer_rows(self._rows)
+        # multiplying every row by its scale multiplies the determinant by all the scales
+        scale = 1
+        for row_scale in scales:
+            scale *= row_scale
+
+        # solving B X = diag(scales), where B is self with its rows multiplied by their scales, gives the inverse
+        augmented = [row + [0] * size for row in integer_rows]
+        for index, row_scale in enumerate(scales):
+            augmented[index][size + index] = row_scale
+        pivots, sign = _bareiss(augmented, size)
+        if len(pivots) == size:
+            # the last pivot is det(B), so adj(self) = det(self) X = sign * det(B) X / scale
+            solution, determinant = _back_substitute(augmented, size)
+            return (
+                [[Transreal(sign * element, scale, approximate) for element in row] for row in solution],
+                Transreal(sign * determinant, scale, approximate)
+            )
+
+        zero = Transreal(0, 1, approximate)
+        if len(pivots) < size - 1:
+            # every (size - 1) by (size - 1) minor is zero, so the adjugate is too
+            return [[zero] * size for row in range(size)], zero
+
+        # if the rank is size - 1, the adjugate is c u v^T, where self u = 0 and v^T self = 0, and c is the cofactor
+        # for the row where v is 1 and the column where u is 1
+        u, column = _kernel_vector(integer_rows, _bareiss(integer_rows, size, True)[0], size)
+        transpose = _integer_rows(list(zip(*self._rows)))[1]
+        v, row = _kernel_vector(transpose, _bareiss(transpose, size, True)[0], size)
+        minor = TransrealMatrix(
+            [values[:column] + values[column + 1:] for index, values in enumerate(self._rows) if index != row])
+        c = minor.determinant() * (-1) ** (row + column)
+        return [[_approximate_if(c * u_i * v_j, approximate) for v_j in v] for u_i in u], zero
+
+
+    def _is_approximate(self):
+        """Return whether any of the elements of self are approximate."""
+        return any(value._approximate for row in self._rows for value in row)
+
+
+    def _is_finite(self):
+        """Return whether all of the elements of self are finite."""
+        return not any(value._kind for row in self._rows for value in row)
+
+
+    def _square_size(self):
+        """Return the number of rows of self, raising a ValueError if self isn't square."""
+        rows, columns = self.shape
+        if rows != columns:
+            raise ValueError("The matrix must be square!")
+        return rows
+
+
+    def determinant(self):
+        """Return the determinant of self, which must be square. It is approximate if any element of self is."""
+        size = self._square_size()
+        if not self._is_finite():
+            rows = [list(row) for row in self._rows]
+            return _transreal_gauss_jordan(rows, size)
+
+        scales, integer_rows = _integer_rows(self._rows)
+        pivots, sign = _bareiss(integer_rows, size)
+        scale = 1
+        for row_scale in scales:
+            scale *= row_scale
+        # the last pivot of fraction-free elimination is the determinant (after any row swaps)
+        determinant = sign * integer_rows[-1][-1] if len(pivots) == size and size else int(size == 0)
+        return Transreal(determinant, scale, self._is_approximate())
+
+
+    def inverse(self):
+        """Return the inverse of self, which must be square. The inverse of a singular matrix is its adjugate divided
+        by 0, so its elements are infinity, -infinity or nullity."""
+        size = self._square_size()
+        if not self._is_finite():
+            rows = [list(row) + list(identity) for row, identity in zip(self._rows, TransrealMatrix.identity(size))]
+            _transreal_gauss_jordan(rows, size)
+            return TransrealMatrix([[value / row[index] for value in row[size:]] for index, row in enumerate(rows)])
+
+        adjugate, determinant = self._adjugate()
+        return TransrealMatrix([[value / determinant for value in row] for row in adjugate])
+
+
+    def rank(self):
+        """Return the rank of self, which must only have finite elements."""
+        if not self._is_finite():
+            raise ValueError("The rank of a matrix with non-finite elements is not defined!")
+        return len(_bareiss(_integer_rows(self._rows)[1], self.shape[1])[0])
+
+
+    def solve(self, vector):
+        """Return the x (as a list of transreal numbers) for which self @ x = vector, where self is square. For finite
+        numbers this is adj(self) @ vector / det(self), so if self is singular the elements of x are infinity, -infinity
+        or nullity."""
+        size = self._square_size()
+        vector = [_coerce(value) for value in vector]
+        if len(vector) != size:
+            raise ValueError("The vector must be as long as the matrix is wide!")
+
+        if not (self._is_finite() and all(value._kind == _FINITE for value in vector)):
+            rows = [list(row) + [value] for row, value in zip(self._rows, vector)]
+            _transreal_gauss_jordan(rows, size)
+            return [row[size] / row[index] for index, row in enumerate(rows)]
+
+        # the scale of each row can include the denominator of the vector's element too
+        scales, integer_rows = _integer_rows([row + (value,) for row, value in zip(self._rows, vector)])
+        if len(_bareiss(integer_rows, size)[0]) == size:
+            solution, determinant = _back_substitute(integer_rows, size)
+            approximate = self._is_approximate() or any(value._approximate for value in vector)
+            return [Transreal(row[0], determinant, approximate) for row in solution]
+
+        adjugate, determinant = self._adjugate()
+        return [sum(a * b for a, b in zip(row, vector)) / determinant for row in adjugate]
+
+
+    def transpose(self):
+        """Return the transpose of self."""
+        return TransrealMatrix(zip(*self._rows))
+
+
+
+def _integer_rows(rows):
+    """Multiply each row of finite transreal numbers by the lowest common multiple of its denominators, returning the
+    multipliers and the rows (as lists of ints)."""
+    scales = []
+    integer_rows = []
+    for row in rows:
+        scale = 1
+        for value in row:
+            if scale % value._denominator:
+                scale = scale // gcd(scale, value._denominator) * value._denominator
+        scales.append(scale)
+        integer_rows.append([value._numerator * (scale // value._denominator) for value in row])
+    return scales, integer_rows
+
+
+def _bareiss(matrix, width, above=False):
+    """Fraction-free (Bareiss) elimination of a list of lists of ints, in place, using pivots from the first width
+    columns. If above is True, the rows above each pivot are eliminated too, and every pivot ends up the same. Every
+    division is exact, so the elements stay ints. Returns the pivot columns (one per row, in order) and the sign of
+    the row swaps."""
+    previous = 1
+    sign = 1
+    pivots = []
+    for column in range(width):
+        row = len(pivots)
+        pivot_row = next((index for index in range(row, len(matrix)) if matrix[index][column]), None)
+        if pivot_row is None:
+            continue
+        if pivot_row != row:
+            matrix[row], matrix[pivot_row] = matrix[pivot_row], matrix[row]
+            sign = -sign
+
+        pivot_values = matrix[row]
+        pivot = pivot_values[column]
+        for index in range(0 if above else row + 1, len(matrix)):
+            if index == row:
+                continue
+            values = matrix[index]
+            factor = values[column]
+            # the elements before the pivot column are zero below the pivot, so they can be skipped
+            start = 0 if above else column
+            values[start:] = [
+                (pivot * value - factor * pivot_value) // previous
+                for value, pivot_value in zip(values[start:], pivot_values[start:])
+            ]
+        previous = pivot
+        pivots.append(column)
+    return pivots, sign
+
+
+def _back_substitute(matrix, size):
+    """Return D X (as a list of lists of ints) and D, where A X = C, from [A | C] after fraction-free elimination, where
+    A is size by size and has full rank, and D is the last pivot. Every division is exact, as D X is adj(A) C up to
+    sign."""
+    determinant = matrix[size - 1][size - 1] if size else 1
+    solution = [None] * size
+    for index in reversed(range(size)):
+        values = matrix[index]
+        later = list(zip(values[index + 1:size], solution[index + 1:]))
+        pivot = values[index]
+        solution[index] = [
+            (determinant * value - builtins.sum(coefficient * row[column] for coefficient, row in later)) // pivot
+            for column, value in enumerate(values[size:])
+        ]
+    return solution, determinant
+
+
+def _kernel_vector(matrix, pivots, width):
+    """Return a non-zero x (as a list of transreal numbers) for which A x = 0, where A has rank width - 1, from A after
+    Gauss-Jordan fraction-free elimination and its pivot columns, along with the index of an element of x which is
+    1."""
+    free = next(column for column in range(width) if column not in pivots)
+    vector = [Transreal(0)] * width
+    vector[free] = Transreal(1)
+    for values, column in zip(matrix, pivots):
+        # every pivot is the same after Gauss-Jordan fraction-free elimination
+        vector[column] = Transreal(-values[free], values[column])
+    return vector, free
+
+
+def _approximate_if(value, approximate):
+    """Return the finite transreal number value, marked as approximate if approximate is True."""
+    if approximate and not value._approximate:
+        return Transreal._from_normalized(value._numerator, value._denominator, True)
+    return value
+
+
+def _transreal_gauss_jordan(rows, width):
+    """Gauss-Jordan elimination of a list of lists of transreal numbers, in place and in transreal arithmetic, using
+    pivots from the first width columns. A column with nothing to pivot on is left with a zero on the diagonal.
+    Returns the determinant of the first width columns (the product of the diagonal, after any row swaps)."""
+    determinant = Transreal(1)
+    for column in range(width):
+        pivot_row = next((index for index in range(column, len(rows)) if rows[index][column] != 0), None)
+        if pivot_row is None:
+            determinant *= 0
+            continue
+        if pivot_row != column:
+            rows[column], rows[pivot_row] = rows[pivot_row], rows[column]
+            determinant = -determinant
+
+        pivot_values = rows[column]
+        pivot = pivot_values[column]
+        determinant *= pivot
+        for index, values in enumerate(rows):
+            if index != column and values[column] != 0:
+                factor = values[column] / pivot
+                rows[index] = [value - factor * pivot_value for value, pivot_value in zip(values, pivot_values)]
+    return determinant
+
+
+
+# polynomials shorter than this are multiplied term by term, and longer ones by Kronecker substitution
+_KRONECKER_LENGTH = 32
+
+
+class TransrealPolynomial:
+    """A polynomial with transreal coefficients. Transreal polynomials are immutable."""
+
+    # coefficients are lowest degree first. If they are all finite, they are also kept as ints over one common
+    # denominator, so that evaluation (Horner's method) and multiplication can be done with ints, only putting the
+    # result in lowest terms once
+    __slots__ = ("_coefficients", "_numerators", "_denominator")
+
+    def __init__(self, coefficients=()):
+        """Create a transreal polynomial from an iterable of numbers which can be made transreal, lowest degree first
+        (so [1, 0, 3] is 3x^2 + 1)."""
+        coefficients = [_coerce(coefficient) for coefficient in coefficients]
+        while coefficients and coefficients[-1] == 0:
+            coefficients.pop()
+        self._coefficients = tuple(coefficients)
+        if any(coefficient._kind for coefficient in coefficients):
+            self._numerators = None
+            self._denominator = None
+        else:
+            self._denominator, self._numerators = _common_denominator(coefficients)
+
+
+    @property
+    def coefficients(self):
+        """The coefficients of self, lowest degree first, with no trailing zeroes."""
+        return self._coefficients
+
+
+    @property
+    def degree(self):
+        """The degree of self, or -1 if self is the zero polynomial."""
+        return len(self._coefficients) - 1
+
+
+    def __add__(self, other):
+        # if other isn't a transreal polynomial, try to make it one
+        try:
+            other = _polynomial(other)
+        except TypeError:
+            return NotImplemented
+
+        zero = Transreal(0)
+        return TransrealPolynomial(
+            a + b for a, b in itertools.zip_longest(self._coefficients, other._coefficients, fillvalue=zero))
+
+
+    def __call__(self, point):
+        """Return the value of self at point, which is the value Horner's method gives in transreal arithmetic."""
+        point = _coerce(point)
+        coefficients = self._coefficients
+        if not coefficients:
+            return Transreal(0)
+
+        if self._numerators is None or point._kind:
+            # infinity and nullity need transreal arithmetic
+            value = coefficients[-1]
+            for coefficient in reversed(coefficients[:-1]):
+                value = value * point + coefficient
+            return value
+
+        # with the point as n/d and the coefficients as c/D, Horner's method is done on c * d^k, so that everything is
+        # over the common denominator D * d^degree
+        numerator = point._numerator
+        denominator = point._denominator
+        numerators = self._numerators
+        total = numerators[-1]
+        scale = 1
+        if not (point._approximate or any(coefficient._approximate for coefficient in coefficients)):
+            for coefficient_numerator in reversed(numerators[:-1]):
+                scale *= denominator
+                total = total * numerator + coefficient_numerator * scale
+            return Transreal(total, self._denominator * scale)
+
+        approximate = coefficients[-1]._approximate
+        for coefficient, coefficient_numerator in zip(reversed(coefficients[:-1]), reversed(numerators[:-1])):
+            # multiplying by zero is exact
+            approximate = ((approximate or point._approximate) and total != 0 and numerator != 0) or \
+                coefficient._approximate
+            scale *= denominator
+            total = total * numerator + coefficient_numerator * scale
+        return Transreal(total, self._denominator * scale, approximate)
+
+
+    def __eq__(self, other):
+        if not isinstance(other, TransrealPolynomial):
+            return NotImplemented
+        return self._coefficients == other._coefficients
+
+
+    def __hash__(self):
+        return hash(self._coefficients)
+
+
+    def __mul__(self, other):
+        # if other isn't a transreal polynomial, try to make it one
+        try:
+            other = _polynomial(other)
+        except TypeError:
+            return NotImplemented
+
+        coefficients1 = self._coefficients
+        coefficients2 = other._coefficients
+        if not (coefficients1 and coefficients2):
+            return TransrealPolynomial()
+        if self._numerators is None or other._numerators is None:
+            # infinity and nullity need transreal arithmetic
+            return TransrealPolynomial(
+                sum(coefficients1[index] * coefficients2[power - index]
+                    for index in range(max(0, power - len(coefficients2) + 1), min(power, len(coefficients1) - 1) + 1))
+                for power in range(len(coefficients1) + len(coefficients2) - 1)
+            )
+
+        numerators = _multiply_coefficients(self._numerators, other._numerators)
+        denominator = self._denominator * other._denominator
+        if not any(coefficient._approximate for coefficient in coefficients1 + coefficients2):
+            return TransrealPolynomial(Transreal(numerator, denominator) for numerator in numerators)
+
+        # a coefficient of the product is approximate if any of the (non-zero) products adding up to it are
+        approximate = [False] * len(numerators)
+        for index1, coefficient1 in enumerate(coefficients1):
+            for index2, coefficient2 in enumerate(coefficients2):
+                if (coefficient1._approximate or coefficient2._approximate) and coefficient1 != 0 and coefficient2 != 0:
+                    approximate[index1 + index2] = True
+        return TransrealPolynomial(
+            Transreal(numerator, denominator, flag) for numerator, flag in zip(numerators, approximate))
+
+
+    def __neg__(self):
+        return TransrealPolynomial(-coefficient for coefficient in self._coefficients)
+
+
+    def __radd__(self, other):
+        return self + other
+
+
+    def __rmul__(self, other):
+        return self * other
+
+
+    def __rsub__(self, other):
+        return -self + other
+
+
+    def __str__(self):
+        terms = []
+        for power, coefficient in reversed(list(enumerate(self._coefficients))):
+            if coefficient == 0:
+                continue
+            elif power == 0:
+                terms.append(str(coefficient))
+            elif power == 1:
+                terms.append("{}x".format(coefficient))
+            else:
+                terms.append("{}x^{}".format(coefficient, power))
+        return " + ".join(terms) or "0"
+
+
+    __repr__ = __str__
+
+
+    def __sub__(self, other):
+        # if other isn't a transreal polynomial, try to make it one
+        try:
+            other = _polynomial(other)
+        except TypeError:
+            return NotImplemented
+
+        return self + -other
+
+
+    def derivative(self):
+        """Return the derivative of self."""
+        return TransrealPolynomial(
+            coefficient * power for power, coefficient in enumerate(self._coefficients) if power)
+
+
+    def evaluate(self, points):
+        """Return the values of self at each of points, as a transreal array if points is one (which is done on every
+        point at once), otherwise as a list."""
+        if not isinstance(points, TransrealArray):
+            return [self(point) for point in points]
+
+        coefficients = self._coefficients
+        length = len(points._numerators)
+        if self._numerators is None or len(coefficients) < 2:
+            # constants, and coefficients which aren't finite, are worked out one point at a time
+            return TransrealArray(self(_element(points, index)) for index in range(length))
+
+        # infinity and nullity are worked out afterwards, one at a time
+        special = points._denominators == 0
+        degree = len(coefficients) - 1
+        if not _horner_fits(self._numerators, self._denominator, points._numerators, points._denominators, degree):
+            points._reduce()
+        numerators = numpy.where(special, 0, points._numerators)
+        denominators = numpy.where(special, 1, points._denominators)
+        if numerators.dtype != object and not _horner_fits(
+                self._numerators, self._denominator, numerators, denominators, degree):
+            numerators = numerators.astype(object)
+            denominators = denominators.astype(object)
+
+        # the same as for a single point, but on every point at once
+        total = numpy.full(length, self._numerators[-1], dtype=numerators.dtype)
+        scale = numpy.ones(length, dtype=numerators.dtype)
+        approximate = numpy.full(length, coefficients[-1]._approximate)
+        track_approximate = points._approximate.any() or any(coefficient._approximate for coefficient in coefficients)
+        for coefficient, coefficient_numerator in zip(reversed(coefficients[:-1]), reversed(self._numerators[:-1])):
+            if track_approximate:
+                approximate = ((approximate | points._approximate) & (total != 0) & (numerators != 0)) | \
+                    coefficient._approximate
+            scale = scale * denominators
+            total = total * numerators + coefficient_numerator * scale
+        return _finish(
+            total, scale * self._denominator, approximate, special, lambda point, unused: self(point), points, points)
+
+
+
+def _polynomial(value):
+    """Return value as a transreal polynomial, raising a TypeError if it can't be made into one."""
+    if isinstance(value, TransrealPolynomial):
+        return value
+    return TransrealPolynomial([_coerce(value)])
+
+
+def _common_denominator(values):
+    """Return the lowest common multiple of the denominators of finite transreal numbers, and their numerators over
+    it."""
+    denominator = 1
+    for value in values:
+        if denominator % value._denominator:
+            denominator = denominator // gcd(denominator, value._denominator) * value._denominator
+    return denominator, [value._numerator * (denominator // value._denominator) for value in values]
+
+
+def _horner_fits(coefficients, denominator, numerators, denominators, degree):
+    """Return whether Horner's method with int coefficients over denominator, at the points numerators/denominators,
+    definitely fits in an int64."""
+    magnitude = max(_magnitude(numerators), _magnitude(denominators), 1)
+    biggest = max(abs(coefficient) for coefficient in coefficients)
+    if (magnitude.bit_length() - 1) * degree >= 63:
+        return False
+    return biggest * (degree + 1) * magnitude ** degree <= _INT64_MAX and \
+        denominator * _magnitude(denominators) ** degree <= _INT64_MAX
+
+
+def _multiply_coefficients(coefficients1, coefficients2):
+    """Multiply two polynomials with int coefficients (lowest degree first). Long polynomials are packed into one
+    big int each (Kronecker substitution), so that Python's Karatsuba multiplication of big ints does the work."""
+    if min(len(coefficients1), len(coefficients2)) < _KRONECKER_LENGTH:
+        product = [0] * (len(coefficients1) + len(coefficients2) - 1)
+        for index1, coefficient1 in enumerate(coefficients1):
+            if coefficient1:
+                for index2, coefficient2 in enumerate(coefficients2):
+                    product[index1 + index2] += coefficient1 * coefficient2
+        return product
+
+    # each coefficient of the product gets enough whole bytes to hold it, with its sign
+    bits = max(abs(coefficient) for coefficient in coefficients1).bit_length() + \
+        max(abs(coefficient) for coefficient in coefficients2).bit_length() + \
+        min(len(coefficients1), len(coefficients2)).bit_length() + 1
+    size = (bits + 7) // 8
+    packed = _pack(coefficients1, size) * _pack(coefficients2, size)
+
+    # the coefficients were packed as unsigned bytes, so a negative one borrows from the one above it. There is a
+    # block for every coefficient (and a spare), even when the top ones are zero, so that a negative product is
+    # sign-extended all the way up
+    length = len(coefficients1) + len(coefficients2) - 1
+    data = packed.to_bytes((length + 1) * size, "little", signed=True)
+    base = 1 << (8 * size)
+    half = base >> 1
+    product = []
+    carry = 0
+    for index in range(length):
+        value = int.from_bytes(data[index * size:(index + 1) * size], "little") + carry
+        carry, value = divmod(value, base)
+        if value >= half:
+            value -= base
+            carry += 1
+        product.append(value)
+    return product
+
+
+def _pack(coefficients, size):
+    """Return the value of a polynomial with int coefficients at 256^size, where every coefficient fits in size bytes
+    with its sign."""
+    positive = b"".join(max(coefficient, 0).to_bytes(size, "little") for coefficient in coefficients)
+    negative = b"".join(max(-coefficient, 0).to_bytes(size, "little") for coefficient in coefficients)
+    return int.from_bytes(positive, "little") - int.from_bytes(negative, "little")
+
+
+
+class Transcomplex:
+    """A transcomplex number. A transcomplex number is a polar vector of two transreal parts. Finite transcomplex
+    numbers can also be held in cartesian form, as exact real and imaginary parts, so that adding them up needs no
+    trigonometry. Each form is only worked out from the other when it is needed, and then kept."""
+
+    # either form is None until it is needed, and only finite transcomplex numbers are ever held in cartesian form
+    __slots__ = ("_magnitude", "_angle", "_real", "_imaginary")
+
+    def __init__(self, *args):
+        """Create a transcomplex number from a magnitude and an angle (anything which Transreal accepts), or from a
+        complex number, a transcomplex number, or a transreal number (with an angle of 0). Raises a TypeError for
+        anything else."""
+        if _instrumented:
+            _count_construction("Transcomplex")
+        if len(args) == 1:
+            value = args[0]
+            if isinstance(value, Transcomplex):
+                # already checked, so there is nothing to do except copy it (with whichever forms it has)
+                self._magnitude = value._magnitude
+                self._angle = value._angle
+                self._real = value._real
+                self._imaginary = value._imaginary
+                return
+            if isinstance(value, complex):
+                # a complex number is already in cartesian form, which can be kept exactly
+                self._set_cartesian(_complex_part(value.real), _complex_part(value.imag))
+                return
+            magnitude, angle = value, 0
+        elif len(args) == 2:
+            magnitude, angle = args
+        else:
+            raise TypeError("Transcomplex takes a magnitude and an angle, or a single (trans)complex number, not {} "
+                            "arguments".format(len(args)))
+
+        # convert both parts to transreal numbers once, so that the arithmetic doesn't have to
+        self._set_polar(_coerce(magnitude), _coerce(angle))
+
+
+    @classmethod
+    def from_cartesian(cls, real, imaginary):
+        """Create a transcomplex number from its real and imaginary parts (anything which Transreal accepts). Raises a
+        TypeError for anything else."""
+        if _instrumented:
+            _count_construction("Transcomplex")
+        self = object.__new__(cls)
+        self._set_cartesian(_coerce(real), _coerce(imaginary))
+        return self
+
+
+    @classmethod
+    def _from_cartesian(cls, real, imaginary):
+        """Create a transcomplex number from finite transreal real and imaginary parts. No checks are performed!"""
+        if _instrumented:
+            _count_construction("Transcomplex")
+        self = object.__new__(cls)
+        self._magnitude = self._angle = None
+        self._real = real
+        self._imaginary = imaginary
+        return self
+
+
+    def _set_polar(self, magnitude, angle):
+        """Set the magnitude and angle (transreal numbers), following the conventions for nullity and zero."""
+        self._real = self._imaginary = None
+        self._magnitude = magnitude
+        self._angle = angle
+
+        # the point at nullity is (nullity, 0), and any transcomplex number with an angle of infinity or -infinity is
+        # the point at nullity
+        if self._check_nullity():
+            return
+        if angle._kind:
+            self._magnitude = NULLITY
+            self._angle = _ZERO
+        # any transcomplex number of magnitude zero is the point at zero (mag 0 ang 0)
+        elif not magnitude._kind and not magnitude._numerator:
+            self._angle = _ZERO
+
+
+    def _set_cartesian(self, real, imaginary):
+        """Set the real and imaginary parts (transreal numbers). If either isn't finite, the transcomplex number isn't
+        either, so it is held in polar form instead."""
+        if real is NULLITY or imaginary is NULLITY:
+            self._set_polar(NULLITY, _ZERO)
+        elif real._kind or imaginary._kind:
+            # infinite, in the direction the parts point in (e.g. at an angle of pi/4 for infinity + infinity i)
+            self._set_polar(INFINITY, _angle_of(real, imaginary))
+        else:
+            self._magnitude = self._angle = None
+            self._real = real
+            self._imaginary = imaginary
+
+
+    @property
+    def magnitude(self):
+        """The magnitude, as a transreal number."""
+        if self._magnitude is None:
+            self._polar_from_cartesian()
+        return self._magnitude
+
+
+    @magnitude.setter
+    def magnitude(self, magnitude):
+        self._angle = self.angle
+        self._magnitude = magnitude
+        self._real = self._imaginary = None
+
+
+    @property
+    def angle(self):
+        """The angle, as a transreal number."""
+        if self._angle is None:
+            self._polar_from_cartesian()
+        return self._angle
+
+
+    @angle.setter
+    def angle(self, angle):
+        self._magnitude = self.magnitude
+        self._angle = angle
+        self._real = self._imaginary = None
+
+
+    @property
+    def real(self):
+        """The real part, as a transreal number. For infinite transcomplex numbers this is the magnitude times the
+        cosine of the angle (so infinity, -infinity or nullity), and for the point at nullity it is nullity."""
+        if self._real is None:
+            if _kind_of(self._magnitude):
+                if _instrumented:
+                    _count_trigonometric("math.cos")
+                return self._magnitude * _inexact(math.cos(float(self._angle)))
+            self._cartesian_from_polar()
+        return self._real
+
+
+    @property
+    def imaginary(self):
+        """The imaginary part, as a transreal number. For infinite transcomplex numbers this is the magnitude times the
+        sine of the angle (so infinity, -infinity or nullity), and for the point at nullity it is nullity."""
+        if self._imaginary is None:
+            if _kind_of(self._magnitude):
+                if _instrumented:
+                    _count_trigonometric("math.sin")
+                return self._magnitude * _inexact(math.sin(float(self._angle)))
+            self._cartesian_from_polar()
+        return self._imaginary
+
+
+    def _polar_from_cartesian(self):
+        """Work out (and keep) the polar form from the cartesian form. The magnitude is exact if it is rational (and
+        otherwise as precise as a float), and the angle is exact if it is 0."""
+        real, imaginary = self._real, self._imaginary
+        squared = real * real + imaginary * imaginary
+        numerator = _integer_root(squared._numerator, 2)
+        denominator = _integer_root(squared._denominator, 2)
+        if numerator * numerator == squared._numerator and denominator * denominator == squared._denominator:
+            self._magnitude = Transreal._from_normalized(numerator, denominator, squared._approximate)
+        else:
+            if _instrumented:
+                _count_trigonometric("math.hypot")
+            magnitude = math.hypot(_float_of(real), _float_of(imaginary))
+            if 0 < magnitude < math.inf:
+                self._magnitude = _inexact(magnitude)
+            else:
+                # too big or small for a float, so take the root to enough decimal places to be as precise as one
+                digits = (squared._denominator.bit_length() - squared._numerator.bit_length()) * 3 // 20
+                self._magnitude = squared.root(2, 17 + max(digits, 0))
+        self._angle = _angle_of(real, imaginary)
+
+
+    def _cartesian_from_polar(self):
+        """Work out (and keep) the cartesian form of a finite transcomplex number from the polar form. The parts are
+        exact if the angle is 0."""
+        magnitude, angle = self._magnitude, self._angle
+        if angle == 0:
+            self._real, self._imaginary = magnitude, _ZERO
+        else:
+            angle = float(angle)
+            if _instrumented:
+                _count_trigonometric("math.cos")
+                _count_trigonometric("math.sin")
+            self._real = magnitude * _inexact(math.cos(angle))
+            self._imaginary = magnitude * _inexact(math.sin(angle))
+
+
+    def _is_finite(self):
+        """Return whether the magnitude is finite, without working out the polar form to find out."""
+        return self._real is not None or not _kind_of(self._magnitude)
+
+
+    def __mul__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__mul__", Transcomplex.__mul__, self, other)
+        # check that other is transcomplex
+
+        try:
+            other = _coerce_transcomplex(other)
+        except TypeError:
+            return NotImplemented
+
+        magnitude = self.magnitude*other.magnitude
+
+        angle = self.angle + other.angle
+
+        ans = Transcomplex(magnitude, angle)
+
+        # conform to convention for nullity angles.
+        ans._check_nullity()
+
+        return ans
+
+    def __truediv__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__truediv__", Transcomplex.__truediv__, self, other)
+
+        # r1/r2 , theta1-theta2
+
+        # check that both numbers are Transcomplex
+
+        try:
+            other = _coerce_transcomplex(other)
+        except TypeError:
+            return NotImplemented
+
+        magnitude = self.magnitude/other.magnitude
+
+        angle = self.angle - other.angle
+
+        ans = Transcomplex(magnitude, angle)
+
+        ans._check_nullity()
+
+        return ans
+
+    def __itruediv__(self, other):
+        try:
+            other = _coerce_transcomplex(other)
+        except TypeError:
+            return NotImplemented
+
+        self.magnitude = self.magnitude/other.magnitude
+        self.angle = self.angle/other.angle
+
+        return self
+
+    def __iadd__(self, other):
+        self = self + other
+        return self
+
+
+
+    def __add__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__add__", Transcomplex.__add__, self, other)
+
+        try:
+            other = _coerce_transcomplex(other)
+        except TypeError:
+            return NotImplemented
+
+        """Add two transcomplex numbers together. Finite transcomplex numbers are added in cartesian form, exactly
+        (and without any trigonometry if they are already in cartesian form). First here we should deal with the
+        transreals; that is:
+        - Nullity
+        - Infinity + Infinity ( bisector )
         - Infinity + real finite number
         - Infinity + opposite Infinity ( Nullity )
         """
 
+        # this works because cos t and sin t are total functions, and the use of nullity below allows finite
+        # transcomplex numbers to be converted to cartesian form regardless of input.
+        if self._is_finite() and other._is_finite():
+            return Transcomplex._from_cartesian(self.real + other.real, self.imaginary + other.imaginary)
+
         # Nullity
         # if any part of either side of the calculation is nullity, the answer will be the point at nullity
         # hence (Nullity, 0)
 
-        if self.magnitude == NULLITY or self.angle == NULLITY:
+        self_magnitude_kind = _kind_of(self.magnitude)
+        other_magnitude_kind = _kind_of(other.magnitude)
+        self_angle_kind = _kind_of(self.angle)
+        other_angle_kind = _kind_of(other.angle)
+
+        if self_magnitude_kind == _NULLITY or self_angle_kind == _NULLITY:
             return Transcomplex(NULLITY, 0)
 
-        if other.magnitude == NULLITY or other.angle == NULLITY:
+        if other_magnitude_kind == _NULLITY or other_angle_kind == _NULLITY:
             return Transcomplex(NULLITY, 0)
 
         # as a third case, if the angle of either is infinity, it can be said to be nullity. thus the addition
         # will still yield (Nullity, 0)
 
-        if self.angle == INFINITY or other.angle == INFINITY:
+        if self_angle_kind == _INFINITY or other_angle_kind == _INFINITY:
             return Transcomplex(NULLITY, 0)
 
         # Adding opposite infinities
 
-        if self.magnitude == INFINITY and other.magnitude == INFINITY:
+        if self_magnitude_kind in (_INFINITY, _NEGATIVE_INFINITY) and other_magnitude_kind in (_INFINITY,
+                                                                                                _NEGATIVE_INFINITY):
 
             if self.magnitude.sign() > 0 > other.magnitude.sign():
                 # Opposite infinities add to the point at nullity, hence Nullity,0
@@ -674,46 +4483,34 @@ class Transcomplex:
             else:
                 raise Exception()  # we should not get here!
 
-        if abs(self.magnitude) == INFINITY and abs(other.magnitude) != INFINITY:
+        if self_magnitude_kind and not other_magnitude_kind:
             # in this case, we're adding a finite transcomplex number to an infinite transcomplex number. the result of
             # such a sum is always the transcomplex infinite number
             return self
 
-        # likewise if self is finite and other is infinite,
-        if abs(self.magnitude) != INFINITY and abs(other.magnitude) == INFINITY:
-            return other
-
-        # if arriving at this point, we have a finite transcomplex number. By converting these to their cartesian
-        # counterpart, we can add them easily. this works because cos t and sin t are total functions, and the use of
-        # nullity above allows us to use the below functions regardless of input.
-
-        # convert polar transcomplex numbers to their cartesian form using 'cmath'
-        cartesian_self = cmath.rect(self.magnitude, self.angle)
-        cartesian_other = cmath.rect(other.magnitude, other.angle)
-
-        # add the cartesian transcomplex numbers together
-        cartesian_ans = cartesian_self+cartesian_other
-
-        # and convert back to polar form
-
-        ans = cmath.polar(cartesian_ans)
-
-        # finally, return a transcomplex number. Using the built-in cmath functions ONLY work becuase of the additional
-        # axioms introduced by transcomplex arithmetic - in a real perspex system, division by zero would actually be
-        # possible in hardware; so the above would not strictly be necessary. As division by zero is impossible on
-        # von neumann systems in any modern programming language, we have to emulate it as above by applying the rules
-        # of transcomplex arithmetic manually.
-
-        return Transcomplex(ans[0],ans[1])
+        # likewise if self is finite and other is infinite (both finite was dealt with at the start)
+        return other
 
     def __sub__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__sub__", Transcomplex.__sub__, self, other)
+        try:
+            other = _coerce_transcomplex(other)
+        except TypeError:
+            return NotImplemented
+
         # subtraction of a transcomplex number is addition of its opposite transvector
-        other_cart = cmath.rect(other.magnitude, other.angle)
-        other_polar = cmath.polar(other_cart)
-        negative_angle = other_polar[1] - math.pi
-        negative_other = Transcomplex(other_polar[0], negative_angle)
+        return self + -other
 
-        return self+negative_other
+
+    def __neg__(self):
+        """Return the opposite transvector. Finite transcomplex numbers are negated in cartesian form, exactly, and
+        infinite ones are turned round by pi."""
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__neg__", Transcomplex.__neg__, self)
+        if self._is_finite():
+            return Transcomplex._from_cartesian(-self.real, -self.imaginary)
+        return Transcomplex(self._magnitude, self._angle - PI)
 
 
     def __float__(self):
@@ -732,14 +4529,24 @@ class Transcomplex:
 
         return "({}, {})".format(self.magnitude, self.angle)
 
+
+    def __reduce__(self):
+        # pickle whichever forms have been worked out, so that an exact cartesian form stays exact
+        return (_unpickle_transcomplex, (self._magnitude, self._angle, self._real, self._imaginary))
+
     
     def __eq__(self, other):
+        if _instrumented and not _instrumenting.active:
+            return _instrument("Transcomplex.__eq__", Transcomplex.__eq__, self, other)
         # if other isn't transcomplex, try to make it transcomplex
         try:
-            other = Transcomplex(other)
+            other = _coerce_transcomplex(other)
         except TypeError:
             return NotImplemented
 
+        # transcomplex numbers which are both in cartesian form can be compared exactly, without any trigonometry
+        if self._real is not None and other._real is not None:
+            return self._real == other._real and self._imaginary == other._imaginary
         return self.magnitude == other.magnitude and self.angle == other.angle
 
 
@@ -752,9 +4559,10 @@ class Transcomplex:
         """Just check that, if the magnitude of the transcomplex number is Nullity, the angle is 0 due to
         transmath convention."""
 
-        if self.magnitude == NULLITY or self.angle == NULLITY:
-            self.angle = 0
-            self.magnitude = NULLITY
+        if self._magnitude is NULLITY or self._angle is NULLITY:
+            self._angle = _ZERO
+            self._magnitude = NULLITY
+            self._real = self._imaginary = None
             return True
         else:
             return False
@@ -764,6 +4572,8 @@ class Transcomplex:
 
 
 
-INFINITY = Transreal(1, 0)
-NULLITY = Transreal(0, 0)
+INFINITY = Transreal._from_normalized(1, 0, kind=_INFINITY)
+NEGATIVE_INFINITY = Transreal._from_normalized(-1, 0, kind=_NEGATIVE_INFINITY)
+NULLITY = Transreal._from_normalized(0, 0, kind=_NULLITY)
+_ZERO = Transreal._from_normalized(0, 1)
 PI = Transreal(3141592653589793238462643, 10**24, approximate=True)